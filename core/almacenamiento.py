@@ -0,0 +1,16 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class ManifestTolerante(CompressedManifestStaticFilesStorage):
+    """
+    Estáticos con hash en el nombre, pero sin fallar cuando una plantilla
+    referencia un archivo que no existe en el proyecto (p. ej. adminlte o
+    img/default-user.png): en ese caso se devuelve la ruta original.
+    """
+    manifest_strict = False
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            return name
@@ -59,12 +59,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'prestamos.metricas.MetricasMiddleware',  # Primero: mide el tiempo total de la petición
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'prestamos.middleware.DependenciaAdminMiddleware',  # Rol y dependencia resueltos una vez por petición
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     
@@ -79,7 +81,7 @@ ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'prestamos.metricas.PlantillasMedidas',  # DjangoTemplates + tiempo de render
         'DIRS': [
             os.path.join(BASE_DIR, 'prestamos/templates'),
             os.path.join(BASE_DIR, 'prestamos/templates/mobile'),  # Plantillas móviles
@@ -91,6 +93,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'prestamos.context_processors.fragmentos',
             ],
         },
     },
@@ -114,11 +117,79 @@ DATABASES = {
 }
 
 
+# Caché
+# Con REDIS_URL (p. ej. redis://redis:6379/1) todas las cachés van a Redis,
+# separadas por prefijo. Sin Redis se usa un respaldo compartido entre los
+# workers: archivos (CACHE_RESPALDO=archivo, por defecto) o la base de datos
+# (CACHE_RESPALDO=bd). La caché de sesiones usa siempre la base de datos como
+# respaldo; ambos casos requieren `manage.py createcachetable`.
+# Los nombres están en prestamos.caches.
+
+REDIS_URL = os.environ.get('REDIS_URL', '')
+CACHE_RESPALDO = os.environ.get('CACHE_RESPALDO', 'archivo')
+CACHE_DIR = os.environ.get('CACHE_DIR', os.path.join(BASE_DIR, 'cache'))
+
+
+def _cache(nombre, timeout=300, max_entradas=None, respaldo=None):
+    if REDIS_URL:
+        return {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': nombre,
+            'TIMEOUT': timeout,
+        }
+    # Los respaldos de archivo y de base de datos recortan la caché al pasar
+    # de MAX_ENTRIES (300 por defecto); Redis se limita con su propia memoria
+    opciones = {'MAX_ENTRIES': max_entradas} if max_entradas else {}
+    if (respaldo or CACHE_RESPALDO) == 'bd':
+        return {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': f'cache_{nombre}',
+            'TIMEOUT': timeout,
+            'OPTIONS': opciones,
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(CACHE_DIR, nombre),
+        'TIMEOUT': timeout,
+        'OPTIONS': opciones,
+    }
+
+
+CACHES = {
+    'default': _cache('default'),
+    'catalogo': _cache('catalogo'),
+    'estadisticas': _cache('estadisticas', 900),
+    'notificaciones': _cache('notificaciones', 120),
+    # Una entrada por sesión abierta: con 300 se expulsarían sesiones activas.
+    # Sin Redis va a la base de datos: la caché de archivos lista el directorio
+    # entero en cada set() para decidir si recorta, O(n) con 50000 archivos
+    'sesiones': _cache('sesiones', 60 * 60 * 24 * 14, max_entradas=50000, respaldo='bd'),
+}
+
+# Sesiones leídas desde la caché 'sesiones'; la tabla django_session solo se
+# escribe cuando la sesión cambia (inicio/cierre de sesión). Los mensajes
+# viajan en una cookie firmada y no modifican la sesión: son textos cortos y
+# sin datos sensibles. Las filas vencidas las borra `manage.py limpiar_sesiones`.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sesiones'
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
 AUTH_PASSWORD_VALIDATORS = []
 
+# Argon2 ajustado como hasher principal; los hashes PBKDF2 existentes se
+# actualizan automáticamente en el siguiente inicio de sesión.
+# Medir con: python manage.py benchmark_hashers
+PASSWORD_HASHERS = [
+    'prestamos.hashers.Argon2AjustadoPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -157,18 +228,105 @@ REST_FRAMEWORK = {
 }
 
 
+# Los tokens JWT incluyen rol y dependencia (usados por el perfil core.settings_api)
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'prestamos.serializers.TokenConRolSerializer',
+}
+
+
 LOGIN_URL = reverse_lazy('login_registro')
 LOGIN_URL = 'login_registro'  
 
 
 AUTH_USER_MODEL = 'prestamos.Usuario'
 
+# Segundos que se mantiene en caché la dependencia administrada por cada admin
+DEPENDENCIA_ADMIN_CACHE_TTL = 300
+
+# Limitación por IP: (número de peticiones, ventana en segundos)
+LIMITE_CHECK_DISPONIBILIDAD = (30, 60)
+LIMITE_LOGIN = (10, 300)  # Intentos fallidos por IP y código de usuario
+LIMITE_LOGIN_IP = (30, 300)  # Intentos fallidos por IP, sea cual sea el código
+LIMITE_REGISTRO = (5, 3600)  # Envíos del formulario de registro por IP
+CHECK_DISPONIBILIDAD_CACHE_TTL = 60
+
+# Detrás de nginx REMOTE_ADDR es la IP del proxy. Para las peticiones que
+# llegan desde PROXIES_CONFIABLES, la IP del cliente se lee de esta cabecera
+# (p. ej. HTTP_X_REAL_IP o HTTP_X_FORWARDED_FOR), que el proxy debe fijar.
+# Vacío = REMOTE_ADDR (sin proxy).
+PROXY_CABECERA_IP = os.environ.get('PROXY_CABECERA_IP', '')
+PROXIES_CONFIABLES = tuple(filter(None, os.environ.get('PROXIES_CONFIABLES', '127.0.0.1').split(',')))
+
+# Autocompletado (prestamos.busqueda): resultados por defecto / máximo y
+# longitud mínima del texto (con menos de 3 letras no se usan los índices trigram).
+BUSQUEDA_LIMITE = 10
+BUSQUEDA_LIMITE_MAX = 20
+BUSQUEDA_MIN_CARACTERES = 2
+
+# Las adendas de extensión se generan en un hilo tras el commit; con False
+# quedan pendientes para `manage.py generar_adendas` (cron).
+ADENDAS_EN_SEGUNDO_PLANO = True
+
+# Fragmentos de plantilla cacheados por usuario (sidebar, préstamos recientes);
+# la clave incluye la versión de datos del usuario (prestamos.versiones).
+FRAGMENTOS_CACHE_TTL = 600
+
+# Retención de notificaciones (`manage.py purgar_notificaciones`, cron): días
+# que una leída sigue en la campana, días tras los que se archiva aunque no se
+# haya leído (None = nunca) y días que se guarda el archivo (None = siempre).
+NOTIFICACIONES_RETENCION_DIAS = 30
+NOTIFICACIONES_NO_LEIDAS_DIAS = 180
+NOTIFICACIONES_ARCHIVO_DIAS = 365
+
+# Avisos a los administradores de dependencia agrupados en un resumen (una
+# notificación y un correo) cada tantos minutos (`manage.py enviar_resumenes`,
+# cron cada 5 minutos). Con 0 se envía uno por aviso, al momento.
+RESUMEN_ADMIN_MINUTOS = 15
+
+# Lista de espera: al liberarse el recurso, la primera solicitud en espera lo
+# retiene (una reserva corta) durante estas horas mientras se aprueba.
+LISTA_ESPERA_RETENCION_HORAS = 24
+
+# Historial archivado (`manage.py archivar_historial`, cron): préstamos
+# devueltos y solicitudes cerradas con más de estos días salen de los listados
+# y estadísticas; se consultan con ?archivados=1.
+HISTORIAL_ARCHIVO_DIAS = 365
+
+# Instrumentación (prestamos.metricas): fracción de peticiones con detalle de
+# consultas/plantillas/llamadas externas, umbral para registrar siempre las
+# peticiones lentas y acceso a /metrics (token Bearer o lista de IPs).
+METRICAS_MUESTREO = float(os.environ.get('METRICAS_MUESTREO', 0.1))
+METRICAS_LENTA_MS = 1000
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN', '')
+METRICAS_IPS = ('127.0.0.1',)
+
+# Una línea JSON por petición muestreada o lenta
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'metricas': {'class': 'logging.StreamHandler', 'formatter': 'json'},
+    },
+    'loggers': {
+        'prestamos.metricas': {'handlers': ['metricas'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 # Configuración para archivos media
 MEDIA_URL = '/media/'  
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')  
 
+# Miniaturas bajo demanda (/media/thumb/<tamaño>/<ruta>)
+MINIATURAS_TAMANOS = (64, 160, 240, 320, 480, 640)
+MINIATURAS_CACHE_DIR = os.path.join(MEDIA_ROOT, 'cache_miniaturas')
+MINIATURAS_CACHE_MAX_BYTES = 500 * 1024 * 1024
+MINIATURAS_DESALOJO_SEGUNDOS = 300  # Recorrido de la caché como mucho cada 5 minutos
+
 # Configuración para envio de correos
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = 'prestamos.metricas.SMTPMedido'  # SMTP de Django + métricas de envío
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -0,0 +1,46 @@
+"""
+Perfil de settings solo-API (autenticación JWT sin estado).
+
+Uso:
+    DJANGO_SETTINGS_MODULE=core.settings_api gunicorn core.wsgi
+
+Diferencias con core.settings:
+- Las rutas /api/ se autentican solo con SimpleJWT y sin consultar la tabla
+  de usuarios: request.user es un TokenUser construido desde los claims
+  (user_id, codigo, rol, dependencia_id), ver TokenConRolSerializer.
+- Sin SessionMiddleware, CsrfViewMiddleware, AuthenticationMiddleware ni
+  MessageMiddleware: ninguna petición toca django_session.
+- Sin admin de Django ni vistas web; solo se enruta /api/.
+
+Medir la diferencia con: python manage.py benchmark_auth_api
+"""
+
+from .settings import *  # noqa: F401,F403
+
+ROOT_URLCONF = 'core.urls_api'
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS  # noqa: F405
+    if app not in ('django.contrib.admin', 'django.contrib.messages', 'rest_framework.authtoken')
+]
+
+MIDDLEWARE = [
+    'prestamos.metricas.MetricasMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+TEMPLATES[0]['OPTIONS']['context_processors'] = [  # noqa: F405
+    'django.template.context_processors.request',
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,  # noqa: F405
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+    ),
+}
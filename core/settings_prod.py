@@ -0,0 +1,64 @@
+"""
+Perfil de settings para producción.
+
+Uso:
+    DJANGO_SETTINGS_MODULE=core.settings_prod gunicorn -c gunicorn.conf.py core.wsgi
+
+Diferencias con core.settings:
+- DEBUG desactivado (no se acumula el log de SQL en memoria).
+- Conexiones persistentes a PostgreSQL con verificación de salud.
+- Archivos estáticos con hash servidos por WhiteNoise (precomprimidos gzip/brotli).
+- Plantillas compiladas una vez por proceso (cached loader).
+- Archivos media servidos con sendfile / X-Accel-Redirect (ver prestamos/views_media.py).
+
+Comparar rendimiento con: python scripts/prueba_carga.py
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))  # noqa: F405
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True  # noqa: F405
+
+# WhiteNoise justo después de SecurityMiddleware
+MIDDLEWARE = [
+    middleware
+    for nombre in MIDDLEWARE  # noqa: F405
+    for middleware in (
+        [nombre, 'whitenoise.middleware.WhiteNoiseMiddleware']
+        if nombre == 'django.middleware.security.SecurityMiddleware' else [nombre]
+    )
+]
+
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # noqa: F405
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        # Nombres con hash (css/base.abc123.css): WhiteNoise los sirve con
+        # caché "immutable" de un año; el resto, con WHITENOISE_MAX_AGE.
+        # Algunas plantillas referencian archivos que no están en el proyecto
+        # (p. ej. adminlte): ManifestTolerante los deja con su nombre original
+        # en lugar de lanzar un 500.
+        'BACKEND': 'core.almacenamiento.ManifestTolerante',
+    },
+}
+WHITENOISE_MAX_AGE = 60 * 60
+
+# Cargador de plantillas con caché explícito: cada plantilla se compila una
+# sola vez por proceso.
+TEMPLATES[0]['APP_DIRS'] = False  # noqa: F405
+TEMPLATES[0]['OPTIONS']['loaders'] = [  # noqa: F405
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Si hay un nginx delante, servir /media/ con X-Accel-Redirect hacia este
+# prefijo interno (location internal). Vacío = sendfile desde gunicorn.
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+SERVIR_MEDIA = True
@@ -4,11 +4,13 @@ URL configuration for core project.
 
 from django.conf import settings
 from django.conf.urls.static import static
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.contrib import admin
 from django.http import HttpResponse
 from pathlib import Path
 
+from prestamos.views_metricas import metricas
+
 
 # === Vista para servir el manifest.json en la raíz ===
 def manifest(request):
@@ -24,8 +26,16 @@ urlpatterns = [
     path('', include('prestamos.urls')),  # Tu app principal
     path('api-auth/', include('rest_framework.urls')),
     path('manifest.json', manifest, name='manifest'),  # Manifest PWA
+    path('metrics', metricas, name='metricas'),  # Prometheus (ver prestamos/metricas.py)
 ]
 
 # === Archivos multimedia ===
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+elif getattr(settings, 'SERVIR_MEDIA', False):
+    # Producción: sendfile / X-Accel-Redirect en lugar de django.views.static
+    from prestamos.views_media import servir_media
+
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), servir_media, name='servir_media'),
+    ]
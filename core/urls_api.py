@@ -0,0 +1,15 @@
+"""
+URL configuration para el perfil solo-API (core.settings_api).
+
+Solo expone /api/: no carga las vistas web ni el admin de Django.
+"""
+
+from django.urls import path, include
+
+from prestamos.views_metricas import metricas
+
+
+urlpatterns = [
+    path('api/', include('prestamos.urls_api')),
+    path('metrics', metricas, name='metricas'),
+]
@@ -0,0 +1,22 @@
+# Configuración de gunicorn para producción (ver core/settings_prod.py)
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Workers dimensionados por núcleo: (2 x núcleos) + 1
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Reciclar workers periódicamente para contener fugas de memoria (WeasyPrint)
+max_requests = 1000
+max_requests_jitter = 100
+
+# La generación de contratos PDF puede tardar varios segundos
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
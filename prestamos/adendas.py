@@ -0,0 +1,78 @@
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.template.loader import render_to_string
+
+from .metricas import medir_externo
+from .models import PrestamoExtension
+
+logger = logging.getLogger(__name__)
+
+
+def renderizar_adenda(extension):
+    """PDF de una página con los datos de la extensión."""
+    # WeasyPrint se importa aquí: pesa mucho y solo lo necesitan quienes generan PDFs
+    from weasyprint import HTML
+
+    prestamo = extension.prestamo
+    recurso = prestamo.recurso
+    dependencia = recurso.dependencia
+    escudo_path = os.path.join(settings.MEDIA_ROOT, 'encabezado_contratos', 'escudo.png')
+
+    html_string = render_to_string('contrato/adenda_extension.html', {
+        'extension': extension,
+        'prestamo': prestamo,
+        'usuario': prestamo.usuario,
+        'recurso': recurso,
+        'dependencia': dependencia,
+        'administrador': dependencia.administrador,
+        'escudo_path': f'file://{escudo_path}',
+    })
+    with medir_externo('weasyprint'):
+        return HTML(string=html_string).write_pdf()
+
+
+def generar_adenda(extension_id):
+    extension = (
+        PrestamoExtension.objects
+        .select_related('prestamo__usuario', 'prestamo__recurso__dependencia__administrador', 'autorizado_por')
+        .get(pk=extension_id)
+    )
+    if extension.adenda:
+        return extension
+
+    pdf = renderizar_adenda(extension)
+    extension.adenda.save(f'adenda_{extension.prestamo_id}_{extension.pk}.pdf', ContentFile(pdf), save=False)
+    extension.save(update_fields=['adenda'])
+    return extension
+
+
+def _generar_en_hilo(extension_ids):
+    try:
+        for extension_id in extension_ids:
+            try:
+                generar_adenda(extension_id)
+            except Exception:
+                # El comando generar_adendas la reintentará
+                logger.exception("No se pudo generar la adenda de la extensión %s", extension_id)
+    finally:
+        close_old_connections()
+
+
+def programar_adenda(*extension_ids):
+    """
+    Genera las adendas después del commit en un hilo aparte, para que la
+    respuesta de la extensión no espere a WeasyPrint. Varias extensiones
+    (p. ej. las de extender_vencidos) se generan una tras otra en el mismo
+    hilo. Con ADENDAS_EN_SEGUNDO_PLANO = False solo se generan con
+    `manage.py generar_adendas`.
+    """
+    if not extension_ids or not getattr(settings, 'ADENDAS_EN_SEGUNDO_PLANO', True):
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(target=_generar_en_hilo, args=(extension_ids,), daemon=True).start()
+    )
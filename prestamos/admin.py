@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import Usuario, Dependencia, Recurso, Prestamo, TipoRecurso, SolicitudPrestamo, Notificacion
+from .models import Usuario, Dependencia, Recurso, Prestamo, TipoRecurso, SolicitudPrestamo, Notificacion, Reserva, PrestamoExtension, AvisoAdmin
 
 @admin.register(Usuario)
 class UsuarioAdmin(UserAdmin):
@@ -44,24 +44,43 @@ class TipoRecursoAdmin(admin.ModelAdmin):
 
 @admin.register(Recurso)
 class RecursoAdmin(admin.ModelAdmin):
-    list_display = ('nombre', 'dependencia', 'disponible')
+    list_display = ('codigo', 'nombre', 'dependencia', 'disponible')
     list_filter = ('disponible', 'dependencia')
-    search_fields = ('nombre', 'descripcion')
+    search_fields = ('=codigo', 'nombre', 'descripcion')
+
+class PrestamoExtensionInline(admin.TabularInline):
+    model = PrestamoExtension
+    extra = 0
+    fields = ('fecha_anterior', 'fecha_nueva', 'autorizado_por', 'fecha', 'adenda')
+    readonly_fields = fields
 
 @admin.register(Prestamo)
 class PrestamoAdmin(admin.ModelAdmin):
+    inlines = [PrestamoExtensionInline]
     list_display = ('usuario', 'recurso', 'fecha_prestamo', 'fecha_devolucion', 'devuelto')
-    list_filter = ('devuelto', 'fecha_prestamo')
+    list_filter = ('devuelto', 'archivado', 'fecha_prestamo')
     search_fields = ('usuario__codigo', 'recurso__nombre')  
 
 @admin.register(SolicitudPrestamo)
 class SolicitudPrestamoAdmin(admin.ModelAdmin):
     list_display = ('usuario', 'recurso', 'estado', 'fecha_solicitud')
-    list_filter = ('estado', 'fecha_solicitud')
+    list_filter = ('estado', 'archivado', 'fecha_solicitud')
+    search_fields = ('usuario__codigo', 'recurso__nombre')
+
+@admin.register(Reserva)
+class ReservaAdmin(admin.ModelAdmin):
+    list_display = ('recurso', 'usuario', 'inicio', 'fin', 'activa')
+    list_filter = ('activa', 'recurso__dependencia')
     search_fields = ('usuario__codigo', 'recurso__nombre')
+    raw_id_fields = ('recurso', 'usuario', 'solicitud')
 
 @admin.register(Notificacion)
 class NotificacionAdmin(admin.ModelAdmin):
     list_display = ('usuario', 'tipo', 'leida', 'fecha')
     list_filter = ('tipo', 'leida')
-    search_fields = ('usuario__codigo', 'mensaje')
\ No newline at end of file
+    search_fields = ('usuario__codigo', 'mensaje')
+
+@admin.register(AvisoAdmin)
+class AvisoAdminAdmin(admin.ModelAdmin):
+    list_display = ('dependencia', 'tipo', 'fecha')
+    list_filter = ('tipo', 'dependencia')
\ No newline at end of file
@@ -0,0 +1,173 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from .models import Recurso, Usuario
+
+# Configuración de texto completo usada tanto en el índice como en las consultas;
+# si no coinciden, PostgreSQL no puede usar el índice GIN de la migración 0024.
+CONFIG_TEXTO = 'spanish'
+
+
+def es_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def _terminos(texto):
+    return [t for t in texto.split() if t][:5]
+
+
+def _filtro_por_terminos(terminos, campos):
+    """Cada término debe aparecer (icontains) en alguno de los campos."""
+    filtro = Q()
+    for termino in terminos:
+        alguno = Q()
+        for campo in campos:
+            alguno |= Q(**{f'{campo}__icontains': termino})
+        filtro &= alguno
+    return filtro
+
+
+def _prioridad_prefijo(texto, campo_exacto, campos_prefijo):
+    """
+    Orden de respaldo (SQLite): coincidencia exacta, luego por prefijo, luego el resto.
+    """
+    prefijo = Q()
+    for campo in campos_prefijo:
+        prefijo |= Q(**{f'{campo}__istartswith': texto})
+    return Case(
+        When(**{f'{campo_exacto}__iexact': texto}, then=Value(0)),
+        When(prefijo, then=Value(1)),
+        default=Value(2),
+        output_field=IntegerField(),
+    )
+
+
+def buscar_recursos(texto, dependencia=None, limite=None):
+    """
+    Recursos cuyo nombre/descripcion contienen todos los términos buscados,
+    ordenados por relevancia y limitados a `limite` resultados.
+
+    En PostgreSQL los `icontains` usan los índices trigram sobre UPPER(campo),
+    se añade la coincidencia de texto completo y se ordena por similitud + rango.
+    En otros motores se ordena por exacto/prefijo/resto.
+    """
+    limite = limite or settings.BUSQUEDA_LIMITE
+    texto = texto.strip()
+    terminos = _terminos(texto)
+    if not terminos:
+        return Recurso.objects.none()
+
+    recursos = Recurso.objects.select_related('dependencia').only(
+        'id', 'codigo', 'nombre', 'disponible', 'dependencia__id', 'dependencia__nombre'
+    )
+    if dependencia is not None:
+        recursos = recursos.filter(dependencia=dependencia)
+
+    filtro = _filtro_por_terminos(terminos, ('nombre', 'descripcion'))
+    if texto.isdigit():
+        filtro |= Q(codigo=int(texto))
+
+    if es_postgres():
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVector, TrigramSimilarity,
+        )
+        vector = SearchVector('nombre', 'descripcion', config=CONFIG_TEXTO)
+        consulta = SearchQuery(texto, config=CONFIG_TEXTO, search_type='websearch')
+        return (
+            recursos
+            .alias(documento=vector)
+            .filter(filtro | Q(documento=consulta))
+            .annotate(relevancia=TrigramSimilarity('nombre', texto) + SearchRank(vector, consulta))
+            .order_by('-relevancia', 'nombre')[:limite]
+        )
+
+    return (
+        recursos
+        .filter(filtro)
+        .annotate(prioridad=_prioridad_prefijo(texto, 'nombre', ('nombre',)))
+        .order_by('prioridad', 'nombre')[:limite]
+    )
+
+
+def buscar_usuarios(texto, roles=(Usuario.ESTUDIANTE, Usuario.PROFESOR), limite=None):
+    """
+    Usuarios por código, nombre, apellido o correo (todos los términos deben
+    coincidir en algún campo), ordenados por similitud en PostgreSQL.
+    """
+    limite = limite or settings.BUSQUEDA_LIMITE
+    texto = texto.strip()
+    terminos = _terminos(texto)
+    if not terminos:
+        return Usuario.objects.none()
+
+    usuarios = Usuario.objects.filter(
+        is_active=True,
+        **({'rol__in': roles} if roles else {})
+    ).only('id', 'codigo', 'first_name', 'last_name', 'email', 'rol')
+    usuarios = usuarios.filter(
+        _filtro_por_terminos(terminos, ('codigo', 'first_name', 'last_name', 'email'))
+    )
+
+    if es_postgres():
+        from django.contrib.postgres.search import TrigramSimilarity
+        return (
+            usuarios
+            .annotate(relevancia=Greatest(
+                TrigramSimilarity('codigo', texto),
+                TrigramSimilarity('first_name', texto),
+                TrigramSimilarity('last_name', texto),
+                TrigramSimilarity('email', texto),
+            ))
+            .order_by('-relevancia', 'codigo')[:limite]
+        )
+
+    return (
+        usuarios
+        .annotate(prioridad=_prioridad_prefijo(texto, 'codigo', ('codigo', 'first_name', 'last_name')))
+        .order_by('prioridad', 'codigo')[:limite]
+    )
+
+
+# Autocompletado por prefijo para los selectores de formularios (nuevo préstamo).
+# `istartswith` genera UPPER(campo) LIKE 'TEXTO%', que en PostgreSQL usa los
+# índices text_pattern_ops de la migración 0025.
+
+def autocompletar_usuarios(texto, limite=None):
+    limite = min(limite or settings.BUSQUEDA_LIMITE, settings.BUSQUEDA_LIMITE_MAX)
+    texto = texto.strip()
+    if not texto:
+        return Usuario.objects.none()
+
+    return (
+        Usuario.objects
+        .filter(is_active=True, rol__in=[Usuario.ESTUDIANTE, Usuario.PROFESOR])
+        .filter(
+            Q(codigo__istartswith=texto)
+            | Q(first_name__istartswith=texto)
+            | Q(last_name__istartswith=texto)
+        )
+        .only('id', 'codigo', 'first_name', 'last_name', 'rol')
+        .order_by('codigo')[:limite]
+    )
+
+
+def autocompletar_recursos(texto, dependencia, limite=None):
+    """Recursos disponibles de la dependencia por código exacto o prefijo del nombre."""
+    limite = min(limite or settings.BUSQUEDA_LIMITE, settings.BUSQUEDA_LIMITE_MAX)
+    texto = texto.strip()
+    if not texto:
+        return Recurso.objects.none()
+
+    filtro = Q(nombre__istartswith=texto)
+    if texto.isdigit():
+        filtro |= Q(codigo=int(texto))
+
+    return (
+        Recurso.objects
+        .filter(dependencia=dependencia, disponible=True)
+        .filter(filtro)
+        .only('id', 'codigo', 'nombre')
+        .order_by('nombre')[:limite]
+    )
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from PIL import Image
+
+from .imagenes import _abrir, _codificar
+
+# Solo se generan miniaturas de imágenes públicas (las firmas quedan fuera)
+PREFIJOS_PERMITIDOS = ('recursos/', 'usuarios/', 'dependencias/')
+PREFIJOS_EXCLUIDOS = ('usuarios/firmas/',)
+
+
+def directorio_cache():
+    return getattr(settings, 'MINIATURAS_CACHE_DIR', os.path.join(settings.MEDIA_ROOT, 'cache_miniaturas'))
+
+
+def ruta_permitida(ruta):
+    return ruta.startswith(PREFIJOS_PERMITIDOS) and not ruta.startswith(PREFIJOS_EXCLUIDOS)
+
+
+def obtener_miniatura(ruta_original, tamano, formato):
+    """
+    Devuelve la ruta absoluta de la miniatura cacheada de `ruta_original`,
+    generándola si no existe. La clave incluye el mtime del original, así que
+    reemplazar el archivo invalida su miniatura.
+    """
+    mtime = os.stat(ruta_original).st_mtime_ns
+    clave = hashlib.sha1(f'{ruta_original}:{mtime}'.encode()).hexdigest()
+    extension = 'webp' if formato == 'WEBP' else 'jpg'
+    destino = os.path.join(directorio_cache(), str(tamano), clave[:2], f'{clave}.{extension}')
+
+    if os.path.exists(destino):
+        # LRU: el mtime de la miniatura marca su último uso
+        os.utime(destino)
+        return destino
+
+    with open(ruta_original, 'rb') as archivo:
+        imagen = _abrir(archivo)
+    imagen.thumbnail((tamano, tamano), Image.LANCZOS)
+
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    # Escritura atómica: otro worker puede estar generando la misma miniatura
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(destino), suffix='.tmp')
+    with os.fdopen(descriptor, 'wb') as salida:
+        salida.write(_codificar(imagen, formato))
+    os.replace(temporal, destino)
+
+    desalojar_si_toca()
+    return destino
+
+
+def desalojar_si_toca():
+    """
+    Lanza `desalojar()` como mucho una vez cada MINIATURAS_DESALOJO_SEGUNDOS
+    entre todos los workers: el mtime de un archivo marcador en la caché
+    guarda cuándo fue el último recorrido.
+    """
+    intervalo = getattr(settings, 'MINIATURAS_DESALOJO_SEGUNDOS', 300)
+    marcador = os.path.join(directorio_cache(), '.ultimo_desalojo')
+    try:
+        if time.time() - os.stat(marcador).st_mtime < intervalo:
+            return 0
+    except FileNotFoundError:
+        pass
+    with open(marcador, 'a'):
+        os.utime(marcador)
+    return desalojar()
+
+
+def _archivos_cache(directorio):
+    for entrada in os.scandir(directorio):
+        if entrada.is_dir(follow_symlinks=False):
+            yield from _archivos_cache(entrada.path)
+        elif entrada.is_file(follow_symlinks=False) and not entrada.name.startswith('.'):
+            estado = entrada.stat()
+            yield estado.st_mtime, estado.st_size, entrada.path
+
+
+def desalojar():
+    """
+    Mantiene el tamaño total de la caché bajo MINIATURAS_CACHE_MAX_BYTES,
+    borrando primero las miniaturas usadas hace más tiempo (hasta el 90 %).
+    """
+    limite = getattr(settings, 'MINIATURAS_CACHE_MAX_BYTES', 500 * 1024 * 1024)
+    archivos = list(_archivos_cache(directorio_cache()))
+    total = sum(tamano for _, tamano, _ in archivos)
+    if total <= limite:
+        return 0
+
+    liberado = 0
+    for _, tamano, ruta in sorted(archivos):
+        if total - liberado <= limite * 0.9:
+            break
+        try:
+            os.remove(ruta)
+            liberado += tamano
+        except FileNotFoundError:
+            pass
+    return liberado
@@ -0,0 +1,97 @@
+import time
+
+from django.core.cache import caches
+
+# Cachés con nombre definidas en settings.CACHES. Cada una agrupa datos con
+# un patrón de invalidación parecido:
+#   catalogo       -> dependencias administradas, existencia de usuarios
+#   estadisticas   -> panel de estadísticas por dependencia
+#   notificaciones -> resumen de notificaciones de cada usuario
+#   sesiones       -> sesiones (cached_db)
+CATALOGO = 'catalogo'
+ESTADISTICAS = 'estadisticas'
+NOTIFICACIONES = 'notificaciones'
+SESIONES = 'sesiones'
+
+
+def cache_de(nombre):
+    return caches[nombre]
+
+
+# Invalidación por grupo: cada grupo tiene una versión (marca de tiempo en
+# nanosegundos) que forma parte de las claves de sus entradas. Al invalidar el
+# grupo se cambia la versión y las entradas anteriores expiran solas, sin
+# tener que recorrerlas. Con una marca de tiempo (y no un contador), si la
+# versión se pierde por desalojo la nueva nunca coincide con una antigua.
+
+def _clave_version(grupo):
+    return f'version:{grupo}'
+
+
+def version_grupo(nombre, grupo):
+    cache = cache_de(nombre)
+    clave = _clave_version(grupo)
+    version = cache.get(clave)
+    if version is None:
+        cache.add(clave, time.time_ns(), None)
+        version = cache.get(clave)
+    return version
+
+
+def clave_versionada(nombre, grupo, *partes):
+    """Clave de una entrada del grupo, válida hasta la próxima invalidación."""
+    return ':'.join([grupo, str(version_grupo(nombre, grupo)), *map(str, partes)])
+
+
+def invalidar_grupos(nombre, *grupos):
+    if grupos:
+        version = time.time_ns()
+        cache_de(nombre).set_many({_clave_version(g): version for g in set(grupos)}, None)
+
+
+def borrar(nombre, *claves):
+    if claves:
+        cache_de(nombre).delete_many(claves)
+
+
+def obtener_o_calcular(nombre, grupo, partes, calcular, timeout=None):
+    """
+    Devuelve la entrada (grupo, partes) de la caché `nombre`, calculándola con
+    `calcular()` si no existe. `timeout=None` usa el TIMEOUT de la caché.
+    """
+    cache = cache_de(nombre)
+    clave = clave_versionada(nombre, grupo, *partes)
+    valor = cache.get(clave)
+    if valor is None:
+        valor = calcular()
+        if timeout is None:
+            cache.set(clave, valor)
+        else:
+            cache.set(clave, valor, timeout)
+    return valor
+
+
+# Grupos por dependencia / usuario usados por las vistas y las señales.
+
+def _grupo_estadisticas(dependencia_id):
+    return f'estadisticas:{dependencia_id}'
+
+
+def _grupo_notificaciones(usuario_id):
+    return f'notificaciones:{usuario_id}'
+
+
+def estadisticas_cacheadas(dependencia_id, partes, calcular):
+    return obtener_o_calcular(ESTADISTICAS, _grupo_estadisticas(dependencia_id), partes, calcular)
+
+
+def notificaciones_cacheadas(usuario_id, calcular):
+    return obtener_o_calcular(NOTIFICACIONES, _grupo_notificaciones(usuario_id), (), calcular)
+
+
+def invalidar_estadisticas(*dependencias_ids):
+    invalidar_grupos(ESTADISTICAS, *(_grupo_estadisticas(d) for d in dependencias_ids))
+
+
+def invalidar_notificaciones(*usuarios_ids):
+    invalidar_grupos(NOTIFICACIONES, *(_grupo_notificaciones(u) for u in usuarios_ids))
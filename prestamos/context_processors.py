@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def fragmentos(request):
+    # Tiempo de vida de los fragmentos {% cache %} de las plantillas
+    return {'fragmentos_ttl': settings.FRAGMENTOS_CACHE_TTL}
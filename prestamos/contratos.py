@@ -0,0 +1,38 @@
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .metricas import medir_externo
+
+
+def renderizar_contrato(solicitud, destino):
+    """Escribe en `destino` el PDF del contrato de préstamo de la solicitud aprobada."""
+    # WeasyPrint (Pango/cairo) se importa aquí y no al cargar las vistas: los
+    # workers de la API y los comandos de cron no pagan su arranque ni su memoria
+    from weasyprint import HTML
+
+    recurso = solicitud.recurso
+    dependencia = recurso.dependencia
+    admin_dependencia = dependencia.administrador
+
+    firma_usuario_path = solicitud.usuario.firma.path if solicitud.usuario.firma else None
+    firma_admin_path = admin_dependencia.firma.path if admin_dependencia and admin_dependencia.firma else None
+    escudo_path = os.path.join(settings.MEDIA_ROOT, 'encabezado_contratos', 'escudo.png')
+
+    context = {
+        'solicitud': solicitud,
+        'usuario': solicitud.usuario,
+        'recurso': recurso,
+        'administrador': admin_dependencia,
+        'dependencia': dependencia if admin_dependencia else None,
+        'firma_usuario_path': f'file://{firma_usuario_path}' if firma_usuario_path else None,
+        'firma_admin_path': f'file://{firma_admin_path}' if firma_admin_path else None,
+        'escudo_path': f'file://{escudo_path}',
+        'fecha': datetime.now(),
+    }
+
+    html_string = render_to_string('contrato/contrato_prestamo.html', context)
+    with medir_externo('weasyprint'):
+        HTML(string=html_string).write_pdf(destino)
@@ -0,0 +1,36 @@
+from functools import wraps
+
+from django.contrib import messages
+from django.shortcuts import redirect
+
+from .dependencias import obtener_dependencia_admin
+
+
+def admin_de_dependencia(view_func):
+    """
+    Restringe la vista a administradores con dependencia asignada.
+
+    Usa `request.dependencia_admin` (resuelta por DependenciaAdminMiddleware)
+    en lugar de consultar `request.user.dependencia_administrada` en cada vista.
+    Los superusuarios pueden pasar aunque no tengan dependencia.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if request.user.rol != 'admin':
+            messages.error(request, 'No tienes permiso para acceder a esta página')
+            return redirect('inicio')
+
+        if not hasattr(request, 'dependencia_admin'):
+            request.dependencia_admin = obtener_dependencia_admin(request.user)
+
+        if request.dependencia_admin is None and not request.user.is_superuser:
+            messages.error(
+                request,
+                "⚠️ Error al iniciar sesión. Tu cuenta no tiene una dependencia asignada. Contacta al administrador.",
+                extra_tags='error_login'
+            )
+            return redirect('login_registro')
+
+        return view_func(request, *args, **kwargs)
+
+    return _wrapped_view
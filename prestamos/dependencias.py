@@ -0,0 +1,32 @@
+from django.conf import settings
+
+from .caches import CATALOGO, cache_de, clave_versionada, invalidar_grupos
+from .models import Dependencia, Usuario
+
+# Grupo de la caché de catálogo que se invalida cada vez que cambia alguna
+# Dependencia; descarta de golpe todas las entradas sin tener que recorrerlas.
+GRUPO_DEPENDENCIAS = 'dependencia_admin'
+SIN_DEPENDENCIA = '__sin_dependencia__'
+
+
+def obtener_dependencia_admin(usuario):
+    """
+    Devuelve la Dependencia administrada por `usuario` (o None) usando una
+    caché de corta duración para no consultar la relación inversa
+    `dependencia_administrada` en cada petición.
+    """
+    if not usuario.is_authenticated or usuario.rol != Usuario.ADMIN:
+        return None
+
+    cache = cache_de(CATALOGO)
+    clave = clave_versionada(CATALOGO, GRUPO_DEPENDENCIAS, usuario.pk)
+    dependencia = cache.get(clave)
+    if dependencia is None:
+        dependencia = Dependencia.objects.filter(administrador_id=usuario.pk).first() or SIN_DEPENDENCIA
+        cache.set(clave, dependencia, getattr(settings, 'DEPENDENCIA_ADMIN_CACHE_TTL', 300))
+
+    return None if dependencia == SIN_DEPENDENCIA else dependencia
+
+
+def invalidar_dependencias_admin():
+    invalidar_grupos(CATALOGO, GRUPO_DEPENDENCIAS)
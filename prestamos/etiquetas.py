@@ -0,0 +1,67 @@
+import io
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+# Hoja A4 a 150 ppp
+DPI = 150
+ANCHO_HOJA, ALTO_HOJA = 1240, 1754
+MARGEN = 60
+COLUMNAS, FILAS = 4, 6
+ALTO_TEXTO = 46
+
+
+def _qr(codigo, lado):
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=1)
+    qr.add_data(str(codigo))
+    qr.make(fit=True)
+    return qr.make_image(fill_color='black', back_color='white').get_image().convert('L').resize(
+        (lado, lado), Image.NEAREST
+    )
+
+
+def _recortar(texto, draw, fuente, ancho):
+    while texto and draw.textlength(texto, font=fuente) > ancho:
+        texto = texto[:-1]
+    return texto
+
+
+def generar_hojas_etiquetas(recursos):
+    """
+    Genera un PDF con las etiquetas QR (código + nombre) de los recursos dados,
+    en hojas A4 de COLUMNAS x FILAS. Se compone directamente con Pillow, sin
+    pasar por HTML/WeasyPrint, para poder imprimir una dependencia completa.
+    """
+    ancho_celda = (ANCHO_HOJA - 2 * MARGEN) // COLUMNAS
+    alto_celda = (ALTO_HOJA - 2 * MARGEN) // FILAS
+    lado_qr = min(ancho_celda, alto_celda - ALTO_TEXTO) - 20
+    fuente = ImageFont.load_default(size=18)
+    por_hoja = COLUMNAS * FILAS
+
+    hojas = []
+    hoja = draw = None
+    for indice, recurso in enumerate(recursos):
+        posicion = indice % por_hoja
+        if posicion == 0:
+            hoja = Image.new('L', (ANCHO_HOJA, ALTO_HOJA), 255)
+            draw = ImageDraw.Draw(hoja)
+            hojas.append(hoja)
+
+        x = MARGEN + (posicion % COLUMNAS) * ancho_celda
+        y = MARGEN + (posicion // COLUMNAS) * alto_celda
+        hoja.paste(_qr(recurso.codigo, lado_qr), (x + (ancho_celda - lado_qr) // 2, y + 5))
+
+        for linea, texto in enumerate((str(recurso.codigo), recurso.nombre)):
+            texto = _recortar(texto, draw, fuente, ancho_celda - 10)
+            ancho_texto = draw.textlength(texto, font=fuente)
+            draw.text(
+                (x + (ancho_celda - ancho_texto) / 2, y + lado_qr + 8 + linea * 21),
+                texto, fill=0, font=fuente
+            )
+
+    if not hojas:
+        hojas.append(Image.new('L', (ANCHO_HOJA, ALTO_HOJA), 255))
+
+    salida = io.BytesIO()
+    hojas[0].save(salida, 'PDF', resolution=DPI, save_all=True, append_images=hojas[1:])
+    return salida.getvalue()
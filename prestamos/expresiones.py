@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class TsTzRange(models.Func):
+    """
+    TSTZRANGE(inicio, fin) de PostgreSQL (intervalo semiabierto [inicio, fin)).
+
+    Se usa en la restricción de exclusión de Reserva y en las consultas de
+    solapamiento, que deben generar la misma expresión para aprovechar el
+    índice GiST.
+    """
+    function = 'TSTZRANGE'
+
+    @property
+    def output_field(self):
+        from django.contrib.postgres.fields import DateTimeRangeField
+        return DateTimeRangeField()
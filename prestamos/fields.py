@@ -0,0 +1,42 @@
+from django.db import models
+
+from .imagenes import generar_miniaturas, procesar_imagen
+
+
+class ImagenOptimizadaField(models.ImageField):
+    """
+    ImageField que procesa cada archivo nuevo antes de guardarlo (sin EXIF,
+    dimensiones acotadas, nombre con hash del contenido) y genera miniaturas
+    de ancho fijo para usar con `{% imagen_responsive %}`.
+
+    Funciona para cualquier origen: vistas, formulario de registro, admin y API.
+    """
+
+    def __init__(self, *args, max_lado=1600, miniaturas=(), formato=None, **kwargs):
+        self.max_lado = max_lado
+        self.miniaturas = tuple(miniaturas)
+        self.formato = formato
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.max_lado != 1600:
+            kwargs['max_lado'] = self.max_lado
+        if self.miniaturas:
+            kwargs['miniaturas'] = self.miniaturas
+        if self.formato is not None:
+            kwargs['formato'] = self.formato
+        return name, path, args, kwargs
+
+    def procesar(self, archivo):
+        return procesar_imagen(archivo, self.max_lado, self.formato)
+
+    def pre_save(self, model_instance, add):
+        archivo = getattr(model_instance, self.attname)
+        if archivo and not archivo._committed:
+            procesada = self.procesar(archivo)
+            archivo.save(procesada.name, procesada, save=False)
+            if self.miniaturas:
+                generar_miniaturas(archivo.storage, archivo.name, self.miniaturas)
+            return archivo
+        return super().pre_save(model_instance, add)
@@ -0,0 +1,16 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class Argon2AjustadoPasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id con parámetros ajustados para el servidor de préstamos.
+
+    Los valores por defecto de Django (memoria 100 MiB, 2 iteraciones, 8 hilos)
+    saturan la CPU cuando se concentran los registros e inicios de sesión al
+    comienzo del semestre. Estos parámetros siguen la recomendación mínima de
+    OWASP (19 MiB, 2 iteraciones, 1 hilo). Ver `benchmark_hashers`.
+    """
+    algorithm = 'argon2'
+    time_cost = 2
+    memory_cost = 19456
+    parallelism = 1
@@ -0,0 +1,61 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .caches import invalidar_estadisticas
+from .models import Prestamo, SolicitudPrestamo
+from .versiones import invalidar_usuarios
+
+# Archivo del historial: los préstamos devueltos y las solicitudes aprobadas o
+# rechazadas con más de HISTORIAL_ARCHIVO_DIAS se marcan con `archivado`.
+# Siguen en la misma tabla (extensiones, reservas y contratos apuntan a
+# ellos), pero los listados y las estadísticas leen solo `.vigentes()`, que
+# usa los índices parciales sobre archivado = false; el historial completo se
+# pide con ?archivados=1.
+
+
+def limite_archivo(ahora=None):
+    return (ahora or timezone.now()) - timedelta(days=settings.HISTORIAL_ARCHIVO_DIAS)
+
+
+def prestamos_archivables(limite):
+    return Prestamo.objects.vigentes().filter(devuelto=True, fecha_devolucion__lt=limite)
+
+
+def solicitudes_archivables(limite):
+    return SolicitudPrestamo.objects.vigentes().filter(
+        estado__in=[SolicitudPrestamo.APROBADO, SolicitudPrestamo.RECHAZADO],
+        fecha_solicitud__lt=limite,
+    )
+
+
+def archivar(queryset, lote=1000, pausa=0.0):
+    """
+    Marca como archivadas las filas de `queryset` por lotes de `lote` (un
+    UPDATE corto cada uno) e invalida las cachés de usuarios y dependencias
+    afectados. Devuelve el total archivado.
+    """
+    modelo = queryset.model
+    total = 0
+    while True:
+        filas = list(
+            queryset.order_by('id').values_list('id', 'usuario_id', 'recurso__dependencia_id')[:lote]
+        )
+        if not filas:
+            break
+        total += modelo.objects.filter(id__in=[f[0] for f in filas]).update(archivado=True)
+        invalidar_usuarios(*{f[1] for f in filas})
+        invalidar_estadisticas(*{f[2] for f in filas})
+        if len(filas) < lote:
+            break
+        time.sleep(pausa)
+    return total
+
+
+def con_archivados(request, queryset):
+    """Listados: solo el historial vigente, salvo que se pida ?archivados=1."""
+    if request.GET.get('archivados'):
+        return queryset
+    return queryset.vigentes()
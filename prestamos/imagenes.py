@@ -0,0 +1,169 @@
+import hashlib
+import io
+import logging
+import posixpath
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .caches import CATALOGO, cache_de
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONES = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+# Formatos en los que se generan las miniaturas (el navegador elige con <picture>)
+FORMATOS_MINIATURA = ('WEBP', 'JPEG')
+
+
+def _abrir(archivo):
+    try:
+        archivo.seek(0)
+        imagen = Image.open(archivo)
+        # Aplicar la orientación de la cámara antes de descartar los metadatos EXIF
+        imagen = ImageOps.exif_transpose(imagen)
+        imagen.load()
+    except Image.DecompressionBombError:
+        raise ValidationError("La imagen tiene demasiados píxeles.")
+    except (UnidentifiedImageError, OSError):
+        raise ValidationError("El archivo no es una imagen válida.")
+    return imagen
+
+
+def _tiene_transparencia(imagen):
+    return imagen.mode in ('RGBA', 'LA') or (imagen.mode == 'P' and 'transparency' in imagen.info)
+
+
+def _a_rgb(imagen):
+    if _tiene_transparencia(imagen):
+        fondo = Image.new('RGB', imagen.size, (255, 255, 255))
+        fondo.paste(imagen.convert('RGBA'), mask=imagen.convert('RGBA').split()[-1])
+        return fondo
+    return imagen.convert('RGB')
+
+
+def _en_modos(imagen, modos):
+    # CMYK, YCbCr, I;16... no se pueden escribir en PNG ni en WebP
+    if imagen.mode in modos:
+        return imagen
+    return imagen.convert('RGBA' if _tiene_transparencia(imagen) else 'RGB')
+
+
+def _codificar(imagen, formato):
+    # Pillow no escribe EXIF ni bloques de texto PNG salvo que se le pidan,
+    # así que volver a codificar descarta todos los metadatos de la cámara.
+    buffer = io.BytesIO()
+    if formato == 'JPEG':
+        _a_rgb(imagen).save(buffer, 'JPEG', quality=85, optimize=True, progressive=True)
+    elif formato == 'WEBP':
+        _en_modos(imagen, ('RGB', 'RGBA')).save(buffer, 'WEBP', quality=80, method=4)
+    else:
+        _en_modos(imagen, ('1', 'L', 'LA', 'P', 'RGB', 'RGBA')).save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def procesar_imagen(archivo, max_lado, formato=None):
+    """
+    Normaliza una imagen subida: corrige la orientación, elimina EXIF, limita
+    el lado mayor a `max_lado` píxeles y la recodifica (PNG si tiene
+    transparencia, JPEG en otro caso). El nombre es el hash del contenido.
+    """
+    imagen = _abrir(archivo)
+    imagen.thumbnail((max_lado, max_lado), Image.LANCZOS)
+
+    if formato is None:
+        formato = 'PNG' if _tiene_transparencia(imagen) else 'JPEG'
+
+    try:
+        datos = _codificar(imagen, formato)
+    except OSError:
+        raise ValidationError("No se pudo procesar la imagen.")
+    nombre = f"{hashlib.sha256(datos).hexdigest()[:20]}.{EXTENSIONES[formato]}"
+    return ContentFile(datos, name=nombre)
+
+
+def ruta_miniatura(nombre, ancho, formato):
+    """recursos/abc.jpg -> recursos/miniaturas/abc_480.webp"""
+    directorio, archivo = posixpath.split(nombre)
+    base = posixpath.splitext(archivo)[0]
+    return posixpath.join(directorio, 'miniaturas', f"{base}_{ancho}.{EXTENSIONES[formato]}")
+
+
+def _clave_variantes(nombre):
+    return f'variantes:{nombre}'
+
+
+def variantes(storage, nombre, anchos):
+    """
+    Anchos de las miniaturas disponibles de `nombre` por formato
+    ({'WEBP': (240, 480), ...}). Se registran al generarlas y, como el nombre
+    lleva el hash del contenido, no cambian: las plantillas no consultan el
+    storage en cada render. Para imágenes sin registro se comprueba una vez.
+    """
+    cache = cache_de(CATALOGO)
+    registradas = cache.get(_clave_variantes(nombre))
+    if registradas is None:
+        registradas = {
+            formato: tuple(a for a in anchos if storage.exists(ruta_miniatura(nombre, a, formato)))
+            for formato in FORMATOS_MINIATURA
+        }
+        cache.set(_clave_variantes(nombre), registradas, None)
+    return registradas
+
+
+def generar_miniaturas(storage, nombre, anchos):
+    """
+    Genera las miniaturas WebP y JPEG de `nombre` para cada ancho y las
+    registra (ver `variantes`). Como el nombre original lleva el hash del
+    contenido, las existentes no se rehacen.
+    """
+    pendientes = [
+        (ancho, formato)
+        for ancho in anchos
+        for formato in FORMATOS_MINIATURA
+        if not storage.exists(ruta_miniatura(nombre, ancho, formato))
+    ]
+    if pendientes:
+        with storage.open(nombre, 'rb') as archivo:
+            imagen = _abrir(archivo)
+
+        for ancho, formato in pendientes:
+            copia = imagen.copy()
+            if copia.width > ancho:
+                copia = copia.resize((ancho, max(1, round(copia.height * ancho / copia.width))), Image.LANCZOS)
+            storage.save(ruta_miniatura(nombre, ancho, formato), ContentFile(_codificar(copia, formato)))
+
+    cache_de(CATALOGO).set(
+        _clave_variantes(nombre), {formato: tuple(anchos) for formato in FORMATOS_MINIATURA}, None
+    )
+
+
+def eliminar_imagen(storage, nombre, anchos=()):
+    """Borra la imagen original y sus miniaturas."""
+    storage.delete(nombre)
+    cache_de(CATALOGO).delete(_clave_variantes(nombre))
+    for ancho in anchos:
+        for formato in FORMATOS_MINIATURA:
+            storage.delete(ruta_miniatura(nombre, ancho, formato))
+
+
+def programar_eliminacion(campo, nombre):
+    """
+    Borra `nombre` (y sus miniaturas) cuando la transacción actual confirme,
+    y solo si ningún otro registro lo sigue referenciando. Así un rollback
+    nunca deja un registro apuntando a un archivo borrado.
+    """
+    if not nombre:
+        return
+
+    def eliminar():
+        if campo.model._default_manager.filter(**{campo.name: nombre}).exists():
+            return
+        try:
+            eliminar_imagen(campo.storage, nombre, getattr(campo, 'miniaturas', ()))
+        except OSError:
+            logger.warning("No se pudo eliminar el archivo %s", nombre, exc_info=True)
+
+    transaction.on_commit(eliminar)
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .caches import invalidar_notificaciones
+from .models import Notificacion, SolicitudPrestamo
+from .reservas import retener_para
+from .resumenes import avisar_administrador
+
+
+def poner_en_espera(solicitud):
+    """
+    Pasa la solicitud a la lista de espera FIFO del recurso y avisa al
+    solicitante. Devuelve su posición en la cola. Si ya estaba en espera no
+    cambia nada: conserva su fecha de entrada y su posición.
+    """
+    if solicitud.estado == SolicitudPrestamo.EN_ESPERA:
+        return posicion_en_espera(solicitud)
+
+    solicitud.estado = SolicitudPrestamo.EN_ESPERA
+    solicitud.fecha_espera = timezone.now()
+    SolicitudPrestamo.objects.filter(pk=solicitud.pk).update(
+        estado=solicitud.estado, fecha_espera=solicitud.fecha_espera
+    )
+
+    posicion = posicion_en_espera(solicitud)
+    Notificacion.objects.create(
+        usuario_id=solicitud.usuario_id,
+        tipo="LISTA_ESPERA",
+        mensaje=(
+            f"El recurso '{solicitud.recurso.nombre}' está prestado. Su solicitud quedó en "
+            f"lista de espera (posición {posicion}) y se le avisará cuando sea su turno."
+        ),
+    )
+    return posicion
+
+
+def posicion_en_espera(solicitud):
+    return SolicitudPrestamo.objects.filter(
+        recurso_id=solicitud.recurso_id,
+        estado=SolicitudPrestamo.EN_ESPERA,
+        fecha_espera__lte=solicitud.fecha_espera,
+    ).count()
+
+
+def promover_siguiente(recurso):
+    """
+    Cuando el recurso queda libre, la primera solicitud de su lista de espera
+    vuelve a PENDIENTE para que el administrador la apruebe, y se notifica al
+    solicitante y al administrador. El recurso queda retenido para ella
+    LISTA_ESPERA_RETENCION_HORAS (ver reservas.retener_para).
+
+    La fila se toma con select_for_update(skip_locked=True): dos devoluciones
+    simultáneas nunca promueven la misma solicitud ni se bloquean entre sí.
+    Devuelve la solicitud promovida o None.
+    """
+    with transaction.atomic():
+        siguiente = (
+            SolicitudPrestamo.objects
+            .select_for_update(skip_locked=True)
+            .filter(recurso_id=recurso.pk, estado=SolicitudPrestamo.EN_ESPERA)
+            .order_by('fecha_espera', 'id')
+            .first()
+        )
+        if siguiente is None:
+            return None
+
+        SolicitudPrestamo.objects.filter(pk=siguiente.pk).update(estado=SolicitudPrestamo.PENDIENTE)
+        siguiente.estado = SolicitudPrestamo.PENDIENTE
+        retener_para(siguiente, settings.LISTA_ESPERA_RETENCION_HORAS)
+
+        notificaciones = [
+            Notificacion(
+                usuario_id=siguiente.usuario_id,
+                tipo="LISTA_ESPERA",
+                mensaje=(
+                    f"El recurso '{recurso.nombre}' ya está disponible. Su solicitud salió de la "
+                    "lista de espera y está pendiente de aprobación."
+                ),
+            )
+        ]
+        Notificacion.objects.bulk_create(notificaciones)
+        invalidar_notificaciones(*(n.usuario_id for n in notificaciones))
+        avisar_administrador(
+            recurso.dependencia_id,
+            "SOLICITUD",
+            f"Hay una solicitud de la lista de espera pendiente para el recurso '{recurso.nombre}'.",
+        )
+
+    return siguiente
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.test import Client
+
+
+def host_permitido():
+    """
+    Primer host de ALLOWED_HOSTS utilizable en la cabecera Host. El cliente de
+    pruebas envía 'testserver', que no está permitido: sin esto cada vista
+    responde 400 (DisallowedHost) y las mediciones miden la página de error.
+    """
+    for host in settings.ALLOWED_HOSTS:
+        if host == '*':
+            return 'localhost'
+        # '.dominio' permite el dominio y sus subdominios
+        return host.lstrip('.')
+    # Sin ALLOWED_HOSTS, Django solo acepta localhost (y con DEBUG = True)
+    return 'localhost'
+
+
+def cliente_de_pruebas(usuario=None, **cabeceras):
+    """
+    Cliente de pruebas para los comandos de medición (benchmark_vistas,
+    benchmark_plantillas, explicar_consultas), con un Host permitido y, si se
+    indica, la sesión de `usuario` iniciada. Los errores de las vistas se
+    devuelven como respuesta (ver comprobar_respuesta) en lugar de lanzarse.
+    """
+    host = host_permitido()
+    cliente = Client(raise_request_exception=False, HTTP_HOST=host, SERVER_NAME=host, **cabeceras)
+    if usuario is not None and 'django.contrib.sessions' in settings.INSTALLED_APPS:
+        cliente.force_login(usuario)
+    return cliente
+
+
+def comprobar_respuesta(url, respuesta, estados=range(200, 400)):
+    """Detiene el comando si `url` no respondió con uno de `estados` (2xx/3xx por defecto)."""
+    if respuesta.status_code not in estados:
+        raise CommandError(f'{url} respondió {respuesta.status_code}: la medición no sería válida')
+    return respuesta
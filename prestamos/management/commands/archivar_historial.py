@@ -0,0 +1,36 @@
+# prestamos/management/commands/archivar_historial.py
+
+from django.core.management.base import BaseCommand
+
+from prestamos.historial import archivar, limite_archivo, prestamos_archivables, solicitudes_archivables
+
+
+class Command(BaseCommand):
+    help = (
+        'Archiva por lotes los préstamos devueltos y las solicitudes cerradas con más de '
+        'HISTORIAL_ARCHIVO_DIAS, para que los listados lean solo el historial vigente'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Filas por UPDATE')
+        parser.add_argument(
+            '--pausa', type=float, default=0.1,
+            help='Segundos de espera entre lotes para no bloquear la tabla'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar, no archivar')
+
+    def handle(self, *args, **options):
+        limite = limite_archivo()
+        grupos = (
+            ('préstamos', 'archivados', prestamos_archivables(limite)),
+            ('solicitudes', 'archivadas', solicitudes_archivables(limite)),
+        )
+
+        for nombre, participio, queryset in grupos:
+            if options['dry_run']:
+                self.stdout.write(self.style.SUCCESS(f'{queryset.count()} {nombre} se archivarían'))
+                continue
+            total = archivar(queryset, lote=options['lote'], pausa=options['pausa'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{total} {nombre} anteriores a {limite:%Y-%m-%d} {participio}'
+            ))
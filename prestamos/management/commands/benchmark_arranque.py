@@ -0,0 +1,119 @@
+# prestamos/management/commands/benchmark_arranque.py
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Lo que carga cada tipo de proceso antes de atender su primera petición o tarea.
+# Las URLs se resuelven a la fuerza porque Django las importa en la primera petición.
+_WSGI = (
+    'import django\n'
+    'django.setup(set_prefix=False)\n'
+    'from django.core.handlers.wsgi import WSGIHandler\n'
+    'application = WSGIHandler()\n'  # Igual que get_wsgi_application(): carga el middleware
+    'from django.urls import get_resolver\n'
+    'get_resolver().url_patterns\n'
+)
+CARGAS = {
+    'web': _WSGI,
+    'api': _WSGI,
+    'cron': (
+        'import django\n'
+        'django.setup()\n'
+        'from django.core.management import load_command_class\n'
+        "load_command_class('prestamos', 'notificar_devoluciones')\n"
+        'from django.urls import reverse\n'
+        "reverse('lista_solicitudes')\n"
+    ),
+}
+
+PROGRAMA = '''
+import json, resource, sys, time
+inicio = time.perf_counter()
+{carga}
+print(json.dumps({{
+    'ms': (time.perf_counter() - inicio) * 1000,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modulos': len(sys.modules),
+    'weasyprint': 'weasyprint' in sys.modules,
+}}))
+'''
+
+# import time:       self [us] |  cumulative | imported package
+LINEA_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el arranque en frío (tiempo, RSS y módulos más pesados con -X importtime) '
+        'de los procesos web, API y cron, cada uno en un intérprete nuevo'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--web-settings', default='core.settings')
+        parser.add_argument('--api-settings', default='core.settings_api')
+        parser.add_argument('--repeticiones', type=int, default=5)
+        parser.add_argument('--top', type=int, default=10, help='Módulos más pesados a mostrar por proceso')
+        parser.add_argument('--solo', nargs='*', choices=sorted(CARGAS), help='Tipos de proceso a medir')
+        parser.add_argument('--json', action='store_true', help='Informe en JSON')
+
+    def ejecutar(self, tipo, modulo_settings, importtime=False):
+        entorno = dict(os.environ, DJANGO_SETTINGS_MODULE=modulo_settings)
+        comando = [sys.executable] + (['-X', 'importtime'] if importtime else [])
+        comando += ['-c', PROGRAMA.format(carga=CARGAS[tipo])]
+        resultado = subprocess.run(
+            comando, cwd=settings.BASE_DIR, env=entorno, capture_output=True, text=True,
+        )
+        if resultado.returncode:
+            raise CommandError(f'El proceso {tipo} no arrancó:\n{resultado.stderr[-2000:]}')
+        return json.loads(resultado.stdout.strip().splitlines()[-1]), resultado.stderr
+
+    def mas_pesados(self, salida, top):
+        """Importaciones de primer nivel ordenadas por tiempo acumulado."""
+        modulos = []
+        for linea in salida.splitlines():
+            coincidencia = LINEA_IMPORTTIME.match(linea)
+            if coincidencia and len(coincidencia[3]) == 1:
+                modulos.append({'modulo': coincidencia[4], 'ms': round(int(coincidencia[2]) / 1000, 1)})
+        return sorted(modulos, key=lambda m: m['ms'], reverse=True)[:top]
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser al menos 1')
+        modulos_settings = {
+            'web': options['web_settings'],
+            'api': options['api_settings'],
+            'cron': options['web_settings'],
+        }
+
+        informe = {}
+        for tipo in options['solo'] or CARGAS:
+            # La primera ejecución compila los .pyc y calienta la caché del disco
+            self.ejecutar(tipo, modulos_settings[tipo])
+            medidas = [self.ejecutar(tipo, modulos_settings[tipo])[0] for _ in range(options['repeticiones'])]
+            _, importtime = self.ejecutar(tipo, modulos_settings[tipo], importtime=True)
+            informe[tipo] = {
+                'settings': modulos_settings[tipo],
+                'arranque_ms': round(statistics.median(m['ms'] for m in medidas), 1),
+                'rss_mb': round(max(m['rss_kb'] for m in medidas) / 1024, 1),
+                'modulos': medidas[-1]['modulos'],
+                'weasyprint': medidas[-1]['weasyprint'],
+                'mas_pesados': self.mas_pesados(importtime, options['top']),
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(informe, indent=2, ensure_ascii=False))
+            return
+        for tipo, r in informe.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{tipo} ({r['settings']}): {r['arranque_ms']} ms, {r['rss_mb']} MB RSS, "
+                f"{r['modulos']} módulos, WeasyPrint {'cargado' if r['weasyprint'] else 'no cargado'}"
+            ))
+            for m in r['mas_pesados']:
+                self.stdout.write(f"  {m['ms']:>8.1f} ms  {m['modulo']}")
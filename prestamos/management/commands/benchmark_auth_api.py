@@ -0,0 +1,61 @@
+# prestamos/management/commands/benchmark_auth_api.py
+
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+
+from prestamos.models import Usuario
+from prestamos.serializers import TokenConRolSerializer
+
+PERFILES = {
+    'mixto (core.settings)': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.TokenAuthentication',
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ],
+    'solo JWT sin estado (core.settings_api)': [
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = 'Compara el costo de autenticación por petición de la API (tiempo y consultas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('codigo', help='Código del usuario con el que se firma el JWT')
+        parser.add_argument('--peticiones', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            usuario = Usuario.objects.get(codigo=options['codigo'])
+        except Usuario.DoesNotExist:
+            raise CommandError(f"No existe el usuario {options['codigo']}")
+
+        token = str(TokenConRolSerializer.get_token(usuario).access_token)
+        factory = RequestFactory()
+        peticiones = options['peticiones']
+
+        for nombre, rutas in PERFILES.items():
+            clases = [import_string(ruta) for ruta in rutas]
+
+            with CaptureQueriesContext(connection) as consultas:
+                inicio = time.perf_counter()
+                for _ in range(peticiones):
+                    django_request = factory.get('/api/recursos/', HTTP_AUTHORIZATION=f'Bearer {token}')
+                    # Lo que dejaría AuthenticationMiddleware sin cookie de sesión
+                    django_request.user = AnonymousUser()
+                    request = Request(django_request, authenticators=[cls() for cls in clases])
+                    assert request.user.is_authenticated
+                total = time.perf_counter() - inicio
+
+            self.stdout.write(
+                f'{nombre}: {total / peticiones * 1e6:.1f} µs/petición, '
+                f'{len(consultas) / peticiones:.2f} consultas/petición'
+            )
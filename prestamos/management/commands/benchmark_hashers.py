@@ -0,0 +1,46 @@
+# prestamos/management/commands/benchmark_hashers.py
+
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = 'Mide el tiempo de make_password/check_password de cada hasher configurado'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iteraciones', type=int, default=20)
+
+    def handle(self, *args, **options):
+        iteraciones = options['iteraciones']
+        password = 'Contraseña-de-prueba-123'
+
+        for ruta in settings.PASSWORD_HASHERS:
+            try:
+                hasher = import_string(ruta)()
+                if hasher.library:
+                    hasher._load_library()
+            except ImportError as e:
+                self.stdout.write(self.style.WARNING(f'{ruta}: no disponible ({e})'))
+                continue
+
+            inicio = time.perf_counter()
+            for _ in range(iteraciones):
+                codificado = hasher.encode(password, hasher.salt())
+            t_encode = (time.perf_counter() - inicio) / iteraciones
+
+            inicio = time.perf_counter()
+            for _ in range(iteraciones):
+                hasher.verify(password, codificado)
+            t_verify = (time.perf_counter() - inicio) / iteraciones
+
+            self.stdout.write(
+                f'{ruta}: encode {t_encode * 1000:.1f} ms, verify {t_verify * 1000:.1f} ms '
+                f'(~{1 / t_verify:.0f} logins/s por núcleo)'
+            )
+
+        preferido = get_hasher('default')
+        self.stdout.write(self.style.SUCCESS(f'Hasher por defecto: {preferido.__class__.__name__}'))
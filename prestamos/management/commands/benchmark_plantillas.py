@@ -0,0 +1,65 @@
+# prestamos/management/commands/benchmark_plantillas.py
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from prestamos.management.cliente import cliente_de_pruebas, comprobar_respuesta
+from prestamos.models import Usuario
+from prestamos.versiones import invalidar_usuarios
+
+PAGINAS = {
+    Usuario.ADMIN: ['inicio', 'inventario', 'lista_prestamos', 'estadisticas'],
+    Usuario.ESTUDIANTE: ['inicio', 'lista_dependencias', 'mis_prestamos', 'perfil_usuario'],
+    Usuario.PROFESOR: ['inicio', 'lista_dependencias', 'mis_prestamos', 'perfil_usuario'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el tiempo de respuesta de las páginas principales con los fragmentos '
+        '{% cache %} fríos (versión de usuario recién invalidada) y calientes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('codigo', help='Código del usuario con el que se navega')
+        parser.add_argument('--repeticiones', type=int, default=20)
+
+    def medir(self, cliente, url, usuario_id, repeticiones, frio):
+        tiempos = []
+        consultas = 0
+        for _ in range(repeticiones):
+            if frio:
+                invalidar_usuarios(usuario_id)
+            with CaptureQueriesContext(connection) as capturadas:
+                inicio = time.perf_counter()
+                respuesta = cliente.get(url)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            consultas = len(capturadas)
+            comprobar_respuesta(url, respuesta, estados=(200,))
+        return statistics.median(tiempos), consultas
+
+    def handle(self, *args, **options):
+        try:
+            usuario = Usuario.objects.get(codigo=options['codigo'])
+        except Usuario.DoesNotExist:
+            raise CommandError(f"No existe el usuario {options['codigo']}")
+
+        cliente = cliente_de_pruebas(usuario)
+        repeticiones = options['repeticiones']
+
+        self.stdout.write(f"{'página':<22}{'frío ms':>10}{'caliente ms':>13}{'mejora':>9}{'consultas':>12}")
+        for nombre in PAGINAS.get(usuario.rol, []):
+            url = reverse(nombre)
+            comprobar_respuesta(url, cliente.get(url), estados=(200,))  # compila las plantillas (cached loader)
+            frio, consultas_frio = self.medir(cliente, url, usuario.pk, repeticiones, frio=True)
+            caliente, consultas_caliente = self.medir(cliente, url, usuario.pk, repeticiones, frio=False)
+            mejora = (1 - caliente / frio) * 100 if frio else 0
+            self.stdout.write(
+                f'{nombre:<22}{frio:>10.2f}{caliente:>13.2f}{mejora:>8.1f}%'
+                f'{consultas_frio:>6} → {consultas_caliente}'
+            )
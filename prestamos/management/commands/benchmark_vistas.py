@@ -0,0 +1,180 @@
+# prestamos/management/commands/benchmark_vistas.py
+
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+
+from prestamos.caches import invalidar_estadisticas, invalidar_notificaciones
+from prestamos.management.cliente import cliente_de_pruebas, comprobar_respuesta
+from prestamos.models import Usuario
+from prestamos.serializers import TokenConRolSerializer
+from prestamos.versiones import invalidar_usuarios
+
+# (nombre, quién navega, nombre de la ruta). Las rutas /api/ se piden con JWT.
+# /api/usuarios/ y /api/prestamos/ no están: UsuarioSerializer declara el
+# campo `dependencia`, que Usuario no tiene, y responden 500 en cualquier base.
+ESCENARIOS = [
+    ('inicio_admin', 'admin', 'inicio'),
+    ('inventario', 'admin', 'inventario'),
+    ('estadisticas', 'admin', 'estadisticas'),
+    ('lista_prestamos', 'admin', 'lista_prestamos'),
+    ('inicio_usuario', 'usuario', 'inicio'),
+    ('obtener_notificaciones', 'usuario', 'obtener_notificaciones'),
+    ('api_dependencias', 'usuario', 'dependencia-list'),
+    ('api_recursos', 'usuario', 'recurso-list'),
+]
+
+
+def percentil(valores, p):
+    valores = sorted(valores)
+    if not valores:
+        return 0
+    indice = min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide p50/p95 y número de consultas de las vistas principales y de la API con el '
+        'cliente de pruebas; genera JSON y, con --comparar, falla si hay regresiones'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--admin', default='SEED-ADM0', help='Código del administrador (ver seed_datos)')
+        parser.add_argument('--usuario', default='SEED-000001', help='Código del estudiante/profesor')
+        parser.add_argument('--repeticiones', type=int, default=30)
+        parser.add_argument('--calentamiento', type=int, default=3, help='Peticiones iniciales que no se miden')
+        parser.add_argument('--frio', action='store_true', help='Invalidar las cachés antes de cada petición')
+        parser.add_argument('--solo', nargs='*', help='Nombres de escenarios a ejecutar')
+        parser.add_argument('--salida', help='Archivo donde guardar el JSON (por defecto, stdout)')
+        parser.add_argument('--comparar', help='JSON de una ejecución anterior usada como referencia')
+        parser.add_argument(
+            '--tolerancia', type=float, default=0.25,
+            help='Aumento relativo de p95 permitido frente a la referencia (0.25 = 25 %%)'
+        )
+
+    def usuario(self, codigo):
+        try:
+            return Usuario.objects.get(codigo=codigo)
+        except Usuario.DoesNotExist:
+            raise CommandError(f'No existe el usuario {codigo} (¿falta ejecutar seed_datos?)')
+
+    def clientes(self, options):
+        clientes = {}
+        for rol, codigo in (('admin', options['admin']), ('usuario', options['usuario'])):
+            usuario = self.usuario(codigo)
+            cliente = cliente_de_pruebas(
+                usuario,
+                HTTP_AUTHORIZATION=f'Bearer {TokenConRolSerializer.get_token(usuario).access_token}',
+            )
+            clientes[rol] = (cliente, usuario)
+        return clientes
+
+    def invalidar(self, usuario):
+        invalidar_usuarios(usuario.pk)
+        invalidar_notificaciones(usuario.pk)
+        dependencia = getattr(usuario, 'dependencia_administrada', None)
+        if dependencia is not None:
+            invalidar_estadisticas(dependencia.pk)
+
+    def medir(self, cliente, usuario, url, options):
+        # Solo se miden respuestas 2xx/3xx: un 400 o un 500 mediría la página de error
+        for _ in range(options['calentamiento']):
+            comprobar_respuesta(url, cliente.get(url))
+
+        tiempos, consultas, estados = [], [], set()
+        for _ in range(options['repeticiones']):
+            if options['frio']:
+                self.invalidar(usuario)
+            with CaptureQueriesContext(connection) as capturadas:
+                inicio = time.perf_counter()
+                respuesta = cliente.get(url)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            consultas.append(len(capturadas))
+            estados.add(comprobar_respuesta(url, respuesta).status_code)
+
+        return {
+            'url': url,
+            'estados': sorted(estados),
+            'p50_ms': round(percentil(tiempos, 50), 2),
+            'p95_ms': round(percentil(tiempos, 95), 2),
+            'media_ms': round(statistics.mean(tiempos), 2),
+            'consultas': statistics.median(consultas),
+            'consultas_max': max(consultas),
+        }
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser al menos 1')
+
+        clientes = self.clientes(options)
+        resultados, omitidos = {}, []
+        for nombre, rol, ruta in ESCENARIOS:
+            if options['solo'] and nombre not in options['solo']:
+                continue
+            try:
+                url = reverse(ruta)
+            except NoReverseMatch:
+                # Perfiles sin vistas web (core.settings_api)
+                omitidos.append(nombre)
+                continue
+            cliente, usuario = clientes[rol]
+            resultados[nombre] = self.medir(cliente, usuario, url, options)
+            if options['verbosity'] > 1:
+                r = resultados[nombre]
+                self.stderr.write(f"{nombre:<24}p50 {r['p50_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms  {r['consultas']} consultas")
+
+        informe = {
+            'fecha': timezone.now().isoformat(),
+            'settings': settings.SETTINGS_MODULE,
+            'motor': connection.vendor,
+            'repeticiones': options['repeticiones'],
+            'frio': options['frio'],
+            'resultados': resultados,
+            'omitidos': omitidos,
+        }
+        if options['comparar']:
+            informe['regresiones'] = self.comparar(informe, options['comparar'], options['tolerancia'])
+
+        texto = json.dumps(informe, indent=2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                archivo.write(texto + '\n')
+        else:
+            self.stdout.write(texto)
+
+        if informe.get('regresiones'):
+            raise CommandError(f"{len(informe['regresiones'])} regresiones frente a {options['comparar']}")
+
+    def comparar(self, informe, ruta, tolerancia):
+        """Escenarios más lentos (p95) o con más consultas que en la referencia."""
+        with open(ruta, encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        for clave in ('settings', 'motor', 'frio'):
+            if datos.get(clave) != informe[clave]:
+                self.stderr.write(f"Aviso: la referencia usa {clave}={datos.get(clave)!r} y esta ejecución {informe[clave]!r}")
+        referencia = datos['resultados']
+
+        regresiones = []
+        for nombre, actual in informe['resultados'].items():
+            anterior = referencia.get(nombre)
+            if anterior is None:
+                continue
+            if actual['p95_ms'] > anterior['p95_ms'] * (1 + tolerancia):
+                regresiones.append({
+                    'escenario': nombre, 'metrica': 'p95_ms',
+                    'antes': anterior['p95_ms'], 'ahora': actual['p95_ms'],
+                })
+            if actual['consultas'] > anterior['consultas']:
+                regresiones.append({
+                    'escenario': nombre, 'metrica': 'consultas',
+                    'antes': anterior['consultas'], 'ahora': actual['consultas'],
+                })
+        return regresiones
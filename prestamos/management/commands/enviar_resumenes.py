@@ -0,0 +1,24 @@
+# prestamos/management/commands/enviar_resumenes.py
+
+from django.core.management.base import BaseCommand
+
+from prestamos.models import AvisoAdmin
+from prestamos.resumenes import enviar_resumen, enviar_resumenes
+
+
+class Command(BaseCommand):
+    help = 'Envía a cada administrador de dependencia el resumen de sus avisos pendientes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--todos', action='store_true',
+            help='Enviar también los resúmenes cuya ventana aún no termina'
+        )
+
+    def handle(self, *args, **options):
+        if options['todos']:
+            dependencias = set(AvisoAdmin.objects.values_list('dependencia_id', flat=True))
+            enviados = sum(1 for dependencia_id in dependencias if enviar_resumen(dependencia_id))
+        else:
+            enviados = enviar_resumenes()
+        self.stdout.write(self.style.SUCCESS(f'{enviados} resúmenes enviados'))
@@ -0,0 +1,235 @@
+# prestamos/management/commands/explicar_consultas.py
+
+import json
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+
+from prestamos.caches import invalidar_estadisticas, invalidar_notificaciones
+from prestamos.management.cliente import cliente_de_pruebas, comprobar_respuesta
+from prestamos.models import Usuario
+from prestamos.versiones import invalidar_usuarios
+
+# (quién navega, ruta, parámetros GET). Se reproduce cada vista con el cliente
+# de pruebas y se explican las consultas que ejecuta de verdad, así el informe
+# sigue a los querysets de las vistas (prestamos/views*.py) sin duplicarlos aquí.
+# ⚠️ recursos_no_disponibles e historial_prestamos no están: sus plantillas no
+# existen y responden 500, y el informe de una página de error no sirve.
+VISTAS = [
+    ('admin', 'inicio', ''),
+    ('admin', 'inventario', ''),
+    ('admin', 'lista_solicitudes', ''),
+    ('admin', 'lista_prestamos', ''),
+    ('admin', 'prestamos_activos', ''),
+    ('admin', 'estadisticas', ''),
+    ('admin', 'buscar', 'q=port'),
+    ('usuario', 'inicio', ''),
+    ('usuario', 'lista_dependencias', ''),
+    ('usuario', 'mis_solicitudes', ''),
+    ('usuario', 'mis_prestamos', ''),
+    ('usuario', 'obtener_notificaciones', ''),
+]
+
+# Tablas que no interesan (sesiones, caché en BD)
+IGNORADAS = ('django_session', 'cache_')
+
+COLUMNA = re.compile(r'"(\w+)"\."(\w+)"')
+
+# Django nombra las tablas repetidas o de subconsultas como `"tabla" T3` / `"tabla" U0`
+ALIAS = re.compile(r'"(\w+)"\s+(?:AS\s+)?"?([A-Z]\d+)"?\b')
+
+# `SCAN tabla` (SQLite >= 3.36) o `SCAN TABLE tabla [AS alias]` (versiones anteriores)
+RECORRIDO_SQLITE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?(.*)$')
+
+
+def recorridos_sqlite(filas, sql):
+    """
+    (tabla, detalle) de cada `SCAN` sin índice en las filas de EXPLAIN QUERY
+    PLAN de `sql`. Los alias se resuelven a su tabla con el propio SQL.
+    """
+    alias = {a: tabla for tabla, a in ALIAS.findall(sql)}
+    for fila in filas:
+        detalle = fila[-1]
+        encontrado = RECORRIDO_SQLITE.match(detalle)
+        if not encontrado or 'INDEX' in encontrado.group(3):
+            continue
+        nombre = encontrado.group(2) or encontrado.group(1)
+        yield alias.get(nombre, encontrado.group(1)), {'plan': detalle}
+
+
+class Capturador:
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            self.consultas.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Reproduce las vistas principales, explica sus consultas (EXPLAIN ANALYZE/BUFFERS en '
+        'PostgreSQL, EXPLAIN QUERY PLAN en SQLite) y señala recorridos secuenciales en tablas grandes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--admin', default='SEED-ADM0', help='Código del administrador (ver seed_datos)')
+        parser.add_argument('--usuario', default='SEED-000001', help='Código del estudiante/profesor')
+        parser.add_argument('--min-filas', type=int, default=10_000, help='Tamaño a partir del cual una tabla es grande')
+        parser.add_argument('--json', action='store_true', help='Informe en JSON')
+        parser.add_argument('--fallar', action='store_true', help='Terminar con error si hay recorridos señalados')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f'Motor no soportado: {connection.vendor}')
+        self.min_filas = options['min_filas']
+        self.filas_tabla = {}
+        self.indices_tabla = {}
+        self.tablas = set(connection.introspection.table_names())
+
+        clientes = {}
+        for rol in ('admin', 'usuario'):
+            try:
+                usuario = Usuario.objects.get(codigo=options[rol])
+            except Usuario.DoesNotExist:
+                raise CommandError(f'No existe el usuario {options[rol]} (¿falta ejecutar seed_datos?)')
+            clientes[rol] = (cliente_de_pruebas(usuario), usuario)
+
+        informe = []
+        for rol, ruta, consulta in VISTAS:
+            cliente, usuario = clientes[rol]
+            informe.append(self.explicar_vista(cliente, usuario, f'{rol}:{ruta}', reverse(ruta), consulta))
+
+        if options['json']:
+            self.stdout.write(json.dumps(informe, indent=2, ensure_ascii=False))
+        else:
+            self.imprimir(informe)
+
+        total = sum(len(v['recorridos']) for v in informe)
+        if options['fallar'] and total:
+            raise CommandError(f'{total} recorridos secuenciales en tablas grandes')
+
+    def explicar_vista(self, cliente, usuario, nombre, url, consulta):
+        # Cachés frías: si no, estadisticas o notificaciones no llegan a consultar
+        invalidar_usuarios(usuario.pk)
+        invalidar_notificaciones(usuario.pk)
+        dependencia = getattr(usuario, 'dependencia_administrada', None)
+        if dependencia is not None:
+            invalidar_estadisticas(dependencia.pk)
+
+        capturador = Capturador()
+        with connection.execute_wrapper(capturador):
+            respuesta = cliente.get(f'{url}?{consulta}' if consulta else url)
+        # Las consultas de una página de error no son las de la vista
+        comprobar_respuesta(url, respuesta, estados=(200,))
+
+        recorridos, vistas = [], set()
+        for sql, params in capturador.consultas:
+            if sql in vistas or any(t in sql for t in IGNORADAS):
+                continue
+            vistas.add(sql)
+            explicar = self.explicar_postgres if connection.vendor == 'postgresql' else self.explicar_sqlite
+            for tabla, detalle in explicar(sql, params):
+                if tabla not in self.tablas:
+                    continue
+                filas = self.filas(tabla)
+                if filas < self.min_filas:
+                    continue
+                recorridos.append({
+                    'tabla': tabla,
+                    'filas': filas,
+                    'detalle': detalle,
+                    'sugerencia': self.sugerir_indice(tabla, sql),
+                    'sql': sql[:300],
+                })
+        return {
+            'vista': nombre, 'url': url, 'estado': respuesta.status_code,
+            'consultas': len(capturador.consultas), 'recorridos': recorridos,
+        }
+
+    # --- Planes ---------------------------------------------------------
+
+    def explicar_postgres(self, sql, params):
+        """(tabla, detalle) de cada Seq Scan de EXPLAIN (ANALYZE, BUFFERS)."""
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        pendientes = [plan[0]['Plan']]
+        while pendientes:
+            nodo = pendientes.pop()
+            pendientes.extend(nodo.get('Plans', []))
+            if nodo.get('Node Type') == 'Seq Scan':
+                yield nodo['Relation Name'], {
+                    'filtro': nodo.get('Filter', ''),
+                    'filas_leidas': nodo.get('Actual Rows', 0) + nodo.get('Rows Removed by Filter', 0),
+                    'ms': nodo.get('Actual Total Time'),
+                    'buffers_hit': nodo.get('Shared Hit Blocks'),
+                    'buffers_read': nodo.get('Shared Read Blocks'),
+                }
+
+    def explicar_sqlite(self, sql, params):
+        """(tabla, detalle) de cada `SCAN tabla` sin índice de EXPLAIN QUERY PLAN."""
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            filas = cursor.fetchall()
+        return recorridos_sqlite(filas, sql)
+
+    # --- Tablas e índices ---------------------------------------------
+
+    def filas(self, tabla):
+        if tabla not in self.filas_tabla:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [tabla])
+                    fila = cursor.fetchone()
+                    self.filas_tabla[tabla] = max(fila[0], 0) if fila else 0
+                else:
+                    cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(tabla)}')
+                    self.filas_tabla[tabla] = cursor.fetchone()[0]
+        return self.filas_tabla[tabla]
+
+    def primeras_columnas_indexadas(self, tabla):
+        if tabla not in self.indices_tabla:
+            with connection.cursor() as cursor:
+                restricciones = connection.introspection.get_constraints(cursor, tabla)
+            self.indices_tabla[tabla] = {
+                r['columns'][0] for r in restricciones.values()
+                if (r['index'] or r['unique'] or r['primary_key']) and r['columns'] and r['columns'][0]
+            }
+        return self.indices_tabla[tabla]
+
+    def sugerir_indice(self, tabla, sql):
+        """
+        Columnas de `tabla` usadas en WHERE / ORDER BY que no encabezan ningún
+        índice. Es una pista para la revisión, no un índice listo para crear.
+        """
+        desde = re.search(r'\bWHERE\b|\bORDER BY\b', sql)
+        if not desde:
+            return None
+        usadas = []
+        for t, columna in COLUMNA.findall(sql[desde.start():]):
+            if t == tabla and columna not in usadas:
+                usadas.append(columna)
+        faltantes = [c for c in usadas if c not in self.primeras_columnas_indexadas(tabla)]
+        if not faltantes:
+            return None
+        return f'Índice en {tabla}({", ".join(faltantes)})'
+
+    def imprimir(self, informe):
+        for vista in informe:
+            estilo = self.style.WARNING if vista['recorridos'] else self.style.SUCCESS
+            self.stdout.write(estilo(
+                f"{vista['vista']} ({vista['url']}, {vista['estado']}): "
+                f"{vista['consultas']} consultas, {len(vista['recorridos'])} recorridos secuenciales"
+            ))
+            for r in vista['recorridos']:
+                self.stdout.write(f"  - {r['tabla']} ({r['filas']:,} filas): {r['detalle']}")
+                if r['sugerencia']:
+                    self.stdout.write(f"    sugerencia: {r['sugerencia']}")
+                self.stdout.write(f"    {r['sql']}")
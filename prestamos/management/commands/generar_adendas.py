@@ -0,0 +1,33 @@
+# prestamos/management/commands/generar_adendas.py
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from prestamos.adendas import generar_adenda
+from prestamos.models import PrestamoExtension
+
+
+class Command(BaseCommand):
+    help = 'Genera las adendas PDF de las extensiones de préstamo que aún no la tienen'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limite', type=int, default=200, help='Máximo de adendas por ejecución')
+
+    def handle(self, *args, **options):
+        pendientes = (
+            PrestamoExtension.objects
+            .filter(Q(adenda='') | Q(adenda__isnull=True))
+            .order_by('id')
+            .values_list('id', flat=True)[:options['limite']]
+        )
+
+        generadas = errores = 0
+        for extension_id in list(pendientes):
+            try:
+                generar_adenda(extension_id)
+                generadas += 1
+            except Exception as e:
+                errores += 1
+                self.stderr.write(f"Extensión {extension_id}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Adendas generadas: {generadas}, con error: {errores}"))
@@ -0,0 +1,96 @@
+# prestamos/management/commands/limpiar_media.py
+
+import os
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from prestamos.imagenes import FORMATOS_MINIATURA, ruta_miniatura
+
+# Directorios de MEDIA_ROOT que no pertenecen a ningún FileField
+DIRECTORIOS_EXCLUIDOS = (
+    'encabezado_contratos',  # Escudo y encabezado usados al generar los contratos
+    'cache_miniaturas',      # Gestionado por su propio desalojo LRU
+    'temp_contratos',        # PDFs en proceso de generación
+)
+
+
+class Command(BaseCommand):
+    help = 'Elimina de MEDIA_ROOT los archivos que ningún FileField/ImageField referencia'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo reportar, no borrar')
+        parser.add_argument('--lote', type=int, default=500, help='Archivos a borrar por lote')
+        parser.add_argument(
+            '--min-edad', type=int, default=60,
+            help='Minutos de antigüedad mínima (evita borrar subidas aún sin registro)'
+        )
+
+    def referenciados(self):
+        """Conjunto de rutas referenciadas por todos los modelos, leído en streaming."""
+        rutas = set()
+        for modelo in apps.get_models():
+            campos = [c for c in modelo._meta.concrete_fields if isinstance(c, models.FileField)]
+            for campo in campos:
+                nombres = (
+                    modelo._default_manager.exclude(**{campo.name: ''})
+                    .exclude(**{f'{campo.name}__isnull': True})
+                    .values_list(campo.name, flat=True)
+                    .iterator(chunk_size=2000)
+                )
+                anchos = getattr(campo, 'miniaturas', ())
+                for nombre in nombres:
+                    rutas.add(nombre)
+                    for ancho in anchos:
+                        for formato in FORMATOS_MINIATURA:
+                            rutas.add(ruta_miniatura(nombre, ancho, formato))
+        return rutas
+
+    def recorrer(self, directorio, relativo=''):
+        for entrada in os.scandir(directorio):
+            ruta = f'{relativo}{entrada.name}'
+            if entrada.is_dir(follow_symlinks=False):
+                if ruta not in DIRECTORIOS_EXCLUIDOS:
+                    yield from self.recorrer(entrada.path, f'{ruta}/')
+            elif entrada.is_file(follow_symlinks=False):
+                yield ruta, entrada
+
+    def handle(self, *args, **options):
+        referenciados = self.referenciados()
+        limite_mtime = time.time() - options['min_edad'] * 60
+
+        lote, borrados, liberado = [], 0, 0
+
+        def vaciar(lote):
+            nonlocal borrados, liberado
+            for entrada, tamano in lote:
+                if not options['dry_run']:
+                    try:
+                        os.remove(entrada.path)
+                    except FileNotFoundError:
+                        continue
+                borrados += 1
+                liberado += tamano
+
+        for ruta, entrada in self.recorrer(settings.MEDIA_ROOT):
+            if ruta in referenciados:
+                continue
+            estado = entrada.stat()
+            if estado.st_mtime > limite_mtime:
+                continue
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  {ruta}')
+            lote.append((entrada, estado.st_size))
+            if len(lote) >= options['lote']:
+                vaciar(lote)
+                lote = []
+        vaciar(lote)
+
+        accion = 'se borrarían' if options['dry_run'] else 'borrados'
+        self.stdout.write(self.style.SUCCESS(
+            f'{borrados} archivos huérfanos {accion}, {liberado / (1024 * 1024):.1f} MB recuperados '
+            f'({len(referenciados)} rutas referenciadas)'
+        ))
@@ -0,0 +1,44 @@
+# prestamos/management/commands/limpiar_sesiones.py
+
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Borra por lotes las sesiones vencidas de django_session'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Sesiones a borrar por DELETE')
+        parser.add_argument(
+            '--pausa', type=float, default=0.1,
+            help='Segundos de espera entre lotes para no bloquear la tabla'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar, no borrar')
+
+    def handle(self, *args, **options):
+        # A diferencia de `clearsessions`, que borra todo en un solo DELETE,
+        # cada lote es una transacción corta que usa el índice de expire_date.
+        ahora = timezone.now()
+        vencidas = Session.objects.filter(expire_date__lt=ahora)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{vencidas.count()} sesiones vencidas se borrarían'))
+            return
+
+        borradas = lotes = 0
+        while True:
+            claves = list(vencidas.values_list('session_key', flat=True)[:options['lote']])
+            if not claves:
+                break
+            borradas += Session.objects.filter(session_key__in=claves).delete()[0]
+            lotes += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  lote {lotes}: {borradas} sesiones borradas')
+            if len(claves) < options['lote']:
+                break
+            time.sleep(options['pausa'])
+
+        self.stdout.write(self.style.SUCCESS(f'{borradas} sesiones vencidas borradas en {lotes} lotes'))
@@ -0,0 +1,65 @@
+# prestamos/management/commands/particionar_notificaciones.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from prestamos.retencion import TABLA_ARCHIVO, crear_particiones, es_particionada
+
+
+class Command(BaseCommand):
+    help = (
+        'Convierte el archivo de notificaciones en una tabla particionada por mes (solo PostgreSQL); '
+        'si ya lo está, crea las particiones de los próximos meses'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meses', type=int, default=3, help='Meses futuros con partición creada')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('El particionado solo está disponible en PostgreSQL')
+
+        ahora = timezone.now()
+        if es_particionada():
+            creadas = crear_particiones(ahora, options['meses'])
+            self.stdout.write(self.style.SUCCESS(f'Tabla ya particionada; {len(creadas)} particiones nuevas'))
+            return
+
+        # El archivo solo lo escribe purgar_notificaciones: la conversión se hace
+        # en una transacción con la tabla bloqueada, sin afectar a la campana.
+        q = connection.ops.quote_name
+        anterior = f'{TABLA_ARCHIVO}_sin_particionar'
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {q(TABLA_ARCHIVO)} IN ACCESS EXCLUSIVE MODE')
+            restricciones = connection.introspection.get_constraints(cursor, TABLA_ARCHIVO)
+            cursor.execute(f'ALTER TABLE {q(TABLA_ARCHIVO)} RENAME TO {q(anterior)}')
+            # Los nombres de índices son únicos por esquema: se liberan para la tabla nueva
+            for nombre, r in restricciones.items():
+                if r['index'] or r['primary_key']:
+                    cursor.execute(f'ALTER INDEX {q(nombre)} RENAME TO {q((nombre + "_old")[-63:])}')
+
+            cursor.execute(
+                f'CREATE TABLE {q(TABLA_ARCHIVO)} (LIKE {q(anterior)} INCLUDING DEFAULTS) '
+                f'PARTITION BY RANGE (fecha)'
+            )
+            # La clave de una tabla particionada debe incluir la columna de partición
+            cursor.execute(f'ALTER TABLE {q(TABLA_ARCHIVO)} ADD PRIMARY KEY (id, fecha)')
+            cursor.execute(
+                f'CREATE INDEX {q("notif_archivada_usuario_idx")} '
+                f'ON {q(TABLA_ARCHIVO)} (usuario_id, fecha DESC)'
+            )
+
+            cursor.execute(f'SELECT MIN(fecha) FROM {q(anterior)}')
+            desde = cursor.fetchone()[0] or ahora
+            meses = (ahora.year - desde.year) * 12 + ahora.month - desde.month + options['meses']
+            creadas = crear_particiones(desde, meses)
+            cursor.execute(f'CREATE TABLE {q(TABLA_ARCHIVO + "_default")} PARTITION OF {q(TABLA_ARCHIVO)} DEFAULT')
+
+            cursor.execute(f'INSERT INTO {q(TABLA_ARCHIVO)} SELECT * FROM {q(anterior)}')
+            copiadas = cursor.rowcount
+            cursor.execute(f'DROP TABLE {q(anterior)}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{TABLA_ARCHIVO} particionada: {len(creadas)} particiones mensuales, {copiadas} filas copiadas'
+        ))
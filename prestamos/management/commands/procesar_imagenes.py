@@ -0,0 +1,86 @@
+# prestamos/management/commands/procesar_imagenes.py
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from prestamos.imagenes import generar_miniaturas, programar_eliminacion
+from prestamos.models import Dependencia, Recurso, Usuario
+
+# Campos de imagen que pasan por ImagenOptimizadaField
+CAMPOS = [
+    (Recurso, 'foto'),
+    (Usuario, 'foto'),
+    (Usuario, 'firma'),
+    (Dependencia, 'imagen'),
+]
+
+# Nombre que genera procesar_imagen(): hash de 20 caracteres (+ sufijo de colisión)
+NOMBRE_PROCESADO = re.compile(r'^[0-9a-f]{20}(_\w+)?\.(jpg|png)$')
+
+
+class Command(BaseCommand):
+    help = 'Procesa en paralelo las imágenes existentes (sin EXIF, tamaño acotado, miniaturas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=4)
+        parser.add_argument('--forzar', action='store_true', help='Reprocesar también las ya procesadas')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        for modelo, nombre_campo in CAMPOS:
+            campo = modelo._meta.get_field(nombre_campo)
+            pendientes = [
+                (pk, nombre)
+                for pk, nombre in (
+                    modelo.objects.exclude(**{nombre_campo: ''})
+                    .exclude(**{f'{nombre_campo}__isnull': True})
+                    .values_list('pk', nombre_campo)
+                    .iterator()
+                )
+                if options['forzar'] or not NOMBRE_PROCESADO.match(nombre.rsplit('/', 1)[-1])
+            ]
+
+            etiqueta = f'{modelo.__name__}.{nombre_campo}'
+            if options['dry_run']:
+                self.stdout.write(f'{etiqueta}: {len(pendientes)} imágenes por procesar')
+                continue
+
+            with ThreadPoolExecutor(max_workers=options['hilos']) as executor:
+                resultados = list(executor.map(lambda item: self.procesar(campo, *item), pendientes))
+
+            bytes_antes = bytes_despues = errores = 0
+            for pk, nombre_anterior, nuevo, tam_antes, tam_despues in resultados:
+                if nuevo is None:
+                    errores += 1
+                    continue
+                # Las escrituras a la BD se hacen en el hilo principal. El archivo
+                # anterior se borra tras el commit y solo si ningún otro registro
+                # lo comparte (p. ej. la misma foto subida a dos recursos)
+                with transaction.atomic():
+                    modelo.objects.filter(pk=pk).update(**{nombre_campo: nuevo})
+                    if nuevo != nombre_anterior:
+                        programar_eliminacion(campo, nombre_anterior)
+                bytes_antes += tam_antes
+                bytes_despues += tam_despues
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{etiqueta}: {len(resultados) - errores} procesadas, {errores} errores, '
+                f'{bytes_antes / 1e6:.1f} MB -> {bytes_despues / 1e6:.1f} MB'
+            ))
+
+    def procesar(self, campo, pk, nombre):
+        storage = campo.storage
+        try:
+            tam_antes = storage.size(nombre)
+            with storage.open(nombre, 'rb') as archivo:
+                procesada = campo.procesar(archivo)
+            nuevo = storage.save(campo.generate_filename(None, procesada.name), procesada)
+            if campo.miniaturas:
+                generar_miniaturas(storage, nuevo, campo.miniaturas)
+            return pk, nombre, nuevo, tam_antes, storage.size(nuevo)
+        except Exception as e:
+            self.stderr.write(f'⚠️ {nombre}: {e}')
+            return pk, nombre, None, 0, 0
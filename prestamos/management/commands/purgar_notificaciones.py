@@ -0,0 +1,61 @@
+# prestamos/management/commands/purgar_notificaciones.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from prestamos.models import Notificacion, NotificacionArchivada
+from prestamos.retencion import (
+    archivar_notificaciones, crear_particiones, es_particionada, filtro_retencion, purgar_archivo,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Archiva por lotes las notificaciones leídas (o no leídas muy antiguas) y vacía '
+        'el archivo según NOTIFICACIONES_*_DIAS'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=2000, help='Notificaciones por transacción')
+        parser.add_argument(
+            '--pausa', type=float, default=0.2,
+            help='Segundos de espera entre lotes para no bloquear la tabla'
+        )
+        parser.add_argument('--sin-archivar', action='store_true', help='Borrar sin copiar al archivo')
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar, no mover ni borrar')
+
+    def handle(self, *args, **options):
+        ahora = timezone.now()
+        filtro = filtro_retencion(ahora)
+        dias_archivo = settings.NOTIFICACIONES_ARCHIVO_DIAS
+        limite_archivo = ahora - timedelta(days=dias_archivo) if dias_archivo else None
+
+        if options['dry_run']:
+            pendientes = Notificacion.objects.filter(filtro).count()
+            self.stdout.write(self.style.SUCCESS(f'{pendientes} notificaciones se archivarían'))
+            if limite_archivo:
+                viejas = NotificacionArchivada.objects.filter(fecha__lt=limite_archivo).count()
+                self.stdout.write(self.style.SUCCESS(f'{viejas} notificaciones archivadas se borrarían'))
+            return
+
+        particionada = es_particionada()
+        if particionada:
+            # Particiones del mes en curso y los dos siguientes antes de mover filas
+            for nombre in crear_particiones(ahora, 3):
+                self.stdout.write(f'  partición creada: {nombre}')
+
+        movidas = archivar_notificaciones(
+            filtro, lote=options['lote'], pausa=options['pausa'], archivar=not options['sin_archivar'],
+        )
+        accion = 'borradas' if options['sin_archivar'] else 'archivadas'
+        self.stdout.write(self.style.SUCCESS(f'{movidas} notificaciones {accion}'))
+
+        if limite_archivo:
+            borradas = purgar_archivo(limite_archivo, lote=options['lote'], pausa=options['pausa'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{borradas} notificaciones archivadas anteriores a {limite_archivo:%Y-%m-%d} eliminadas'
+                + (' (particiones incluidas)' if particionada else '')
+            ))
@@ -0,0 +1,256 @@
+# prestamos/management/commands/seed_datos.py
+
+import itertools
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from prestamos.caches import invalidar_estadisticas, invalidar_notificaciones
+from prestamos.models import (
+    Dependencia, Notificacion, Prestamo, Recurso, SolicitudPrestamo, TipoRecurso, Usuario,
+)
+
+# Todo lo generado lleva estos prefijos para poder borrarlo con --borrar.
+# Las dependencias usan ids numéricos (las rutas web usan <int:dependencia_id>).
+PREFIJO_USUARIO = 'SEED'
+PRIMERA_DEPENDENCIA = 9000
+PRIMER_CODIGO_RECURSO = 900_000_000
+
+TIPOS = ['Portátil', 'Proyector', 'Cámara', 'Microscopio', 'Libro', 'Cable HDMI', 'Tablet', 'Trípode']
+PROGRAMAS = ['Ingeniería de Sistemas', 'Medicina', 'Derecho', 'Biología', 'Artes Visuales', 'Economía']
+NOMBRES = ['Ana', 'Luis', 'María', 'Carlos', 'Laura', 'Andrés', 'Sofía', 'Juan', 'Valentina', 'Diego']
+APELLIDOS = ['Pérez', 'Gómez', 'Rodríguez', 'Martínez', 'López', 'Díaz', 'Muñoz', 'Rojas', 'Eraso', 'Benavides']
+TIPOS_NOTIFICACION = ['SOLICITUD', 'APROBADA', 'RECHAZADA', 'VENCIDO', 'EXTENSION', 'LISTA_ESPERA']
+
+
+def pesos_zipf(n, s=1.1):
+    """Pesos acumulados de una distribución Zipf: pocos elementos concentran la mayoría."""
+    return list(itertools.accumulate(1 / (rango ** s) for rango in range(1, n + 1)))
+
+
+@contextmanager
+def fechas_manuales(*campos):
+    """Desactiva auto_now_add para poder repartir las fechas en el pasado."""
+    for campo in campos:
+        campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo in campos:
+            campo.auto_now_add = True
+
+
+def en_lotes(filas, tamano):
+    iterador = iter(filas)
+    while lote := list(itertools.islice(iterador, tamano)):
+        yield lote
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera datos sintéticos con volúmenes realistas y distribuciones sesgadas '
+        '(dependencias, usuarios, recursos, préstamos, solicitudes y notificaciones)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dependencias', type=int, default=8)
+        parser.add_argument('--usuarios', type=int, default=20_000)
+        parser.add_argument('--recursos', type=int, default=10_000)
+        parser.add_argument('--prestamos', type=int, default=60_000)
+        parser.add_argument('--solicitudes', type=int, default=20_000)
+        parser.add_argument('--notificaciones', type=int, default=1_000_000)
+        parser.add_argument('--dias', type=int, default=365, help='Antigüedad máxima de los préstamos')
+        parser.add_argument('--lote', type=int, default=5000, help='Filas por INSERT')
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument('--borrar', action='store_true', help='Solo borrar los datos generados antes')
+
+    def handle(self, *args, **options):
+        self.rnd = random.Random(options['semilla'])
+        self.verbosity = options['verbosity']
+        self.lote = options['lote']
+        self.ahora = timezone.now()
+
+        self.borrar()
+        if options['borrar']:
+            return
+        if options['dependencias'] < 1 or options['usuarios'] < 1 or options['recursos'] < 1:
+            raise CommandError('Se necesita al menos una dependencia, un usuario y un recurso')
+
+        with transaction.atomic():
+            dependencias = self.crear_dependencias(options['dependencias'])
+            usuarios = self.crear_usuarios(options['usuarios'])
+            recursos = self.crear_recursos(options['recursos'], dependencias)
+        self.crear_prestamos(options['prestamos'], usuarios, recursos, options['dias'])
+        self.crear_solicitudes(options['solicitudes'], usuarios, recursos, options['dias'])
+        self.crear_notificaciones(options['notificaciones'], usuarios + [d.administrador_id for d in dependencias])
+
+        # bulk_create no emite señales: se invalidan las cachés afectadas
+        invalidar_estadisticas(*(d.pk for d in dependencias))
+        invalidar_notificaciones(*usuarios)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Administradores: {", ".join(f"{PREFIJO_USUARIO}-ADM{i}" for i in range(len(dependencias)))} '
+            f'(contraseña "seed"); usuario más activo: {PREFIJO_USUARIO}-{1:06d}'
+        ))
+
+    def informar(self, modelo, total):
+        self.stdout.write(f'  {modelo:<16}{total:>12,}')
+
+    def borrar(self):
+        ids = [str(PRIMERA_DEPENDENCIA + i) for i in range(1000)]
+        # Primero las filas más numerosas, por lotes de ids, para no armar un
+        # único DELETE en cascada de millones de filas
+        usuarios = Usuario.objects.filter(codigo__startswith=f'{PREFIJO_USUARIO}-')
+        usuarios_ids = list(usuarios.values_list('id', flat=True))
+        for lote in en_lotes(usuarios_ids, 500):
+            Notificacion.objects.filter(usuario_id__in=lote).delete()
+            SolicitudPrestamo.objects.filter(usuario_id__in=lote).delete()
+            Prestamo.objects.filter(usuario_id__in=lote).delete()
+        Dependencia.objects.filter(pk__in=ids).delete()
+        borrados = usuarios.delete()[0] if usuarios_ids else 0
+        if borrados:
+            self.stdout.write(f'Datos generados anteriormente borrados ({len(usuarios_ids)} usuarios)')
+
+    def crear_dependencias(self, n):
+        clave = make_password('seed')
+        administradores = Usuario.objects.bulk_create([
+            Usuario(
+                codigo=f'{PREFIJO_USUARIO}-ADM{i}', password=clave, rol=Usuario.ADMIN,
+                first_name='Admin', last_name=f'Dependencia {i}', email=f'seed.adm{i}@example.com',
+            )
+            for i in range(n)
+        ])
+        dependencias = Dependencia.objects.bulk_create([
+            Dependencia(
+                id=str(PRIMERA_DEPENDENCIA + i), nombre=f'Dependencia sintética {i}',
+                descripcion='Generada por seed_datos', administrador=administradores[i],
+            )
+            for i in range(n)
+        ])
+        self.tipos = {
+            d.pk: TipoRecurso.objects.bulk_create([TipoRecurso(nombre=t, dependencia=d) for t in TIPOS])
+            for d in dependencias
+        }
+        self.informar('dependencias', n)
+        return dependencias
+
+    def crear_usuarios(self, n):
+        # Un único hash para todos: hashear miles de contraseñas con Argon2 tardaría minutos
+        clave = make_password('seed')
+        filas = (
+            Usuario(
+                codigo=f'{PREFIJO_USUARIO}-{i:06d}', password=clave,
+                rol=Usuario.PROFESOR if self.rnd.random() < 0.1 else Usuario.ESTUDIANTE,
+                first_name=self.rnd.choice(NOMBRES), last_name=self.rnd.choice(APELLIDOS),
+                email=f'seed.{i}@example.com', programa=self.rnd.choice(PROGRAMAS),
+            )
+            for i in range(1, n + 1)
+        )
+        for lote in en_lotes(filas, self.lote):
+            Usuario.objects.bulk_create(lote)
+        self.informar('usuarios', n)
+        # Ordenados por código: el primero es el más activo (pesos Zipf)
+        return list(
+            Usuario.objects.filter(codigo__startswith=f'{PREFIJO_USUARIO}-')
+            .exclude(rol=Usuario.ADMIN)
+            .order_by('codigo').values_list('id', flat=True)
+        )
+
+    def crear_recursos(self, n, dependencias):
+        # Dependencias también sesgadas: la primera tiene muchos más recursos
+        pesos = pesos_zipf(len(dependencias), s=0.8)
+        filas = []
+        for i in range(n):
+            dependencia = self.rnd.choices(dependencias, cum_weights=pesos)[0]
+            tipo = self.rnd.choice(self.tipos[dependencia.pk])
+            filas.append(Recurso(
+                codigo=PRIMER_CODIGO_RECURSO + i, tipo=tipo, dependencia=dependencia,
+                nombre=f'{tipo.nombre} {i:05d}', descripcion=f'{tipo.nombre} de la {dependencia.nombre}',
+            ))
+        for lote in en_lotes(filas, self.lote):
+            Recurso.objects.bulk_create(lote)
+        self.informar('recursos', n)
+        return list(
+            Recurso.objects.filter(codigo__gte=PRIMER_CODIGO_RECURSO)
+            .order_by('codigo').values_list('id', flat=True)
+        )
+
+    def crear_prestamos(self, n, usuarios, recursos, dias):
+        pesos_usuarios = pesos_zipf(len(usuarios))
+        pesos_recursos = pesos_zipf(len(recursos), s=0.9)
+        prestados = set()
+
+        def filas():
+            for _ in range(n):
+                recurso_id = self.rnd.choices(recursos, cum_weights=pesos_recursos)[0]
+                # Más préstamos recientes que antiguos
+                inicio = self.ahora - timedelta(days=dias * self.rnd.random() ** 2, minutes=self.rnd.randint(0, 600))
+                devolucion = inicio + timedelta(days=self.rnd.choice((1, 3, 7, 7, 15, 30)))
+                # Solo los préstamos aún no vencidos o un 3 % de los vencidos
+                # siguen abiertos, y como mucho uno por recurso
+                abierto = (
+                    recurso_id not in prestados
+                    and (devolucion > self.ahora or self.rnd.random() < 0.03)
+                )
+                if abierto:
+                    prestados.add(recurso_id)
+                yield Prestamo(
+                    usuario_id=self.rnd.choices(usuarios, cum_weights=pesos_usuarios)[0],
+                    recurso_id=recurso_id, fecha_prestamo=inicio, fecha_devolucion=devolucion,
+                    devuelto=not abierto,
+                )
+
+        with fechas_manuales(Prestamo._meta.get_field('fecha_prestamo')):
+            for lote in en_lotes(filas(), self.lote):
+                Prestamo.objects.bulk_create(lote)
+        for lote in en_lotes(prestados, self.lote):
+            Recurso.objects.filter(pk__in=lote).update(disponible=False)
+        self.informar('prestamos', n)
+
+    def crear_solicitudes(self, n, usuarios, recursos, dias):
+        pesos_usuarios = pesos_zipf(len(usuarios))
+        pesos_recursos = pesos_zipf(len(recursos), s=0.9)
+        estados = [SolicitudPrestamo.APROBADO] * 7 + [SolicitudPrestamo.RECHAZADO] * 2 + [SolicitudPrestamo.PENDIENTE]
+
+        def filas():
+            for _ in range(n):
+                fecha = self.ahora - timedelta(days=dias * self.rnd.random() ** 2)
+                yield SolicitudPrestamo(
+                    usuario_id=self.rnd.choices(usuarios, cum_weights=pesos_usuarios)[0],
+                    recurso_id=self.rnd.choices(recursos, cum_weights=pesos_recursos)[0],
+                    fecha_solicitud=fecha, fecha_inicio=fecha.date(),
+                    fecha_devolucion=(fecha + timedelta(days=7)).date(),
+                    estado=self.rnd.choice(estados),
+                )
+
+        with fechas_manuales(SolicitudPrestamo._meta.get_field('fecha_solicitud')):
+            for lote in en_lotes(filas(), self.lote):
+                SolicitudPrestamo.objects.bulk_create(lote)
+        self.informar('solicitudes', n)
+
+    def crear_notificaciones(self, n, usuarios, dias=120):
+        pesos = pesos_zipf(len(usuarios), s=0.9)
+
+        def filas():
+            for _ in range(n):
+                fecha = self.ahora - timedelta(days=dias * self.rnd.random())
+                tipo = self.rnd.choice(TIPOS_NOTIFICACION)
+                yield Notificacion(
+                    usuario_id=self.rnd.choices(usuarios, cum_weights=pesos)[0],
+                    tipo=tipo, mensaje=f'Notificación sintética de tipo {tipo.lower()}',
+                    # Las antiguas casi siempre están leídas
+                    leida=self.rnd.random() < 0.95 if fecha < self.ahora - timedelta(days=7) else self.rnd.random() < 0.3,
+                    fecha=fecha,
+                )
+
+        with fechas_manuales(Notificacion._meta.get_field('fecha')):
+            for i, lote in enumerate(en_lotes(filas(), self.lote), 1):
+                Notificacion.objects.bulk_create(lote)
+                if self.verbosity > 1 and i % 20 == 0:
+                    self.stdout.write(f'    {i * self.lote:,} notificaciones')
+        self.informar('notificaciones', n)
@@ -0,0 +1,246 @@
+"""
+Instrumentación ligera por petición.
+
+- MetricasMiddleware: tiempo total de cada vista (todas las peticiones) y, en
+  una muestra (METRICAS_MUESTREO), número y tiempo de consultas SQL, tiempo
+  de plantillas y llamadas externas (SMTP, WeasyPrint).
+- Exposición en formato texto de Prometheus (/metrics, ver views_metricas.py)
+  y una línea JSON por petición muestreada o lenta en el logger
+  'prestamos.metricas'.
+
+Los contadores son por proceso: con varios workers de gunicorn cada scrape
+de /metrics ve el worker que lo atendió (las series llevan la etiqueta
+`pid`). Los logs estructurados sí cubren todos los workers.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.mail.backends.smtp import EmailBackend
+from django.db import connection
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+# Límites (segundos) del histograma de duración de peticiones
+BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+TIPOS = {
+    'prestamos_peticiones_total': 'counter',
+    'prestamos_peticion_segundos': 'histogram',
+    'prestamos_peticiones_muestreadas_total': 'counter',
+    'prestamos_consultas_total': 'counter',
+    'prestamos_consultas_segundos_total': 'counter',
+    'prestamos_plantillas_segundos_total': 'counter',
+    'prestamos_externo_llamadas_total': 'counter',
+    'prestamos_externo_segundos_total': 'counter',
+}
+
+_bloqueo = threading.Lock()
+_valores = defaultdict(float)  # (métrica, ((etiqueta, valor), ...)) -> valor
+_medicion = ContextVar('medicion', default=None)
+
+
+def _sumar(metrica, valor=1, **etiquetas):
+    clave = (metrica, tuple(sorted((nombre, str(v)) for nombre, v in etiquetas.items())))
+    with _bloqueo:
+        _valores[clave] += valor
+
+
+def _observar_duracion(vista, segundos):
+    with _bloqueo:
+        for limite in BUCKETS:
+            if segundos <= limite:
+                _valores[('prestamos_peticion_segundos_bucket', (('le', str(limite)), ('vista', vista)))] += 1
+        _valores[('prestamos_peticion_segundos_bucket', (('le', '+Inf'), ('vista', vista)))] += 1
+        _valores[('prestamos_peticion_segundos_sum', (('vista', vista),))] += segundos
+        _valores[('prestamos_peticion_segundos_count', (('vista', vista),))] += 1
+
+
+def _familia(metrica):
+    for sufijo in ('_bucket', '_sum', '_count'):
+        if metrica.endswith(sufijo) and metrica[:-len(sufijo)] in TIPOS:
+            return metrica[:-len(sufijo)]
+    return metrica
+
+
+def _escapar(valor):
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _orden(item):
+    # Agrupa por métrica y series; los buckets, de menor a mayor límite
+    (metrica, etiquetas), _valor = item
+    serie = tuple(v for nombre, v in etiquetas if nombre != 'le')
+    limite = dict(etiquetas).get('le')
+    return metrica, serie, float(limite) if limite else 0
+
+
+def exportar_prometheus():
+    """Contadores del proceso en formato de exposición de texto de Prometheus."""
+    with _bloqueo:
+        valores = sorted(_valores.items(), key=_orden)
+
+    pid = str(os.getpid())
+    lineas, vistas = [], set()
+    for (metrica, etiquetas), valor in valores:
+        familia = _familia(metrica)
+        if familia not in vistas:
+            vistas.add(familia)
+            lineas.append(f'# TYPE {familia} {TIPOS.get(familia, "untyped")}')
+        texto = ','.join(f'{nombre}="{_escapar(v)}"' for nombre, v in (*etiquetas, ('pid', pid)))
+        lineas.append(f'{metrica}{{{texto}}} {valor:g}')
+    return '\n'.join(lineas) + '\n'
+
+
+def reiniciar():
+    with _bloqueo:
+        _valores.clear()
+
+
+class Medicion:
+    """Acumulados de una petición muestreada."""
+
+    __slots__ = ('consultas', 'bd', 'plantillas', 'externos')
+
+    def __init__(self):
+        self.consultas = 0
+        self.bd = 0.0
+        self.plantillas = 0.0
+        self.externos = defaultdict(lambda: [0, 0.0])
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas += 1
+            self.bd += time.perf_counter() - inicio
+
+
+@contextmanager
+def medir_externo(tipo):
+    """Cronometra una llamada externa (smtp, weasyprint...) dentro o fuera de una petición."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        _sumar('prestamos_externo_llamadas_total', tipo=tipo)
+        _sumar('prestamos_externo_segundos_total', segundos, tipo=tipo)
+        medicion = _medicion.get()
+        if medicion is not None:
+            medicion.externos[tipo][0] += 1
+            medicion.externos[tipo][1] += segundos
+
+
+def _nombre_vista(request):
+    # Solo rutas resueltas: las URL sin ruta (404, escaneos) no crean series nuevas
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'sin_ruta'
+
+
+class MetricasMiddleware:
+    """
+    Debe ir primero en MIDDLEWARE para incluir el tiempo del resto de
+    middlewares. Las peticiones no muestreadas solo cuestan dos perf_counter().
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.muestreo = getattr(settings, 'METRICAS_MUESTREO', 0.1)
+        self.lenta = getattr(settings, 'METRICAS_LENTA_MS', 1000) / 1000
+
+    def __call__(self, request):
+        medicion = Medicion() if random.random() < self.muestreo else None
+        inicio = time.perf_counter()
+
+        if medicion is None:
+            response = self.get_response(request)
+        else:
+            token = _medicion.set(medicion)
+            try:
+                with connection.execute_wrapper(medicion):
+                    response = self.get_response(request)
+            finally:
+                _medicion.reset(token)
+
+        segundos = time.perf_counter() - inicio
+        vista = _nombre_vista(request)
+        _sumar('prestamos_peticiones_total', vista=vista, metodo=request.method, estado=response.status_code)
+        _observar_duracion(vista, segundos)
+
+        if medicion is not None:
+            _sumar('prestamos_peticiones_muestreadas_total', vista=vista)
+            _sumar('prestamos_consultas_total', medicion.consultas, vista=vista)
+            _sumar('prestamos_consultas_segundos_total', medicion.bd, vista=vista)
+            _sumar('prestamos_plantillas_segundos_total', medicion.plantillas, vista=vista)
+
+        if medicion is not None or segundos >= self.lenta:
+            self.registrar(request, response, vista, segundos, medicion)
+        return response
+
+    def registrar(self, request, response, vista, segundos, medicion):
+        datos = {
+            'vista': vista,
+            'metodo': request.method,
+            'ruta': request.path,
+            'estado': response.status_code,
+            'duracion_ms': round(segundos * 1000, 1),
+            'muestreada': medicion is not None,
+        }
+        if medicion is not None:
+            datos.update({
+                'consultas': medicion.consultas,
+                'bd_ms': round(medicion.bd * 1000, 1),
+                'plantillas_ms': round(medicion.plantillas * 1000, 1),
+                'externos': {
+                    tipo: {'llamadas': n, 'ms': round(s * 1000, 1)}
+                    for tipo, (n, s) in medicion.externos.items()
+                },
+            })
+        logger.info(json.dumps(datos, ensure_ascii=False))
+
+
+# Backends medidos: se activan desde settings (TEMPLATES y EMAIL_BACKEND).
+
+class _PlantillaMedida:
+    def __init__(self, plantilla):
+        self.plantilla = plantilla
+
+    def __getattr__(self, nombre):
+        return getattr(self.plantilla, nombre)
+
+    def render(self, context=None, request=None):
+        medicion = _medicion.get()
+        if medicion is None:
+            return self.plantilla.render(context, request)
+        inicio = time.perf_counter()
+        try:
+            return self.plantilla.render(context, request)
+        finally:
+            medicion.plantillas += time.perf_counter() - inicio
+
+
+class PlantillasMedidas(DjangoTemplates):
+    """Backend de plantillas de Django que suma el tiempo de render a la petición."""
+
+    def from_string(self, template_code):
+        return _PlantillaMedida(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _PlantillaMedida(super().get_template(template_name))
+
+
+class SMTPMedido(EmailBackend):
+    def send_messages(self, email_messages):
+        with medir_externo('smtp'):
+            return super().send_messages(email_messages)
@@ -0,0 +1,20 @@
+from .dependencias import obtener_dependencia_admin
+
+
+class DependenciaAdminMiddleware:
+    """
+    Resuelve una sola vez por petición el rol del usuario y la dependencia que
+    administra, y los deja en `request.rol` y `request.dependencia_admin`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        usuario = getattr(request, 'user', None)
+        autenticado = usuario is not None and usuario.is_authenticated
+
+        request.rol = usuario.rol if autenticado else None
+        request.dependencia_admin = obtener_dependencia_admin(usuario) if autenticado else None
+
+        return self.get_response(request)
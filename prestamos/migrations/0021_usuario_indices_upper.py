@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:44
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0020_tiporecurso_alter_recurso_tipo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='usuario_email_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(django.db.models.functions.text.Upper('codigo'), name='usuario_codigo_upper_idx'),
+        ),
+    ]
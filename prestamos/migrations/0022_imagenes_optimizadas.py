@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:48
+
+from django.db import migrations
+import prestamos.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0021_usuario_indices_upper'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dependencia',
+            name='imagen',
+            field=prestamos.fields.ImagenOptimizadaField(blank=True, help_text='Imagen representativa de la dependencia', miniaturas=(320, 640), null=True, upload_to='dependencias/'),
+        ),
+        migrations.AlterField(
+            model_name='recurso',
+            name='foto',
+            field=prestamos.fields.ImagenOptimizadaField(blank=True, miniaturas=(240, 480), null=True, upload_to='recursos/'),
+        ),
+        migrations.AlterField(
+            model_name='usuario',
+            name='firma',
+            field=prestamos.fields.ImagenOptimizadaField(blank=True, formato='PNG', help_text='Firma del usuario (formato PNG)', max_lado=1000, null=True, upload_to='usuarios/firmas/'),
+        ),
+        migrations.AlterField(
+            model_name='usuario',
+            name='foto',
+            field=prestamos.fields.ImagenOptimizadaField(blank=True, help_text='Foto de perfil', max_lado=800, miniaturas=(64, 160), null=True, upload_to='usuarios/'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:20
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copiar_id_a_codigo(apps, schema_editor):
+    # El ID actual es el código QR: se copia tal cual y se conserva como PK,
+    # así las FKs de Prestamo y SolicitudPrestamo no cambian.
+    Recurso = apps.get_model('prestamos', 'Recurso')
+    Recurso.objects.update(codigo=F('id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0022_imagenes_optimizadas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recurso',
+            name='codigo',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.RunPython(copiar_id_a_codigo, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='recurso',
+            name='codigo',
+            field=models.IntegerField(help_text='Código QR / de inventario del recurso', unique=True),
+        ),
+        migrations.AlterField(
+            model_name='recurso',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Índices de búsqueda (trigram + texto completo), solo en PostgreSQL.
+#
+# Se crean con RunPython en lugar de declararlos en Meta.indexes para que las
+# migraciones sigan funcionando en SQLite (desarrollo local), donde
+# prestamos.busqueda usa el orden exacto/prefijo como respaldo.
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+# Los icontains de Django generan UPPER(campo) LIKE UPPER('%...%'),
+# así que los índices trigram se crean sobre UPPER(campo).
+INDICES = {
+    'recurso': [
+        GinIndex(OpClass(Upper('nombre'), name='gin_trgm_ops'), name='recurso_nombre_trgm_idx'),
+        GinIndex(OpClass(Upper('descripcion'), name='gin_trgm_ops'), name='recurso_descripcion_trgm_idx'),
+        GinIndex(SearchVector('nombre', 'descripcion', config='spanish'), name='recurso_busqueda_fts_idx'),
+    ],
+    'usuario': [
+        GinIndex(OpClass(Upper('codigo'), name='gin_trgm_ops'), name='usuario_codigo_trgm_idx'),
+        GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='usuario_nombre_trgm_idx'),
+        GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='usuario_apellido_trgm_idx'),
+        GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='usuario_email_trgm_idx'),
+    ],
+}
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for modelo, indices in INDICES.items():
+        model = apps.get_model('prestamos', modelo)
+        for indice in indices:
+            schema_editor.add_index(model, indice)
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for modelo, indices in INDICES.items():
+        model = apps.get_model('prestamos', modelo)
+        for indice in indices:
+            schema_editor.remove_index(model, indice)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0023_recurso_codigo'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -0,0 +1,48 @@
+# Índices para búsquedas por prefijo (istartswith) del autocompletado.
+#
+# Igual que en 0024, solo se crean en PostgreSQL: text_pattern_ops permite que
+# UPPER(campo) LIKE 'TEXTO%' use un B-tree sin depender de la collation.
+
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+INDICES = {
+    'recurso': [
+        models.Index(OpClass(Upper('nombre'), name='text_pattern_ops'), name='recurso_nombre_prefijo_idx'),
+    ],
+    'usuario': [
+        models.Index(OpClass(Upper('codigo'), name='text_pattern_ops'), name='usuario_codigo_prefijo_idx'),
+        models.Index(OpClass(Upper('first_name'), name='text_pattern_ops'), name='usuario_nombre_prefijo_idx'),
+        models.Index(OpClass(Upper('last_name'), name='text_pattern_ops'), name='usuario_apellido_prefijo_idx'),
+    ],
+}
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for modelo, indices in INDICES.items():
+        model = apps.get_model('prestamos', modelo)
+        for indice in indices:
+            schema_editor.add_index(model, indice)
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for modelo, indices in INDICES.items():
+        model = apps.get_model('prestamos', modelo)
+        for indice in indices:
+            schema_editor.remove_index(model, indice)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0024_indices_busqueda'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import RangeOperators
+
+from prestamos.expresiones import TsTzRange
+
+# Dos reservas activas del mismo recurso no pueden solaparse. La restricción
+# (y su índice GiST) solo existe en PostgreSQL; en SQLite la comprobación la
+# hace prestamos.reservas.crear_reserva con ReservaQuerySet.solapadas().
+SIN_SOLAPAMIENTO = ExclusionConstraint(
+    name='reserva_sin_solapamiento',
+    expressions=[
+        ('recurso', RangeOperators.EQUAL),
+        (TsTzRange('inicio', 'fin'), RangeOperators.OVERLAPS),
+    ],
+    condition=models.Q(activa=True),
+)
+
+
+def crear_exclusion(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # btree_gist permite usar `recurso_id WITH =` dentro de un índice GiST
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.add_constraint(apps.get_model('prestamos', 'Reserva'), SIN_SOLAPAMIENTO)
+
+
+def eliminar_exclusion(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_constraint(apps.get_model('prestamos', 'Reserva'), SIN_SOLAPAMIENTO)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0025_indices_prefijo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solicitudprestamo',
+            name='fecha_inicio',
+            field=models.DateField(blank=True, help_text='Fecha desde la que se necesita el recurso', null=True),
+        ),
+        migrations.CreateModel(
+            name='Reserva',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inicio', models.DateTimeField()),
+                ('fin', models.DateTimeField()),
+                ('activa', models.BooleanField(default=True)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('recurso', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservas', to='prestamos.recurso')),
+                ('solicitud', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reserva', to='prestamos.solicitudprestamo')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['recurso', 'inicio'], name='reserva_recurso_inicio_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reserva',
+            constraint=models.CheckConstraint(check=models.Q(('fin__gt', models.F('inicio'))), name='reserva_fin_despues_inicio'),
+        ),
+        migrations.RunPython(crear_exclusion, eliminar_exclusion),
+    ]
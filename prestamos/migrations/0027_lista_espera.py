@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0026_reservas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solicitudprestamo',
+            name='fecha_espera',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='solicitudprestamo',
+            name='estado',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('aprobado', 'Aprobado'), ('rechazado', 'Rechazado'), ('en_espera', 'En lista de espera')], default='pendiente', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudprestamo',
+            index=models.Index(condition=models.Q(('estado', 'en_espera')), fields=['recurso', 'fecha_espera'], name='solicitud_lista_espera_idx'),
+        ),
+    ]
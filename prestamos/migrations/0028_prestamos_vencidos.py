@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0027_lista_espera'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prestamo',
+            index=models.Index(condition=models.Q(('devuelto', False)), fields=['fecha_devolucion', 'recurso'], name='prestamo_abierto_vence_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0028_prestamos_vencidos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrestamoExtension',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha_anterior', models.DateTimeField()),
+                ('fecha_nueva', models.DateTimeField()),
+                ('fecha', models.DateTimeField(auto_now_add=True)),
+                ('adenda', models.FileField(blank=True, null=True, upload_to='adendas_prestamo/')),
+                ('autorizado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('prestamo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='extensiones', to='prestamos.prestamo')),
+            ],
+        ),
+    ]
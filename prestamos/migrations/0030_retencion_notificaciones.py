@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0029_prestamo_extension'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificacionArchivada',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('tipo', models.CharField(max_length=50)),
+                ('mensaje', models.TextField()),
+                ('url', models.CharField(blank=True, max_length=255, null=True)),
+                ('leida', models.BooleanField(default=False)),
+                ('fecha', models.DateTimeField()),
+                ('archivada', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(fields=['usuario', '-fecha'], name='notificacion_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(condition=models.Q(('leida', False)), fields=['usuario'], name='notificacion_no_leida_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificacionarchivada',
+            name='usuario',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notificacionarchivada',
+            index=models.Index(fields=['usuario', '-fecha'], name='notif_archivada_usuario_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0030_retencion_notificaciones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvisoAdmin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=50)),
+                ('mensaje', models.TextField()),
+                ('fecha', models.DateTimeField(auto_now_add=True)),
+                ('dependencia', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='avisos_pendientes', to='prestamos.dependencia')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dependencia', 'fecha'], name='aviso_admin_dependencia_idx')],
+            },
+        ),
+    ]
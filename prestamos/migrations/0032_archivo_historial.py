@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0031_avisos_admin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prestamo',
+            name='archivado',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='solicitudprestamo',
+            name='archivado',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='prestamo',
+            index=models.Index(condition=models.Q(('archivado', False)), fields=['usuario', '-fecha_prestamo'], name='prestamo_vigente_usuario_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamo',
+            index=models.Index(condition=models.Q(('archivado', False)), fields=['recurso', '-fecha_prestamo'], name='prestamo_vigente_recurso_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudprestamo',
+            index=models.Index(condition=models.Q(('archivado', False)), fields=['usuario', '-fecha_solicitud'], name='solicitud_vigente_usuario_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudprestamo',
+            index=models.Index(condition=models.Q(('archivado', False)), fields=['recurso', '-fecha_solicitud'], name='solicitud_vigente_recurso_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:05
+
+from django.db import migrations
+
+
+def ajustar_secuencia(apps, schema_editor):
+    # 0023 convirtió Recurso.id (los códigos QR de siempre) en BigAutoField.
+    # En PostgreSQL eso solo añade GENERATED BY DEFAULT AS IDENTITY, que
+    # empieza en 1: sin mover la secuencia a MAX(id), el siguiente INSERT
+    # reutiliza un id existente. En SQLite el autoincremento ya parte de MAX(id).
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    tabla = apps.get_model('prestamos', 'Recurso')._meta.db_table
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{tabla}', 'id'), COALESCE(MAX(id), 1)) "
+        f"FROM {schema_editor.quote_name(tabla)}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestamos', '0032_archivo_historial'),
+    ]
+
+    operations = [
+        migrations.RunPython(ajustar_secuencia, migrations.RunPython.noop),
+    ]
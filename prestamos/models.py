@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser, Group, Permission
-from django.db import models
+from django.db import connection, models
+from django.db.models.functions import Upper
+
+from .fields import ImagenOptimizadaField
 from django.core.exceptions import ValidationError
 
 from django.contrib.auth.models import BaseUserManager
@@ -30,8 +33,9 @@ class Dependencia(models.Model):
     )
     nombre = models.CharField(max_length=100, unique=True)
     descripcion = models.TextField(blank=True)
-    imagen = models.ImageField(
+    imagen = ImagenOptimizadaField(
         upload_to='dependencias/',
+        miniaturas=(320, 640),
         null=True,
         blank=True,
         help_text="Imagen representativa de la dependencia"
@@ -67,8 +71,8 @@ class Usuario(AbstractUser):
     rol = models.CharField(max_length=20, choices=ROLES, default=ESTUDIANTE)
     codigo = models.CharField(max_length=20, unique=True, null=False, blank=False, help_text="Código estudiantil o número de identificación")
     programa = models.CharField(max_length=100, null=True, blank=True, help_text="Programa o facultad a la que pertenece")
-    foto = models.ImageField(upload_to='usuarios/', null=True, blank=True, help_text="Foto de perfil")
-    firma = models.ImageField(upload_to='usuarios/firmas/', null=True, blank=True, help_text="Firma del usuario (formato PNG)")
+    foto = ImagenOptimizadaField(upload_to='usuarios/', max_lado=800, miniaturas=(64, 160), null=True, blank=True, help_text="Foto de perfil")
+    firma = ImagenOptimizadaField(upload_to='usuarios/firmas/', max_lado=1000, formato='PNG', null=True, blank=True, help_text="Firma del usuario (formato PNG)")
     #Nuevos campos
     cedula = models.CharField(max_length=20, unique=True, null=True, blank=True, help_text="Número de cédula")
     telefono = models.CharField(max_length=20, null=True, blank=True, help_text="Número de teléfono de contacto")
@@ -76,6 +80,13 @@ class Usuario(AbstractUser):
     USERNAME_FIELD = 'codigo'
     REQUIRED_FIELDS = []
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Búsquedas sin distinguir mayúsculas (check_email / check_codigo)
+            models.Index(Upper('email'), name='usuario_email_upper_idx'),
+            models.Index(Upper('codigo'), name='usuario_codigo_upper_idx'),
+        ]
+
     def __str__(self):
         return f"{self.get_rol_display()} - {self.first_name} {self.last_name} ({self.programa})"
 
@@ -96,10 +107,12 @@ class TipoRecurso(models.Model):
     
     
 class Recurso(models.Model):
-    id = models.IntegerField(primary_key=True)
+    # La PK es un autoincremental inmutable; el código QR/inventario visible
+    # para el usuario vive en `codigo` y se puede cambiar con un UPDATE simple.
+    codigo = models.IntegerField(unique=True, help_text="Código QR / de inventario del recurso")
     tipo = models.ForeignKey(TipoRecurso, on_delete=models.CASCADE)
     nombre = models.CharField(max_length=255)
-    foto = models.ImageField(upload_to='recursos/', blank=True, null=True)
+    foto = ImagenOptimizadaField(upload_to='recursos/', miniaturas=(240, 480), blank=True, null=True)
     descripcion = models.TextField()
     disponible = models.BooleanField(default=True)
     dependencia = models.ForeignKey(Dependencia, on_delete=models.CASCADE)
@@ -108,6 +121,26 @@ class Recurso(models.Model):
         return f"{self.nombre} ({'Disponible' if self.disponible else 'No disponible'})"
 
 
+class PrestamoQuerySet(models.QuerySet):
+    def abiertos(self):
+        return self.filter(devuelto=False)
+
+    def vigentes(self):
+        """Sin el historial archivado (ver prestamos.historial); usa los índices parciales."""
+        return self.filter(archivado=False)
+
+    def archivados(self):
+        return self.filter(archivado=True)
+
+    def vencidos(self, momento=None):
+        """
+        Préstamos sin devolver cuya fecha de devolución ya pasó.
+        Coincide con la condición del índice parcial `prestamo_abierto_vence_idx`.
+        """
+        from django.utils import timezone
+        return self.abiertos().filter(fecha_devolucion__lt=momento or timezone.now())
+
+
 # Modelo de Préstamo
 class Prestamo(models.Model):
     usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE)
@@ -117,28 +150,105 @@ class Prestamo(models.Model):
     firmado = models.ImageField(upload_to='firmas/', blank=True, null=True)
     devuelto = models.BooleanField(default=False)
     contrato_prestamo = models.FileField(upload_to='contratos_prestamo/', null=True, blank=True)
+    # Devuelto hace más de HISTORIAL_ARCHIVO_DIAS: fuera de los listados (ver prestamos.historial)
+    archivado = models.BooleanField(default=False)
+
+    objects = PrestamoQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Listados por usuario / por recurso: solo cubren el historial vigente
+            models.Index(
+                fields=['usuario', '-fecha_prestamo'],
+                condition=models.Q(archivado=False),
+                name='prestamo_vigente_usuario_idx',
+            ),
+            models.Index(
+                fields=['recurso', '-fecha_prestamo'],
+                condition=models.Q(archivado=False),
+                name='prestamo_vigente_recurso_idx',
+            ),
+            # Solo préstamos abiertos: pequeño aunque el historial crezca
+            models.Index(
+                fields=['fecha_devolucion', 'recurso'],
+                condition=models.Q(devuelto=False),
+                name='prestamo_abierto_vence_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.usuario.codigo} -> {self.recurso.nombre} ({'Devuelto' if self.devuelto else 'Pendiente'})"
 
 
+# 🕒 Historial de extensiones: el préstamo se actualiza en el mismo registro
+class PrestamoExtension(models.Model):
+    prestamo = models.ForeignKey(Prestamo, on_delete=models.CASCADE, related_name='extensiones')
+    fecha_anterior = models.DateTimeField()
+    fecha_nueva = models.DateTimeField()
+    autorizado_por = models.ForeignKey(
+        Usuario, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    fecha = models.DateTimeField(auto_now_add=True)
+    # Adenda de una página; se genera fuera de la petición (ver prestamos.adendas)
+    adenda = models.FileField(upload_to='adendas_prestamo/', null=True, blank=True)
+
+    def __str__(self):
+        return f"Extensión de {self.prestamo_id}: {self.fecha_anterior:%d/%m/%Y} -> {self.fecha_nueva:%d/%m/%Y}"
+
+
+class SolicitudPrestamoQuerySet(models.QuerySet):
+    def vigentes(self):
+        return self.filter(archivado=False)
+
+    def archivados(self):
+        return self.filter(archivado=True)
+
+
 class SolicitudPrestamo(models.Model):
     PENDIENTE = 'pendiente'
     APROBADO = 'aprobado'
     RECHAZADO = 'rechazado'
+    EN_ESPERA = 'en_espera'
     
     ESTADOS = [
         (PENDIENTE, 'Pendiente'),
         (APROBADO, 'Aprobado'),
         (RECHAZADO, 'Rechazado'),
+        (EN_ESPERA, 'En lista de espera'),
     ]
 
     fecha_solicitud = models.DateTimeField(auto_now_add=True)
     recurso = models.ForeignKey(Recurso, on_delete=models.CASCADE)
     usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE)
+    fecha_inicio = models.DateField(null=True, blank=True, help_text="Fecha desde la que se necesita el recurso")
     fecha_devolucion = models.DateField(help_text="Fecha estimada de devolución")
     estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
     contrato_solicitud = models.FileField(upload_to='contratos_solicitud/', null=True, blank=True)
+    # Orden FIFO de la lista de espera del recurso (ver prestamos.lista_espera)
+    fecha_espera = models.DateTimeField(null=True, blank=True)
+    # Aprobada o rechazada hace más de HISTORIAL_ARCHIVO_DIAS (ver prestamos.historial)
+    archivado = models.BooleanField(default=False)
+
+    objects = SolicitudPrestamoQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['usuario', '-fecha_solicitud'],
+                condition=models.Q(archivado=False),
+                name='solicitud_vigente_usuario_idx',
+            ),
+            models.Index(
+                fields=['recurso', '-fecha_solicitud'],
+                condition=models.Q(archivado=False),
+                name='solicitud_vigente_recurso_idx',
+            ),
+            models.Index(
+                fields=['recurso', 'fecha_espera'],
+                condition=models.Q(estado='en_espera'),
+                name='solicitud_lista_espera_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Solicitud de {self.usuario.codigo} para {self.recurso.nombre} - {self.get_estado_display()}"
@@ -146,11 +256,11 @@ class SolicitudPrestamo(models.Model):
     # 🚨 Nueva validación
     def clean(self):
         from django.core.exceptions import ValidationError
-        # Verifica si existe otra solicitud pendiente del mismo recurso por el mismo usuario
+        # Verifica si existe otra solicitud pendiente (o en espera) del mismo recurso por el mismo usuario
         existe_pendiente = SolicitudPrestamo.objects.filter(
             usuario=self.usuario,
             recurso=self.recurso,
-            estado=self.PENDIENTE
+            estado__in=[self.PENDIENTE, self.EN_ESPERA]
         ).exclude(pk=self.pk).exists()
 
         if existe_pendiente:
@@ -165,6 +275,53 @@ class SolicitudPrestamo(models.Model):
         super().save(*args, **kwargs)
 
 
+class ReservaQuerySet(models.QuerySet):
+    def activas(self):
+        return self.filter(activa=True)
+
+    def solapadas(self, recurso_id, inicio, fin):
+        """
+        Reservas activas del recurso que se cruzan con [inicio, fin).
+        En PostgreSQL usa el operador && sobre TSTZRANGE, que resuelve el índice
+        GiST de la restricción de exclusión; en otros motores, el índice
+        (recurso, inicio).
+        """
+        reservas = self.activas().filter(recurso_id=recurso_id)
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.fields.ranges import DateTimeTZRange
+            from .expresiones import TsTzRange
+            return reservas.alias(
+                periodo=TsTzRange('inicio', 'fin')
+            ).filter(periodo__overlap=DateTimeTZRange(inicio, fin))
+        return reservas.filter(inicio__lt=fin, fin__gt=inicio)
+
+
+# 📅 Reserva de un recurso en un intervalo de tiempo
+class Reserva(models.Model):
+    recurso = models.ForeignKey(Recurso, on_delete=models.CASCADE, related_name='reservas')
+    usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE, related_name='reservas')
+    solicitud = models.OneToOneField(
+        SolicitudPrestamo, on_delete=models.SET_NULL, null=True, blank=True, related_name='reserva'
+    )
+    inicio = models.DateTimeField()
+    fin = models.DateTimeField()
+    activa = models.BooleanField(default=True)
+    creada = models.DateTimeField(auto_now_add=True)
+
+    objects = ReservaQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['recurso', 'inicio'], name='reserva_recurso_inicio_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(fin__gt=models.F('inicio')), name='reserva_fin_despues_inicio'),
+        ]
+
+    def __str__(self):
+        return f"{self.recurso.nombre}: {self.inicio:%d/%m/%Y} - {self.fin:%d/%m/%Y}"
+
+
 # prestamos/models.py
 class Notificacion(models.Model):
     usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE, related_name="notificaciones")
@@ -174,6 +331,65 @@ class Notificacion(models.Model):
     leida = models.BooleanField(default=False)
     fecha = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Consulta de la campana (obtener_notificaciones): últimas del usuario
+            models.Index(fields=['usuario', '-fecha'], name='notificacion_usuario_fecha_idx'),
+            # Conteo de no leídas sin recorrer las leídas
+            models.Index(
+                fields=['usuario'],
+                condition=models.Q(leida=False),
+                name='notificacion_no_leida_idx',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.usuario.codigo} - {self.tipo} - {'Leída' if self.leida else 'No leída'}"
 
+
+class NotificacionArchivada(models.Model):
+    """
+    Notificaciones retiradas de la tabla activa por `purgar_notificaciones`.
+    Conservan el id original. En PostgreSQL la tabla se puede particionar por
+    mes de `fecha` (`particionar_notificaciones`); por eso no hay restricción
+    de clave foránea hacia el usuario.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    usuario = models.ForeignKey(
+        Usuario, on_delete=models.CASCADE, related_name='+', db_constraint=False, db_index=False
+    )
+    tipo = models.CharField(max_length=50)
+    mensaje = models.TextField()
+    url = models.CharField(max_length=255, blank=True, null=True)
+    leida = models.BooleanField(default=False)
+    fecha = models.DateTimeField()
+    archivada = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['usuario', '-fecha'], name='notif_archivada_usuario_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.usuario_id} - {self.tipo} ({self.fecha:%d/%m/%Y})"
+
+
+class AvisoAdmin(models.Model):
+    """
+    Aviso para el administrador de una dependencia que espera al siguiente
+    resumen (prestamos.resumenes): cada ventana de RESUMEN_ADMIN_MINUTOS se
+    convierte en una sola notificación y un solo correo.
+    """
+    dependencia = models.ForeignKey(Dependencia, on_delete=models.CASCADE, related_name='avisos_pendientes')
+    tipo = models.CharField(max_length=50)
+    mensaje = models.TextField()
+    fecha = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['dependencia', 'fecha'], name='aviso_admin_dependencia_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.dependencia_id} - {self.tipo} ({self.fecha:%d/%m/%Y %H:%M})"
+
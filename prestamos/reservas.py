@@ -0,0 +1,216 @@
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Reserva, SolicitudPrestamo
+
+
+def periodo_de_fechas(fecha_inicio, fecha_fin):
+    """
+    Intervalo [inicio, fin) con hora local para un rango de días completos:
+    desde las 00:00 de `fecha_inicio` hasta las 00:00 del día siguiente a `fecha_fin`.
+    """
+    inicio = timezone.make_aware(datetime.combine(fecha_inicio, time.min))
+    fin = timezone.make_aware(datetime.combine(fecha_fin + timedelta(days=1), time.min))
+    return inicio, fin
+
+
+def periodo_de_solicitud(solicitud):
+    # Las solicitudes anteriores a las reservas no tienen fecha_inicio
+    fecha_inicio = solicitud.fecha_inicio or timezone.localdate(solicitud.fecha_solicitud)
+    return periodo_de_fechas(fecha_inicio, solicitud.fecha_devolucion)
+
+
+def hay_conflicto(recurso_id, inicio, fin):
+    return Reserva.objects.solapadas(recurso_id, inicio, fin).exists()
+
+
+def _reservar(solicitud, inicio, fin):
+    """Crea la reserva de la solicitud o reutiliza la que ya tenga (una por solicitud)."""
+    with transaction.atomic():
+        reserva, _ = Reserva.objects.update_or_create(
+            solicitud=solicitud,
+            defaults={
+                'recurso_id': solicitud.recurso_id,
+                'usuario_id': solicitud.usuario_id,
+                'inicio': inicio,
+                'fin': fin,
+                'activa': True,
+            },
+        )
+    return reserva
+
+
+def crear_reserva(solicitud):
+    """
+    Reserva el recurso de la solicitud durante su periodo.
+    Lanza ValidationError si se cruza con otra reserva activa; en PostgreSQL
+    la restricción de exclusión cubre también la carrera entre dos aprobaciones.
+    Si la solicitud venía de la lista de espera, su retención (ver
+    retener_para) se convierte en la reserva del periodo.
+    """
+    inicio, fin = periodo_de_solicitud(solicitud)
+    if Reserva.objects.solapadas(solicitud.recurso_id, inicio, fin).exclude(solicitud_id=solicitud.pk).exists():
+        raise ValidationError("El recurso ya está reservado en esas fechas.")
+
+    try:
+        return _reservar(solicitud, inicio, fin)
+    except IntegrityError:
+        raise ValidationError("El recurso ya está reservado en esas fechas.")
+
+
+def retener_para(solicitud, horas):
+    """
+    Retiene el recurso para una solicitud promovida de la lista de espera:
+    una reserva corta desde ahora que bloquea otras aprobaciones y préstamos
+    directos mientras el administrador la revisa. Si el tramo ya está
+    reservado no se retiene nada. Devuelve la reserva o None.
+    """
+    inicio = timezone.now()
+    fin = inicio + timedelta(hours=horas)
+    if Reserva.objects.solapadas(solicitud.recurso_id, inicio, fin).exclude(solicitud_id=solicitud.pk).exists():
+        return None
+    try:
+        return _reservar(solicitud, inicio, fin)
+    except IntegrityError:
+        return None
+
+
+def retenido_para_otro(recurso_id, usuario_id):
+    """True si una reserva en curso de otro usuario (p. ej. una retención de la lista de espera) ocupa el recurso ahora."""
+    ahora = timezone.now()
+    return Reserva.objects.activas().filter(
+        recurso_id=recurso_id, inicio__lte=ahora, fin__gt=ahora
+    ).exclude(usuario_id=usuario_id).exists()
+
+
+def liberar_reservas(recurso_id, usuario_id, momento=None):
+    """
+    Al devolver un préstamo antes de tiempo, la reserva en curso termina en
+    `momento` para que el resto del intervalo quede libre.
+    """
+    momento = momento or timezone.now()
+    return Reserva.objects.activas().filter(
+        recurso_id=recurso_id, usuario_id=usuario_id, inicio__lt=momento, fin__gt=momento
+    ).update(fin=momento)
+
+
+def extender_reservas(prestamos, nueva_fecha):
+    """
+    Al extender préstamos abiertos, su reserva en curso (la última que ya
+    empezó para el mismo recurso y usuario) se alarga hasta el final del día
+    de `nueva_fecha`. `prestamos` son tuplas (id, recurso_id, usuario_id); los
+    préstamos creados sin solicitud no tienen reserva y se ignoran.
+    Devuelve los ids de los préstamos cuyo nuevo tramo se cruza con otra
+    reserva activa: esas reservas no se tocan y el préstamo no debe extenderse.
+    Tres consultas sin importar cuántos préstamos se extiendan.
+    """
+    prestamos = list(prestamos)
+    if not prestamos:
+        return set()
+    dia = timezone.localdate(nueva_fecha)
+    _, fin = periodo_de_fechas(dia, dia)
+    por_par = {(recurso_id, usuario_id): prestamo_id for prestamo_id, recurso_id, usuario_id in prestamos}
+    recursos_ids = {recurso_id for recurso_id, _ in por_par}
+
+    en_curso = {}
+    reservas = (
+        Reserva.objects.activas()
+        .filter(
+            recurso_id__in=recursos_ids,
+            usuario_id__in={usuario_id for _, usuario_id in por_par},
+            inicio__lte=timezone.now(),
+        )
+        .order_by('inicio')
+        .values_list('id', 'recurso_id', 'usuario_id', 'fin')
+    )
+    for reserva_id, recurso_id, usuario_id, fin_actual in reservas:
+        if (recurso_id, usuario_id) in por_par and fin_actual < fin:
+            en_curso[(recurso_id, usuario_id)] = (reserva_id, fin_actual)
+        else:
+            en_curso.pop((recurso_id, usuario_id), None)
+    if not en_curso:
+        return set()
+
+    otras = list(
+        Reserva.objects.activas()
+        .filter(
+            recurso_id__in=recursos_ids,
+            inicio__lt=fin,
+            fin__gt=min(fin_actual for _, fin_actual in en_curso.values()),
+        )
+        .exclude(id__in=[reserva_id for reserva_id, _ in en_curso.values()])
+        .values_list('recurso_id', 'inicio', 'fin')
+    )
+    conflictos, a_extender = set(), []
+    for (recurso_id, usuario_id), (reserva_id, fin_actual) in en_curso.items():
+        if any(r == recurso_id and inicio < fin and fin_otra > fin_actual for r, inicio, fin_otra in otras):
+            conflictos.add(por_par[(recurso_id, usuario_id)])
+        else:
+            a_extender.append(reserva_id)
+
+    try:
+        with transaction.atomic():
+            Reserva.objects.filter(id__in=a_extender).update(fin=fin)
+    except IntegrityError:
+        raise ValidationError("El recurso ya está reservado en esas fechas.")
+    return conflictos
+
+
+def eventos_calendario(recursos_ids, inicio, fin, con_usuarios=False):
+    """
+    Reservas activas y solicitudes pendientes (demanda futura) que se cruzan
+    con [inicio, fin) para los recursos indicados.
+    """
+    eventos = []
+
+    reservas = (
+        Reserva.objects.activas()
+        .filter(recurso_id__in=recursos_ids, inicio__lt=fin, fin__gt=inicio)
+        .select_related('recurso', 'usuario')
+        .order_by('inicio')
+    )
+    for reserva in reservas:
+        evento = {
+            'id': f'reserva-{reserva.id}',
+            'tipo': 'reserva',
+            'recurso_id': reserva.recurso_id,
+            'codigo': reserva.recurso.codigo,
+            'recurso': reserva.recurso.nombre,
+            'inicio': timezone.localtime(reserva.inicio).isoformat(),
+            'fin': timezone.localtime(reserva.fin).isoformat(),
+        }
+        if con_usuarios:
+            evento['usuario'] = reserva.usuario.get_full_name()
+        eventos.append(evento)
+
+    pendientes = (
+        SolicitudPrestamo.objects
+        .filter(
+            recurso_id__in=recursos_ids,
+            estado=SolicitudPrestamo.PENDIENTE,
+            fecha_devolucion__gte=timezone.localdate(inicio),
+        )
+        .select_related('recurso', 'usuario')
+        .order_by('fecha_solicitud')
+    )
+    for solicitud in pendientes:
+        desde, hasta = periodo_de_solicitud(solicitud)
+        if desde >= fin:
+            continue
+        evento = {
+            'id': f'solicitud-{solicitud.id}',
+            'tipo': 'pendiente',
+            'recurso_id': solicitud.recurso_id,
+            'codigo': solicitud.recurso.codigo,
+            'recurso': solicitud.recurso.nombre,
+            'inicio': desde.isoformat(),
+            'fin': hasta.isoformat(),
+        }
+        if con_usuarios:
+            evento['usuario'] = solicitud.usuario.get_full_name()
+        eventos.append(evento)
+
+    return eventos
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Min
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+
+from .caches import invalidar_notificaciones
+from .models import AvisoAdmin, Dependencia, Notificacion
+
+# Avisos para los administradores de dependencia agrupados en resúmenes: en
+# lugar de una notificación y un correo por solicitud, los avisos se acumulan
+# en AvisoAdmin y cada RESUMEN_ADMIN_MINUTOS se envía uno solo por dependencia
+# (`manage.py enviar_resumenes`, cron). Las notificaciones de los usuarios
+# siguen siendo inmediatas.
+
+# Líneas del resumen que se muestran en la campana (el correo las lleva todas)
+LINEAS_NOTIFICACION = 5
+
+
+def avisar_administrador(dependencia_id, tipo, mensaje):
+    """Encola un aviso para el administrador de la dependencia."""
+    AvisoAdmin.objects.create(dependencia_id=dependencia_id, tipo=tipo, mensaje=mensaje)
+    if not settings.RESUMEN_ADMIN_MINUTOS:
+        # Sin ventana: se envía al confirmar la transacción, como antes
+        transaction.on_commit(lambda: enviar_resumen(dependencia_id))
+
+
+def enviar_resumenes(ahora=None):
+    """
+    Envía el resumen de cada dependencia cuyo aviso más antiguo ya cumplió la
+    ventana. Devuelve el número de resúmenes enviados.
+    """
+    ahora = ahora or timezone.now()
+    limite = ahora - timedelta(minutes=settings.RESUMEN_ADMIN_MINUTOS or 0)
+    dependencias = (
+        AvisoAdmin.objects.values('dependencia_id')
+        .annotate(primero=Min('fecha'))
+        .filter(primero__lte=limite)
+        .values_list('dependencia_id', flat=True)
+    )
+    return sum(1 for dependencia_id in list(dependencias) if enviar_resumen(dependencia_id))
+
+
+def enviar_resumen(dependencia_id):
+    """
+    Convierte los avisos pendientes de la dependencia en una notificación y un
+    correo para su administrador. Devuelve el número de avisos agrupados.
+    """
+    with transaction.atomic():
+        # skip_locked: dos ejecuciones simultáneas nunca envían el mismo aviso
+        avisos = list(
+            AvisoAdmin.objects.select_for_update(skip_locked=True)
+            .filter(dependencia_id=dependencia_id).order_by('fecha', 'id')
+        )
+        if not avisos:
+            return 0
+        AvisoAdmin.objects.filter(id__in=[a.id for a in avisos]).delete()
+
+        dependencia = Dependencia.objects.select_related('administrador').get(pk=dependencia_id)
+        administrador = dependencia.administrador
+        if administrador is None:
+            # Nadie a quien avisar (igual que sin resúmenes)
+            return len(avisos)
+
+        tipos = {a.tipo for a in avisos}
+        Notificacion.objects.create(
+            usuario=administrador,
+            tipo=tipos.pop() if len(tipos) == 1 else 'RESUMEN',
+            mensaje=_mensaje(avisos, LINEAS_NOTIFICACION),
+            url=_url_solicitudes(),
+        )
+        invalidar_notificaciones(administrador.pk)
+
+        if administrador.email:
+            asunto = (
+                'Nueva solicitud de préstamo de recurso' if len(avisos) == 1
+                else f'{len(avisos)} avisos nuevos en {dependencia.nombre}'
+            )
+            cuerpo = (
+                f"Estimado {administrador.get_full_name()},\n\n"
+                f"{_mensaje(avisos)}\n\n"
+                "Por favor, revise la plataforma para aprobar o rechazar las solicitudes.\n\n"
+                "Atentamente,\nSistema de Préstamos UDENAR"
+            )
+            transaction.on_commit(lambda: send_mail(
+                subject=asunto,
+                message=cuerpo,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                recipient_list=[administrador.email],
+                fail_silently=True,
+            ))
+    return len(avisos)
+
+
+def _mensaje(avisos, maximo=None):
+    if len(avisos) == 1:
+        return avisos[0].mensaje
+    lineas = [f"- {a.mensaje}" for a in avisos[:maximo]]
+    if maximo is not None and len(avisos) > maximo:
+        lineas.append(f"- … y {len(avisos) - maximo} más.")
+    return f"Tiene {len(avisos)} avisos nuevos:\n" + "\n".join(lineas)
+
+
+def _url_solicitudes():
+    try:
+        return reverse('lista_solicitudes')
+    except NoReverseMatch:
+        # Perfil solo API (core.settings_api)
+        return None
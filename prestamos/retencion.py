@@ -0,0 +1,178 @@
+import re
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caches import invalidar_notificaciones
+from .models import Notificacion, NotificacionArchivada
+
+# Retención de notificaciones: las leídas (y, opcionalmente, las no leídas
+# muy antiguas) pasan por lotes a NotificacionArchivada; el archivo se vacía
+# a su vez pasado NOTIFICACIONES_ARCHIVO_DIAS. Cada lote es una transacción
+# corta, así nunca se bloquea la tabla activa mientras se purga.
+
+TABLA_ARCHIVO = NotificacionArchivada._meta.db_table
+CAMPOS = ('id', 'usuario_id', 'tipo', 'mensaje', 'url', 'leida', 'fecha')
+
+
+def filtro_retencion(ahora=None):
+    """Notificaciones que ya cumplieron su tiempo en la tabla activa."""
+    ahora = ahora or timezone.now()
+    filtro = Q(leida=True, fecha__lt=ahora - timedelta(days=settings.NOTIFICACIONES_RETENCION_DIAS))
+    dias_no_leidas = settings.NOTIFICACIONES_NO_LEIDAS_DIAS
+    if dias_no_leidas:
+        filtro |= Q(fecha__lt=ahora - timedelta(days=dias_no_leidas))
+    return filtro
+
+
+def _borrar_por_id(ids):
+    # DELETE directo: Notificacion tiene receptores post_delete (caché de la
+    # campana) y un .delete() del ORM cargaría y señalaría fila por fila.
+    # La caché se invalida una vez por lote en archivar_notificaciones.
+    marcadores = ', '.join(['%s'] * len(ids))
+    tabla = connection.ops.quote_name(Notificacion._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {tabla} WHERE id IN ({marcadores})', ids)
+
+
+def archivar_notificaciones(filtro, lote=2000, pausa=0.0, archivar=True):
+    """
+    Mueve (o solo borra, con archivar=False) las notificaciones que cumplen
+    `filtro`, de la más antigua a la más nueva, en lotes de `lote` filas.
+    Devuelve el total procesado.
+    """
+    total = 0
+    while True:
+        with transaction.atomic():
+            # Las filas que otra petición está marcando como leídas se saltan
+            filas = list(
+                Notificacion.objects.select_for_update(skip_locked=True)
+                .filter(filtro).order_by('id').values(*CAMPOS)[:lote]
+            )
+            if not filas:
+                break
+            if archivar:
+                NotificacionArchivada.objects.bulk_create(
+                    [NotificacionArchivada(**fila) for fila in filas], ignore_conflicts=True
+                )
+            _borrar_por_id([fila['id'] for fila in filas])
+
+        invalidar_notificaciones(*{fila['usuario_id'] for fila in filas})
+        total += len(filas)
+        if len(filas) < lote:
+            break
+        time.sleep(pausa)
+    return total
+
+
+def purgar_archivo(limite, lote=5000, pausa=0.0):
+    """
+    Borra del archivo lo anterior a `limite`. Con la tabla particionada, las
+    particiones enteras se eliminan con DROP y el resto se borra por lotes.
+    """
+    total = 0
+    if es_particionada():
+        total += eliminar_particiones_anteriores(limite)
+
+    antiguas = NotificacionArchivada.objects.filter(fecha__lt=limite)
+    while True:
+        ids = list(antiguas.order_by('id').values_list('id', flat=True)[:lote])
+        if not ids:
+            break
+        # Sin señales ni dependientes: el ORM lo resuelve con un solo DELETE
+        total += NotificacionArchivada.objects.filter(id__in=ids).delete()[0]
+        if len(ids) < lote:
+            break
+        time.sleep(pausa)
+    return total
+
+
+# --- Particionado por mes del archivo (solo PostgreSQL, opcional) ------------
+#
+# `manage.py particionar_notificaciones` convierte la tabla del archivo en una
+# tabla particionada por rango de `fecha` (una partición por mes más una
+# DEFAULT). `purgar_notificaciones` crea las particiones de los meses
+# siguientes y elimina las que quedan fuera de la retención.
+
+PATRON_PARTICION = re.compile(rf'^{TABLA_ARCHIVO}_p(\d{{4}})(\d{{2}})$')
+
+
+def _primer_dia(fecha):
+    return date(fecha.year, fecha.month, 1)
+
+
+def _mes_siguiente(mes):
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+def _limite_sql(mes):
+    # Límites en UTC: `fecha` es timestamptz
+    return datetime(mes.year, mes.month, 1, tzinfo=dt_timezone.utc).isoformat()
+
+
+def es_particionada():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid '
+            'WHERE c.relname = %s',
+            [TABLA_ARCHIVO],
+        )
+        return cursor.fetchone() is not None
+
+
+def particiones():
+    """{primer día del mes: nombre} de las particiones mensuales existentes."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT hija.relname FROM pg_inherits i '
+            'JOIN pg_class hija ON hija.oid = i.inhrelid '
+            'JOIN pg_class padre ON padre.oid = i.inhparent '
+            'WHERE padre.relname = %s',
+            [TABLA_ARCHIVO],
+        )
+        nombres = [fila[0] for fila in cursor.fetchall()]
+    resultado = {}
+    for nombre in nombres:
+        coincidencia = PATRON_PARTICION.match(nombre)
+        if coincidencia:
+            resultado[date(int(coincidencia[1]), int(coincidencia[2]), 1)] = nombre
+    return resultado
+
+
+def crear_particiones(desde, meses):
+    """Crea (si faltan) las particiones de `meses` meses a partir del de `desde`."""
+    existentes = particiones()
+    mes, creadas = _primer_dia(desde), []
+    with connection.cursor() as cursor:
+        for _ in range(meses):
+            siguiente = _mes_siguiente(mes)
+            if mes not in existentes:
+                nombre = f'{TABLA_ARCHIVO}_p{mes:%Y%m}'
+                cursor.execute(
+                    f'CREATE TABLE {connection.ops.quote_name(nombre)} '
+                    f'PARTITION OF {connection.ops.quote_name(TABLA_ARCHIVO)} '
+                    f"FOR VALUES FROM ('{_limite_sql(mes)}') TO ('{_limite_sql(siguiente)}')"
+                )
+                creadas.append(nombre)
+            mes = siguiente
+    return creadas
+
+
+def eliminar_particiones_anteriores(limite):
+    """DROP de las particiones cuyo mes termina antes de `limite`; devuelve filas eliminadas."""
+    eliminadas = 0
+    with connection.cursor() as cursor:
+        for mes, nombre in sorted(particiones().items()):
+            if _mes_siguiente(mes) > limite.date():
+                continue
+            tabla = connection.ops.quote_name(nombre)
+            cursor.execute(f'SELECT COUNT(*) FROM {tabla}')
+            eliminadas += cursor.fetchone()[0]
+            cursor.execute(f'DROP TABLE {tabla}')
+    return eliminadas
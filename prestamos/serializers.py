@@ -1,6 +1,23 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .dependencias import obtener_dependencia_admin
 from .models import Usuario, Dependencia, Recurso, Prestamo, SolicitudPrestamo
 
+
+# Serializador del token JWT: añade rol y dependencia a los claims para que la
+# API pueda autenticar sin consultar la tabla de usuarios (ver core/settings_api.py)
+class TokenConRolSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        dependencia = obtener_dependencia_admin(user)
+        token['codigo'] = user.codigo
+        token['rol'] = user.rol
+        token['dependencia_id'] = dependencia.pk if dependencia else None
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        return token
+
 # Serializador de Usuario
 class UsuarioSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -0,0 +1,85 @@
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caches import CATALOGO, borrar, invalidar_estadisticas, invalidar_notificaciones
+from .imagenes import programar_eliminacion
+from .dependencias import invalidar_dependencias_admin
+from .versiones import invalidar_usuarios
+from .models import Dependencia, Notificacion, Prestamo, PrestamoExtension, Recurso, SolicitudPrestamo, Usuario
+
+
+# 🔄 Cualquier cambio en una dependencia (p. ej. cambio de administrador)
+# invalida la caché de dependencias administradas.
+@receiver(post_save, sender=Dependencia)
+@receiver(post_delete, sender=Dependencia)
+def invalidar_cache_dependencia(sender, instance, **kwargs):
+    invalidar_dependencias_admin()
+
+
+# 🔄 Al crear o borrar un usuario se descartan las respuestas cacheadas de
+# check_email / check_codigo para su correo y código.
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Usuario)
+def invalidar_cache_usuario_existe(sender, instance, **kwargs):
+    claves = [f"usuario_existe:codigo:{instance.codigo.upper()}"]
+    if instance.email:
+        claves.append(f"usuario_existe:email:{instance.email.upper()}")
+    borrar(CATALOGO, *claves)
+
+
+# 🔄 Cambios en el usuario o en sus préstamos invalidan sus fragmentos de
+# plantilla cacheados (sidebar, préstamos recientes).
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Usuario)
+def invalidar_fragmentos_usuario(sender, instance, **kwargs):
+    invalidar_usuarios(instance.pk)
+
+
+@receiver(post_save, sender=Prestamo)
+@receiver(post_delete, sender=Prestamo)
+def invalidar_fragmentos_prestamo(sender, instance, **kwargs):
+    invalidar_usuarios(instance.usuario_id)
+
+
+# 📊 Préstamos y recursos alimentan las estadísticas de su dependencia.
+def _dependencia_de(prestamo):
+    if Prestamo.recurso.is_cached(prestamo):
+        return prestamo.recurso.dependencia_id
+    # En borrados en cascada el recurso puede ya no existir
+    return Recurso.objects.filter(pk=prestamo.recurso_id).values_list('dependencia_id', flat=True).first()
+
+
+@receiver(post_save, sender=Prestamo)
+@receiver(post_delete, sender=Prestamo)
+def invalidar_estadisticas_prestamo(sender, instance, **kwargs):
+    dependencia_id = _dependencia_de(instance)
+    if dependencia_id is not None:
+        invalidar_estadisticas(dependencia_id)
+
+
+@receiver(post_save, sender=Recurso)
+@receiver(post_delete, sender=Recurso)
+def invalidar_estadisticas_recurso(sender, instance, **kwargs):
+    invalidar_estadisticas(instance.dependencia_id)
+
+
+# 🔔 Resumen de notificaciones del usuario (campana del encabezado).
+@receiver(post_save, sender=Notificacion)
+@receiver(post_delete, sender=Notificacion)
+def invalidar_cache_notificaciones(sender, instance, **kwargs):
+    invalidar_notificaciones(instance.usuario_id)
+
+
+# 🧹 Al borrar un registro (también en cascada) se programan para después del
+# commit las eliminaciones de sus archivos que nadie más referencie.
+@receiver(post_delete, sender=Recurso)
+@receiver(post_delete, sender=Usuario)
+@receiver(post_delete, sender=Dependencia)
+@receiver(post_delete, sender=Prestamo)
+@receiver(post_delete, sender=SolicitudPrestamo)
+@receiver(post_delete, sender=PrestamoExtension)
+def eliminar_archivos_al_borrar(sender, instance, **kwargs):
+    for campo in sender._meta.get_fields():
+        if isinstance(campo, models.FileField):
+            programar_eliminacion(campo, getattr(instance, campo.attname).name)
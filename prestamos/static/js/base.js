@@ -0,0 +1,101 @@
+// Comportamiento común de base.html (antes en línea en la plantilla).
+// Las URLs y el token CSRF se leen de los atributos data-* de <body>.
+(function () {
+    const config = document.body.dataset;
+
+    function cargarNotificaciones() {
+        $.get(config.urlNotificaciones, function(data) {
+            let badge = $("#noti-count");
+            let lista = $("#noti-list");
+            badge.text(data.total);
+
+            lista.empty();
+            if (data.notificaciones.length === 0) {
+                lista.append('<li><span class="dropdown-header">No tienes notificaciones</span></li>');
+            } else {
+                data.notificaciones.forEach(n => {
+                    // 🔗 Redirección según tipo
+                    let url = "#";
+                    if (n.tipo === "SOLICITUD" || n.tipo === "LISTA_ESPERA") {
+                        url = config.urlPendientes;
+                    } else if (n.tipo === "APROBADA") {
+                        url = config.urlAprobadas;
+                    } else if (n.tipo === "RECHAZADA") {
+                        url = config.urlRechazadas;
+                    } else if (n.tipo === "VENCIMIENTO" || n.tipo === "VENCIDO") {
+                        url = config.urlSolicitudes;
+                    }
+
+                    // 👁️ Estilo leída/no leída
+                    let clase = n.leida ? "text-muted" : "fw-bold text-dark";
+
+                    lista.append(`
+                        <li>
+                            <a class="dropdown-item noti-item ${clase}" data-id="${n.id}" href="${url}">
+                                ${n.mensaje}
+                                <br><small class="text-secondary">${n.fecha}</small>
+                            </a>
+                        </li>
+                    `);
+                });
+            }
+        });
+    }
+
+    // 📌 Marcar como leída
+    $(document).on("click", ".noti-item", function(e) {
+        let notiId = $(this).data("id");
+        $.post(config.urlNotificacionLeida, {
+            id: notiId,
+            csrfmiddlewaretoken: config.csrf
+        }, function() {
+            cargarNotificaciones();
+        });
+    });
+
+    // 🔄 Actualizar cada 5s
+    setInterval(cargarNotificaciones, 5000);
+    cargarNotificaciones();
+
+    // Cuando el dropdown de notificaciones se abre/cierra, añadimos/quitan una clase en body
+    // para poder controlar comportamiento por CSS (ej. evitar scroll de fondo si se desea).
+    var $navNoti = $('#nav-noti');
+
+    $navNoti.on('shown.bs.dropdown', function () {
+        $('body').addClass('noti-open');
+    });
+    $navNoti.on('hidden.bs.dropdown', function () {
+        $('body').removeClass('noti-open');
+    });
+
+    if ('serviceWorker' in navigator) {
+        window.addEventListener('load', function() {
+            navigator.serviceWorker.register('/static/js/service-worker.js')
+                .then(function(registration) {
+                    console.log('ServiceWorker registrado con éxito:', registration.scope);
+                })
+                .catch(function(error) {
+                    console.log('Error al registrar el ServiceWorker:', error);
+                });
+        });
+    }
+
+    // 🌗 Tema claro / oscuro
+    const toggle = document.getElementById("themeToggle");
+    const body = document.body;
+
+    // Cargar tema guardado
+    if (localStorage.getItem("theme") === "dark") {
+        body.classList.add("dark-mode");
+    }
+
+    toggle.addEventListener("click", function () {
+        body.classList.toggle("dark-mode");
+
+        if (body.classList.contains("dark-mode")) {
+            localStorage.setItem("theme", "dark");
+        } else {
+            localStorage.removeItem("theme");
+        }
+    });
+})();
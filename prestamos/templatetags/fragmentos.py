@@ -0,0 +1,17 @@
+from django import template
+
+from ..versiones import version_usuario as _version_usuario
+
+register = template.Library()
+
+
+@register.simple_tag
+def version_usuario(usuario):
+    """
+    Versión de datos del usuario para las claves de {% cache %}:
+        {% version_usuario request.user as version %}
+        {% cache fragmentos_ttl nombre request.user.pk version %}
+    """
+    if not usuario.is_authenticated:
+        return 0
+    return _version_usuario(usuario.pk)
@@ -0,0 +1,71 @@
+from django import template
+from django.urls import reverse
+
+from ..imagenes import FORMATOS_MINIATURA, ruta_miniatura, variantes
+
+register = template.Library()
+
+
+def _variantes(archivo):
+    return variantes(archivo.storage, archivo.name, getattr(archivo.field, 'miniaturas', ()))
+
+
+def _candidatos(archivo, formato, disponibles=None):
+    if disponibles is None:
+        disponibles = _variantes(archivo)
+    return [
+        (archivo.storage.url(ruta_miniatura(archivo.name, ancho, formato)), ancho)
+        for ancho in disponibles.get(formato, ())
+    ]
+
+
+@register.simple_tag
+def srcset(archivo, formato='JPEG'):
+    """Valor para el atributo srcset: "url_160 160w, url_480 480w"."""
+    if not archivo:
+        return ''
+    return ', '.join(f'{url} {ancho}w' for url, ancho in _candidatos(archivo, formato.upper()))
+
+
+@register.filter
+def miniatura(archivo, ancho):
+    """URL de la miniatura JPEG de `ancho` px, o la imagen original si no existe."""
+    if not archivo:
+        return ''
+    if int(ancho) in _variantes(archivo).get('JPEG', ()):
+        return archivo.storage.url(ruta_miniatura(archivo.name, int(ancho), 'JPEG'))
+    return archivo.url
+
+
+@register.filter
+def miniatura_dinamica(archivo, tamano):
+    """URL de /media/thumb/: la miniatura se genera y cachea en el primer acceso."""
+    if not archivo:
+        return ''
+    return reverse('miniatura', args=[int(tamano), archivo.name])
+
+
+@register.inclusion_tag('componentes/imagen_responsive.html')
+def imagen_responsive(archivo, alt='', clase='', sizes='100vw'):
+    """
+    <picture> con fuentes WebP/JPEG de las miniaturas del campo; si la imagen
+    aún no tiene miniaturas (ver `procesar_imagenes`) usa la original.
+    """
+    fuentes = []
+    if archivo:
+        disponibles = _variantes(archivo)
+        for formato in FORMATOS_MINIATURA:
+            candidatos = _candidatos(archivo, formato, disponibles)
+            if candidatos:
+                fuentes.append({
+                    'tipo': f'image/{formato.lower()}',
+                    'srcset': ', '.join(f'{url} {ancho}w' for url, ancho in candidatos),
+                })
+
+    return {
+        'archivo': archivo,
+        'fuentes': fuentes,
+        'alt': alt,
+        'clase': clase,
+        'sizes': sizes,
+    }
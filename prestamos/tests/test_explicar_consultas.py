@@ -0,0 +1,64 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from prestamos.management.commands.explicar_consultas import recorridos_sqlite
+from prestamos.models import Recurso
+
+
+def plan_sqlite(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return cursor.fetchall(), sql
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN es de SQLite')
+class PlanSQLiteRealTests(TestCase):
+    """Planes reales del SQLite instalado: `nombre` no tiene índice, `id` sí."""
+
+    def test_recorrido_sin_indice(self):
+        filas, sql = plan_sqlite(Recurso.objects.filter(nombre='Portátil'))
+        self.assertEqual(
+            [tabla for tabla, _ in recorridos_sqlite(filas, sql)],
+            ['prestamos_recurso'],
+        )
+
+    def test_alias_de_subconsulta(self):
+        # Django escribe la subconsulta como `"prestamos_recurso" U0` y el plan dice `SCAN U0`
+        subconsulta = Recurso.objects.filter(nombre='Portátil').values('pk')
+        filas, sql = plan_sqlite(Recurso.objects.filter(pk__in=subconsulta))
+        self.assertEqual(
+            [tabla for tabla, _ in recorridos_sqlite(filas, sql)],
+            ['prestamos_recurso'],
+        )
+
+    def test_busqueda_por_clave_primaria(self):
+        filas, sql = plan_sqlite(Recurso.objects.filter(pk=1))
+        self.assertEqual(list(recorridos_sqlite(filas, sql)), [])
+
+
+class PlanSQLiteFormatosTests(SimpleTestCase):
+    """Formato anterior a SQLite 3.36: `SCAN TABLE tabla [AS alias]`."""
+
+    SQL = 'SELECT * FROM "prestamos_prestamo" INNER JOIN "prestamos_usuario" T3 ON (T3."id" = "prestamos_prestamo"."usuario_id")'
+
+    def test_scan_table(self):
+        filas = [(0, 0, 0, 'SCAN TABLE prestamos_prestamo')]
+        self.assertEqual(
+            list(recorridos_sqlite(filas, self.SQL)),
+            [('prestamos_prestamo', {'plan': 'SCAN TABLE prestamos_prestamo'})],
+        )
+
+    def test_scan_table_con_alias(self):
+        filas = [(0, 0, 0, 'SCAN TABLE prestamos_usuario AS T3')]
+        self.assertEqual([t for t, _ in recorridos_sqlite(filas, self.SQL)], ['prestamos_usuario'])
+
+    def test_con_indice_no_cuenta(self):
+        filas = [
+            (0, 0, 0, 'SCAN TABLE prestamos_prestamo USING INDEX prestamos_prestamo_usuario_id'),
+            (0, 0, 0, 'SCAN T3 USING COVERING INDEX prestamos_usuario_pkey'),
+            (0, 0, 0, 'SEARCH TABLE prestamos_usuario AS T3 USING INTEGER PRIMARY KEY (rowid=?)'),
+        ]
+        self.assertEqual(list(recorridos_sqlite(filas, self.SQL)), [])
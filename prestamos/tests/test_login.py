@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from prestamos.models import Usuario
+
+# Los contadores de intentos van a la caché por defecto; las demás cachés con nombre se mantienen
+MEMORIA = {**settings.CACHES, 'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-login'}}
+
+
+@override_settings(CACHES=MEMORIA, LIMITE_LOGIN=(3, 300), LIMITE_LOGIN_IP=(5, 300), LIMITE_REGISTRO=(2, 3600))
+class LimiteLoginTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Usuario.objects.create_user('EST-1', 'correcta')
+
+    def entrar(self, codigo, password='incorrecta'):
+        return self.client.post(reverse('login_registro'), {'form_type': 'login', 'codigo': codigo, 'password': password})
+
+    def test_limite_por_codigo(self):
+        for _ in range(3):
+            self.entrar('EST-1')
+        # Con la contraseña correcta tampoco: el código está bloqueado en esta IP
+        self.entrar('EST-1', 'correcta')
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_limite_por_ip_con_codigos_distintos(self):
+        for numero in range(5):
+            self.entrar(f'OTRO-{numero}')
+        self.entrar('EST-1', 'correcta')
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_por_debajo_del_limite_entra(self):
+        for numero in range(4):
+            self.entrar(f'OTRO-{numero}')
+        self.entrar('EST-1', 'correcta')
+        self.assertIn('_auth_user_id', self.client.session)
+
+    def test_limite_de_registros(self):
+        for numero in range(3):
+            self.client.post(reverse('login_registro'), {
+                'form_type': 'registro', 'codigo': f'NUEVO-{numero}', 'email': f'nuevo{numero}@example.com',
+                'first_name': 'Nuevo', 'last_name': 'Usuario', 'rol': Usuario.ESTUDIANTE,
+                'password1': 'clave-segura', 'password2': 'clave-segura',
+            })
+        self.assertEqual(
+            sorted(Usuario.objects.filter(codigo__startswith='NUEVO').values_list('codigo', flat=True)),
+            ['NUEVO-0', 'NUEVO-1'],
+        )
@@ -0,0 +1,43 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from prestamos.models import Dependencia, Recurso, TipoRecurso
+
+ANTES_DEL_CODIGO = [('prestamos', '0022_imagenes_optimizadas')]
+
+
+class SecuenciaRecursoTests(TransactionTestCase):
+    """0023 + 0033: tras migrar una tabla con recursos, los INSERT nuevos no chocan con los ids existentes."""
+
+    def migrar(self, destino):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(destino)
+        return executor.loader.project_state(destino).apps
+
+    def tearDown(self):
+        self.migrar(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_crear_recurso_tras_migrar_con_filas_existentes(self):
+        apps = self.migrar(ANTES_DEL_CODIGO)
+        DependenciaAntigua = apps.get_model('prestamos', 'Dependencia')
+        TipoAntiguo = apps.get_model('prestamos', 'TipoRecurso')
+        RecursoAntiguo = apps.get_model('prestamos', 'Recurso')
+        dependencia = DependenciaAntigua.objects.create(id='DEP-T', nombre='Dependencia de prueba')
+        tipo = TipoAntiguo.objects.create(nombre='Portátil', dependencia=dependencia)
+        for codigo in (1, 2, 500):
+            RecursoAntiguo.objects.create(
+                id=codigo, nombre=f'Recurso {codigo}', descripcion='-', tipo=tipo, dependencia=dependencia
+            )
+
+        self.migrar(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+        self.assertEqual(
+            sorted(Recurso.objects.values_list('id', 'codigo')), [(1, 1), (2, 2), (500, 500)]
+        )
+        nuevo = Recurso.objects.create(
+            codigo=501, nombre='Recurso nuevo', descripcion='-',
+            tipo=TipoRecurso.objects.get(pk=tipo.pk), dependencia=Dependencia.objects.get(pk='DEP-T'),
+        )
+        self.assertGreater(nuevo.id, 500)
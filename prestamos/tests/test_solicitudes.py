@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from prestamos.models import Dependencia, Prestamo, Recurso, Reserva, SolicitudPrestamo, TipoRecurso, Usuario
+
+
+class AprobacionTestCase(TestCase):
+    def setUp(self):
+        self.admin = Usuario.objects.create_user('ADM-T', 'clave', rol=Usuario.ADMIN)
+        self.dependencia = Dependencia.objects.create(id='DEP-T', nombre='Dependencia de prueba', administrador=self.admin)
+        self.estudiante = Usuario.objects.create_user('EST-1', 'clave')
+        self.client.force_login(self.admin)
+
+    def crear_solicitud(self, dependencia=None, estado=SolicitudPrestamo.PENDIENTE, codigo=1):
+        dependencia = dependencia or self.dependencia
+        tipo, _ = TipoRecurso.objects.get_or_create(nombre='Portátil', dependencia=dependencia)
+        recurso = Recurso.objects.create(codigo=codigo, tipo=tipo, nombre='Portátil', dependencia=dependencia)
+        return SolicitudPrestamo.objects.create(
+            recurso=recurso, usuario=self.estudiante, estado=estado,
+            fecha_inicio=timezone.localdate(),
+            fecha_devolucion=timezone.localdate() + timedelta(days=7),
+        )
+
+    def url(self, solicitud):
+        return reverse('aprobar_solicitud', args=[solicitud.pk])
+
+
+class AprobarSolicitudTests(AprobacionTestCase):
+    def test_get_no_aprueba(self):
+        solicitud = self.crear_solicitud()
+        self.assertEqual(self.client.get(self.url(solicitud)).status_code, 405)
+        solicitud.refresh_from_db()
+        self.assertEqual(solicitud.estado, SolicitudPrestamo.PENDIENTE)
+
+    def test_solicitud_de_otra_dependencia(self):
+        otra = Dependencia.objects.create(id='DEP-O', nombre='Otra dependencia')
+        solicitud = self.crear_solicitud(dependencia=otra)
+        self.assertEqual(self.client.post(self.url(solicitud)).status_code, 404)
+        self.assertFalse(Prestamo.objects.exists())
+
+    def test_solo_pendientes_o_en_espera(self):
+        for codigo, estado in enumerate((SolicitudPrestamo.APROBADO, SolicitudPrestamo.RECHAZADO), start=1):
+            solicitud = self.crear_solicitud(estado=estado, codigo=codigo)
+            respuesta = self.client.post(self.url(solicitud))
+            self.assertRedirects(respuesta, reverse('lista_solicitudes'), fetch_redirect_response=False)
+            solicitud.refresh_from_db()
+            self.assertEqual(solicitud.estado, estado)
+        self.assertFalse(Prestamo.objects.exists())
+
+
+class AprobarSolicitudContratoTests(AprobacionTestCase):
+    """El PDF se genera fuera de la transacción y no deja archivos si la aprobación falla."""
+
+    def setUp(self):
+        super().setUp()
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        configuracion = override_settings(MEDIA_ROOT=self.media)
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+
+    def pdfs(self):
+        return sorted(
+            os.path.relpath(os.path.join(raiz, nombre), self.media)
+            for raiz, _, nombres in os.walk(self.media) for nombre in nombres
+        )
+
+    def test_aprueba_y_renderiza_fuera_de_la_transaccion(self):
+        solicitud = self.crear_solicitud()
+        # TestCase ya abre transacciones propias: se comparan con las que hay al renderizar
+        transacciones = []
+
+        def renderizar(solicitud, destino):
+            transacciones.append(len(connection.savepoint_ids))
+            with open(destino, 'wb') as pdf:
+                pdf.write(b'%PDF-1.4')
+
+        base = len(connection.savepoint_ids)
+        with mock.patch('prestamos.views_solicitudes.renderizar_contrato', side_effect=renderizar):
+            self.client.post(self.url(solicitud))
+
+        self.assertEqual(transacciones, [base])
+        solicitud.refresh_from_db()
+        self.assertEqual(solicitud.estado, SolicitudPrestamo.APROBADO)
+        prestamo = Prestamo.objects.get()
+        self.assertEqual(prestamo.contrato_prestamo.name, f'contratos_prestamo/contrato_prestamo_{solicitud.pk}.pdf')
+        self.assertEqual(self.pdfs(), sorted([prestamo.contrato_prestamo.name, solicitud.contrato_solicitud.name]))
+
+    def test_reserva_en_conflicto_no_deja_contratos(self):
+        solicitud = self.crear_solicitud()
+        Reserva.objects.create(
+            recurso=solicitud.recurso, usuario=self.admin,
+            inicio=timezone.now(), fin=timezone.now() + timedelta(days=30),
+        )
+        with mock.patch('prestamos.views_solicitudes.renderizar_contrato',
+                        side_effect=lambda s, destino: open(destino, 'wb').close()):
+            self.client.post(self.url(solicitud))
+
+        solicitud.refresh_from_db()
+        self.assertEqual(solicitud.estado, SolicitudPrestamo.PENDIENTE)
+        self.assertFalse(Prestamo.objects.exists())
+        self.assertEqual(self.pdfs(), [])
+
+    def test_fallo_del_pdf_no_aprueba(self):
+        solicitud = self.crear_solicitud()
+        with mock.patch('prestamos.views_solicitudes.renderizar_contrato', side_effect=OSError('sin fuentes')), \
+                self.assertRaises(OSError):
+            self.client.post(self.url(solicitud))
+
+        solicitud.refresh_from_db()
+        self.assertEqual(solicitud.estado, SolicitudPrestamo.PENDIENTE)
+        self.assertFalse(Reserva.objects.exists())
+        self.assertEqual(self.pdfs(), [])
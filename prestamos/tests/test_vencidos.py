@@ -0,0 +1,58 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from prestamos.models import Dependencia, Prestamo, Recurso, TipoRecurso, Usuario
+from prestamos.vencidos import extender_vencidos
+
+
+class HiloInmediato:
+    """Sustituye a threading.Thread: ejecuta el objetivo al llamar a start()."""
+
+    def __init__(self, target, args=(), daemon=None):
+        self.target, self.args = target, args
+
+    def start(self):
+        self.target(*self.args)
+
+
+class ExtenderVencidosTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+
+        self.admin = Usuario.objects.create_user('ADM-T', 'clave', rol=Usuario.ADMIN)
+        dependencia = Dependencia.objects.create(id='DEP-T', nombre='Dependencia de prueba', administrador=self.admin)
+        tipo = TipoRecurso.objects.create(nombre='Portátil', dependencia=dependencia)
+        vencida = timezone.now() - timedelta(days=2)
+        for codigo in (1, 2):
+            usuario = Usuario.objects.create_user(f'EST-{codigo}', 'clave', email=f'est{codigo}@example.com')
+            recurso = Recurso.objects.create(codigo=codigo, tipo=tipo, nombre=f'Portátil {codigo}', dependencia=dependencia)
+            Prestamo.objects.create(usuario=usuario, recurso=recurso, fecha_devolucion=vencida)
+
+    def test_genera_las_adendas_de_las_extensiones(self):
+        nueva_fecha = timezone.now() + timedelta(days=7)
+        with override_settings(MEDIA_ROOT=self.media, ADENDAS_EN_SEGUNDO_PLANO=True), \
+                mock.patch('prestamos.adendas.threading.Thread', HiloInmediato), \
+                mock.patch('prestamos.adendas.renderizar_adenda', return_value=b'%PDF-1.4') as renderizar, \
+                self.captureOnCommitCallbacks(execute=True):
+            extendidos, omitidos = extender_vencidos(Prestamo.objects.vencidos(), nueva_fecha, autorizado_por=self.admin)
+
+        self.assertEqual((extendidos, omitidos), (2, 0))
+        self.assertEqual(renderizar.call_count, 2)
+        for prestamo in Prestamo.objects.all():
+            extension = prestamo.extensiones.get()
+            self.assertTrue(extension.adenda.name.startswith('adendas_prestamo/adenda_'))
+
+    def test_sin_segundo_plano_quedan_para_el_cron(self):
+        with override_settings(MEDIA_ROOT=self.media, ADENDAS_EN_SEGUNDO_PLANO=False), \
+                mock.patch('prestamos.adendas.renderizar_adenda') as renderizar, \
+                self.captureOnCommitCallbacks(execute=True):
+            extender_vencidos(Prestamo.objects.vencidos(), timezone.now() + timedelta(days=7))
+
+        renderizar.assert_not_called()
+        self.assertFalse(any(p.extensiones.get().adenda for p in Prestamo.objects.all()))
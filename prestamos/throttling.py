@@ -0,0 +1,75 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+
+def obtener_ip(request):
+    """
+    IP del cliente. Detrás de nginx REMOTE_ADDR es la del proxy: si la petición
+    llega desde uno de PROXIES_CONFIABLES se usa la cabecera PROXY_CABECERA_IP
+    que él fija. De X-Forwarded-For se toma la última entrada, la que añadió
+    el propio proxy (las anteriores las controla el cliente).
+    """
+    remota = request.META.get('REMOTE_ADDR', '')
+    cabecera = getattr(settings, 'PROXY_CABECERA_IP', '')
+    if cabecera and remota in getattr(settings, 'PROXIES_CONFIABLES', ()):
+        ip = request.META.get(cabecera, '').split(',')[-1].strip()
+        if ip:
+            return ip
+    return remota
+
+
+def _clave(request, alcance, ventana, identificador=''):
+    # El número de ventana forma parte de la clave: incr() de las cachés de
+    # archivo y de base de datos reescribe el valor con el TIMEOUT por defecto,
+    # así que el vencimiento de la clave no sirve para cerrar la ventana
+    if identificador:
+        identificador = hashlib.sha1(identificador.encode()).hexdigest()[:16]
+    return f'limite:{alcance}:{obtener_ip(request)}:{identificador}:{int(time.time() // ventana)}'
+
+
+def registrar_intento(request, alcance, ventana, identificador=''):
+    """Suma un intento al contador de ventana fija y devuelve el total de la ventana."""
+    clave = _clave(request, alcance, ventana, identificador)
+    if cache.add(clave, 1, ventana):
+        return 1
+    try:
+        return cache.incr(clave)
+    except ValueError:
+        # La clave expiró entre add() e incr()
+        cache.set(clave, 1, ventana)
+        return 1
+
+
+def intentos_excedidos(request, alcance, limite, ventana, identificador=''):
+    """True si ya hay `limite` intentos registrados en la ventana actual (sin sumar uno)."""
+    return (cache.get(_clave(request, alcance, ventana, identificador)) or 0) >= limite
+
+
+def limite_excedido(request, alcance, limite, ventana):
+    """
+    Contador de ventana fija por IP guardado en caché.
+    Devuelve True cuando la IP ya superó `limite` peticiones en `ventana` segundos.
+    """
+    return registrar_intento(request, alcance, ventana) > limite
+
+
+def limitar_por_ip(alcance, limite, ventana):
+    """
+    Decorador para endpoints AJAX: responde 429 cuando la IP excede el límite.
+    """
+    def decorador(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if limite_excedido(request, alcance, limite, ventana):
+                return JsonResponse(
+                    {"error": "Demasiadas solicitudes. Intenta de nuevo en unos segundos."},
+                    status=429
+                )
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorador
@@ -1,38 +1,38 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from django.conf import settings
-from django.conf.urls.static import static
 from django.views.generic import TemplateView
 
-# Importación de vistas para la API REST
-from .views_api import UsuarioViewSet, DependenciaViewSet, RecursoViewSet, PrestamoViewSet
+from .views_media import miniatura
+from .views_busqueda import autocompletar, buscar
+from .views_reservas import calendario_dependencia, calendario_recurso
+from .views_escaneo import mostrador_escaneo, escanear_usuario, escanear_recurso, etiquetas_qr
 
-# Importación de vistas para la interfaz web
-from .views import ( logout_view, inicio, login_registro_view, inventario, crear_prestamo, prestamos_pendientes,
-    solicitar_prestamo, agregar_recurso, editar_recurso, eliminar_recurso,
-    recursos_no_disponibles, prestamos_lista, nuevo_prestamo, prestamos_activos,
-    historial_prestamos, editar_prestamo, marcar_devuelto, lista_dependencias, 
-    recursos_por_dependencia, lista_solicitudes, aprobar_solicitud, rechazar_solicitud,
-    mis_solicitudes, solicitudes_por_estado, perfil_usuario, pwa_inicio,pwa_login,pwa_registro,
-    subir_firma, subir_foto, guardar_cedula_telefono, perfil_usuario_detalle, obtener_notificaciones, 
-    marcar_notificacion_leida, estadisticas, extender_prestamo, check_codigo, check_email, validar_id_recurso, lista_prestamos, mis_prestamos
+# Importación de vistas para la interfaz web, una por área. Ninguna importa
+# WeasyPrint al cargar (el contrato se genera en prestamos.contratos).
+from .views import (
+    logout_view, inicio, login_registro_view, check_codigo, check_email, pwa_inicio, pwa_login, pwa_registro,
 )
-
-# Configuración de las rutas de la API REST con Django Rest Framework
-router = DefaultRouter()
-router.register(r'usuarios', UsuarioViewSet)
-router.register(r'dependencias', DependenciaViewSet)
-router.register(r'recursos', RecursoViewSet)
-router.register(r'prestamos', PrestamoViewSet)
+from .views_perfil import (
+    perfil_usuario, perfil_usuario_detalle, subir_firma, subir_foto, guardar_cedula_telefono,
+)
+from .views_inventario import (
+    inventario, agregar_recurso, editar_recurso, eliminar_recurso, recursos_no_disponibles,
+    validar_id_recurso, lista_dependencias, recursos_por_dependencia,
+)
+from .views_prestamos import (
+    crear_prestamo, prestamos_pendientes, prestamos_lista, nuevo_prestamo, prestamos_activos,
+    historial_prestamos, editar_prestamo, marcar_devuelto, extender_prestamo, acciones_vencidos,
+    lista_prestamos, mis_prestamos,
+)
+from .views_solicitudes import (
+    solicitar_prestamo, lista_solicitudes, aprobar_solicitud, rechazar_solicitud,
+    mis_solicitudes, solicitudes_por_estado,
+)
+from .views_notificaciones import obtener_notificaciones, marcar_notificacion_leida
+from .views_estadisticas import estadisticas
 
 urlpatterns = [
-    # Endpoints para autenticación con JWT
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    
-    # Endpoints de la API REST
-    path('api/', include(router.urls)),
+    # Endpoints de la API REST y autenticación con JWT (ver urls_api.py)
+    path('api/', include('prestamos.urls_api')),
     path("check_email/", check_email, name="check_email"),
     path("check_codigo/", check_codigo, name="check_codigo"),
     
@@ -50,11 +50,16 @@ urlpatterns = [
     path('inventario/editar/<int:recurso_id>/', editar_recurso, name='editar_recurso'),
     path('inventario/eliminar/<int:recurso_id>/', eliminar_recurso, name='eliminar_recurso'),
     path('inventario/no-disponibles/', recursos_no_disponibles, name='recursos_no_disponibles'),
+    path('inventario/etiquetas-qr/', etiquetas_qr, name='etiquetas_qr'),
     path('validar-id/',validar_id_recurso, name='validar_id_recurso'),
     
     # Gestión de dependencias y recursos asociados
     path('prestamo/dependencias/', lista_dependencias, name='lista_dependencias'),
     path('dependencia/<int:dependencia_id>/recursos/', recursos_por_dependencia, name='recursos_por_dependencia'),
+
+    # Calendario de reservas (JSON)
+    path('calendario/recurso/<int:recurso_id>/', calendario_recurso, name='calendario_recurso'),
+    path('calendario/dependencia/<str:dependencia_id>/', calendario_dependencia, name='calendario_dependencia'),
     
     # Solicitudes de préstamo
     path('solicitar_prestamo/<int:recurso_id>/', solicitar_prestamo, name='solicitar_prestamo'),
@@ -74,9 +79,14 @@ urlpatterns = [
     path('perfil/<int:usuario_id>/', perfil_usuario_detalle, name='perfil_usuario_detalle'),
     
     
+    # Miniaturas generadas bajo demanda (caché en disco con desalojo LRU)
+    path('media/thumb/<int:tamano>/<path:ruta>', miniatura, name='miniatura'),
+
     path("notificaciones/", obtener_notificaciones, name="obtener_notificaciones"),
     path("notificaciones/leida/", marcar_notificacion_leida, name="marcar_notificacion_leida"),
     path("estadisticas/", estadisticas, name="estadisticas"),
+    path('buscar/', buscar, name='buscar'),
+    path('autocompletar/<str:tipo>/', autocompletar, name='autocompletar'),
 
 
     
@@ -88,14 +98,17 @@ urlpatterns = [
     path('prestamos/editar/<int:prestamo_id>/', editar_prestamo, name='editar_prestamo'),
     path('prestamos/devolver/<int:prestamo_id>/', marcar_devuelto, name='marcar_devuelto'),
     path('prestamos/extender/<int:prestamo_id>/', extender_prestamo, name='extender_prestamo'),
+    path('prestamos/vencidos/acciones/', acciones_vencidos, name='acciones_vencidos'),
+
+    # Mostrador de préstamo/devolución por escaneo de QR
+    path('prestamos/escaneo/', mostrador_escaneo, name='mostrador_escaneo'),
+    path('prestamos/escaneo/usuario/', escanear_usuario, name='escanear_usuario'),
+    path('prestamos/escaneo/recurso/', escanear_recurso, name='escanear_recurso'),
 
     
     path('pwa/login/', pwa_login, name='pwa_login'),
     path('pwa/registro/', pwa_registro, name='pwa_registro'),
     path('pwa/inicio/', pwa_inicio, name='pwa_inicio'),
     path("manifest.json", TemplateView.as_view(template_name="manifest.json", content_type="application/json")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
-# Configuración para servir archivos estáticos en modo DEBUG
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+]
+# Los archivos media se enrutan en core/urls.py
\ No newline at end of file
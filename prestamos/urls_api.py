@@ -0,0 +1,22 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+# Importación de vistas para la API REST
+from .views_api import UsuarioViewSet, DependenciaViewSet, RecursoViewSet, PrestamoViewSet
+
+# Configuración de las rutas de la API REST con Django Rest Framework
+router = DefaultRouter()
+router.register(r'usuarios', UsuarioViewSet)
+router.register(r'dependencias', DependenciaViewSet)
+router.register(r'recursos', RecursoViewSet)
+router.register(r'prestamos', PrestamoViewSet)
+
+urlpatterns = [
+    # Endpoints para autenticación con JWT
+    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+
+    # Endpoints de la API REST
+    path('', include(router.urls)),
+]
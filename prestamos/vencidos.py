@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+
+from .adendas import programar_adenda
+from .caches import invalidar_estadisticas, invalidar_notificaciones
+from .models import Notificacion, Prestamo, PrestamoExtension
+from .reservas import extender_reservas
+from .versiones import invalidar_usuarios
+
+
+def vencidos_por_tipo(dependencia):
+    """Conteo de préstamos vencidos de la dependencia agrupado por tipo de recurso."""
+    return list(
+        Prestamo.objects.vencidos()
+        .filter(recurso__dependencia=dependencia)
+        .values('recurso__tipo__nombre')
+        .annotate(total=Count('id'))
+        .order_by('-total', 'recurso__tipo__nombre')
+    )
+
+
+def _notificar(vencidos, tipo, mensaje, asunto):
+    """
+    Una notificación por préstamo con un único INSERT (bulk_create) y los
+    correos por una sola conexión SMTP al confirmar la transacción.
+    """
+    filas = [
+        (usuario_id, email, nombre, recurso, timezone.localtime(fecha))
+        for usuario_id, email, nombre, recurso, fecha in vencidos.values_list(
+            'usuario_id', 'usuario__email', 'usuario__first_name', 'recurso__nombre', 'fecha_devolucion'
+        )
+    ]
+    url = reverse('mis_prestamos')
+    Notificacion.objects.bulk_create([
+        Notificacion(usuario_id=usuario_id, tipo=tipo, url=url, mensaje=mensaje.format(recurso=recurso, fecha=fecha))
+        for usuario_id, _email, _nombre, recurso, fecha in filas
+    ])
+    # bulk_create no emite señales
+    invalidar_notificaciones(*{usuario_id for usuario_id, *_ in filas})
+
+    correos = [
+        (
+            asunto,
+            f"Hola {nombre},\n\n{mensaje.format(recurso=recurso, fecha=fecha)}\n\nUniversidad de Nariño.",
+            settings.DEFAULT_FROM_EMAIL,
+            [email],
+        )
+        for _usuario_id, email, nombre, recurso, fecha in filas if email
+    ]
+    if correos:
+        transaction.on_commit(lambda: send_mass_mail(correos, fail_silently=True))
+    return len(filas)
+
+
+def recordar_vencidos(vencidos):
+    return _notificar(
+        vencidos,
+        tipo="VENCIDO",
+        mensaje="⚠️ El recurso '{recurso}' debía devolverse el {fecha:%d/%m/%Y}. Por favor devuélvelo cuanto antes.",
+        asunto="⚠️ Recurso vencido",
+    )
+
+
+def extender_vencidos(vencidos, nueva_fecha, autorizado_por=None):
+    """
+    Extiende todos los préstamos vencidos con un único UPDATE, guarda el
+    historial con un único INSERT y avisa a los usuarios. Los ids se fijan
+    antes del UPDATE porque, tras él, ya no cumplen `vencidos()`.
+    Sus reservas se alargan en la misma transacción; los préstamos cuyo nuevo
+    tramo choca con la reserva de otro usuario no se extienden.
+    Devuelve (extendidos, omitidos).
+    Las adendas se generan tras el commit (programar_adenda); las que fallen
+    las recoge `manage.py generar_adendas` desde el cron.
+    """
+    with transaction.atomic():
+        # of=('self',): solo se bloquean las filas de préstamo, no el recurso del filtro por dependencia
+        filas = list(
+            vencidos.select_for_update(of=('self',))
+            .values_list('id', 'fecha_devolucion', 'recurso_id', 'usuario_id')
+        )
+        omitidos = extender_reservas(
+            ((prestamo_id, recurso_id, usuario_id) for prestamo_id, _, recurso_id, usuario_id in filas),
+            nueva_fecha,
+        )
+        anteriores = [(prestamo_id, fecha) for prestamo_id, fecha, _, _ in filas if prestamo_id not in omitidos]
+        extendidos = Prestamo.objects.filter(id__in=[prestamo_id for prestamo_id, _ in anteriores])
+        total = extendidos.update(fecha_devolucion=nueva_fecha)
+        invalidar_usuarios(*extendidos.values_list('usuario_id', flat=True))
+        invalidar_estadisticas(*extendidos.values_list('recurso__dependencia_id', flat=True).distinct())
+        extensiones = PrestamoExtension.objects.bulk_create([
+            PrestamoExtension(
+                prestamo_id=prestamo_id, fecha_anterior=fecha_anterior,
+                fecha_nueva=nueva_fecha, autorizado_por=autorizado_por
+            )
+            for prestamo_id, fecha_anterior in anteriores
+        ])
+        # PostgreSQL y SQLite >= 3.35 devuelven los ids en el mismo INSERT
+        programar_adenda(*[extension.pk for extension in extensiones if extension.pk])
+        _notificar(
+            extendidos,
+            tipo="EXTENSION",
+            mensaje="Su préstamo del recurso '{recurso}' ha sido extendido hasta {fecha:%d/%m/%Y}.",
+            asunto="Préstamo extendido",
+        )
+    return total, len(omitidos)
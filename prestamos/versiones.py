@@ -0,0 +1,19 @@
+from .caches import invalidar_grupos, version_grupo
+
+# Versión de los datos de cada usuario. Forma parte de la clave de los
+# fragmentos {% cache %} por usuario (caché 'default', que es la que usa la
+# etiqueta): al cambiar la versión, los fragmentos anteriores dejan de usarse
+# y expiran solos.
+
+
+def _grupo(usuario_id):
+    return f'usuario:{usuario_id}'
+
+
+def version_usuario(usuario_id):
+    return version_grupo('default', _grupo(usuario_id))
+
+
+def invalidar_usuarios(*usuarios_ids):
+    """Cambia la versión de datos de los usuarios indicados."""
+    invalidar_grupos('default', *(_grupo(uid) for uid in usuarios_ids))
@@ -4,11 +4,13 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
-from .models import Dependencia, Recurso, Prestamo, Usuario, SolicitudPrestamo
+from .models import Dependencia, Recurso, Prestamo, Usuario, SolicitudPrestamo, Reserva
 from .serializers import (
     UsuarioSerializer, DependenciaSerializer, RecursoSerializer, 
     PrestamoSerializer, SolicitudPrestamoSerializer
 )
+from .historial import con_archivados
+from .reservas import retenido_para_otro
 
 # Vista para Usuarios
 class UsuarioViewSet(viewsets.ModelViewSet):
@@ -49,9 +51,17 @@ class PrestamoViewSet(viewsets.ModelViewSet):
     serializer_class = PrestamoSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        # Los listados omiten el historial archivado salvo ?archivados=1;
+        # el detalle sigue encontrando cualquier préstamo
+        if self.action == 'list':
+            return con_archivados(self.request, Prestamo.objects)
+        return super().get_queryset()
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def mis_prestamos(self, request):
-        prestamos = Prestamo.objects.filter(usuario=request.user)
+        # usuario_id funciona tanto con Usuario como con el TokenUser del perfil API
+        prestamos = con_archivados(request, Prestamo.objects).filter(usuario_id=request.user.id)
         serializer = self.get_serializer(prestamos, many=True)
         return Response(serializer.data)
 
@@ -62,14 +72,17 @@ class SolicitudPrestamoViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        solicitudes = SolicitudPrestamo.objects.all()
+        if self.action == 'list':
+            solicitudes = con_archivados(self.request, solicitudes)
         if self.request.user.rol == 'admin':
-            return SolicitudPrestamo.objects.all()
-        return SolicitudPrestamo.objects.filter(usuario=self.request.user)
+            return solicitudes
+        return solicitudes.filter(usuario_id=self.request.user.id)
 
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def aprobar(self, request, pk=None):
         solicitud = self.get_object()
-        if solicitud.recurso.disponible:
+        if solicitud.recurso.disponible and not retenido_para_otro(solicitud.recurso_id, solicitud.usuario_id):
             Prestamo.objects.create(
                 usuario=solicitud.usuario,
                 recurso=solicitud.recurso,
@@ -87,4 +100,5 @@ class SolicitudPrestamoViewSet(viewsets.ModelViewSet):
         solicitud = self.get_object()
         solicitud.estado = 'Rechazado'
         solicitud.save()
+        Reserva.objects.filter(solicitud=solicitud).update(activa=False)
         return Response({'message': 'Solicitud rechazada'}, status=status.HTTP_200_OK)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+
+from .busqueda import autocompletar_recursos, autocompletar_usuarios, buscar_recursos, buscar_usuarios
+from .decorators import admin_de_dependencia
+from .models import Usuario
+
+
+def _limite(request):
+    try:
+        limite = int(request.GET.get('limite', settings.BUSQUEDA_LIMITE))
+    except ValueError:
+        limite = settings.BUSQUEDA_LIMITE
+    return max(1, min(limite, settings.BUSQUEDA_LIMITE_MAX))
+
+
+# 🔎 Autocompletado de recursos y usuarios (JSON)
+@login_required
+def buscar(request):
+    """
+    GET ?q=<texto>&tipo=recursos|usuarios[&limite=N]
+
+    Los administradores solo ven recursos de su dependencia; la búsqueda de
+    usuarios está reservada a administradores.
+    """
+    texto = request.GET.get('q', '')
+    tipo = request.GET.get('tipo', 'recursos')
+    limite = _limite(request)
+    es_admin = request.user.rol == Usuario.ADMIN
+
+    if len(texto.strip()) < settings.BUSQUEDA_MIN_CARACTERES:
+        return JsonResponse({'resultados': []})
+
+    if tipo == 'usuarios':
+        if not es_admin:
+            return JsonResponse({'error': 'No autorizado'}, status=403)
+        resultados = [
+            {
+                'id': u.id,
+                'codigo': u.codigo,
+                'nombre': u.get_full_name(),
+                'email': u.email,
+                'rol': u.rol,
+            }
+            for u in buscar_usuarios(texto, limite=limite)
+        ]
+        return JsonResponse({'resultados': resultados})
+
+    dependencia = getattr(request, 'dependencia_admin', None) if es_admin else None
+    resultados = [
+        {
+            'id': r.id,
+            'codigo': r.codigo,
+            'nombre': r.nombre,
+            'disponible': r.disponible,
+            'dependencia': r.dependencia.nombre,
+        }
+        for r in buscar_recursos(texto, dependencia=dependencia, limite=limite)
+    ]
+    return JsonResponse({'resultados': resultados})
+
+
+# ⌨️ Selectores con autocompletado del formulario de nuevo préstamo
+@login_required
+@admin_de_dependencia
+def autocompletar(request, tipo):
+    if tipo not in ('usuarios', 'recursos'):
+        raise Http404
+    texto = request.GET.get('q', '')
+    limite = _limite(request)
+
+    if tipo == 'usuarios':
+        resultados = [
+            {'id': u.id, 'texto': f'{u.codigo} · {u.get_full_name()}'}
+            for u in autocompletar_usuarios(texto, limite=limite)
+        ]
+    else:
+        resultados = [
+            {'id': r.id, 'texto': f'{r.codigo} · {r.nombre}'}
+            for r in autocompletar_recursos(texto, request.dependencia_admin, limite=limite)
+        ]
+    return JsonResponse({'resultados': resultados})
@@ -0,0 +1,148 @@
+from datetime import datetime, time
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from .caches import invalidar_estadisticas
+from .decorators import admin_de_dependencia
+from .etiquetas import generar_hojas_etiquetas
+from .lista_espera import promover_siguiente
+from .models import Prestamo, Recurso, Usuario
+from .reservas import liberar_reservas, retenido_para_otro
+from .versiones import invalidar_usuarios
+
+
+# Mostrador de préstamos por escaneo de QR (administrador)
+@login_required
+@admin_de_dependencia
+def mostrador_escaneo(request):
+    return render(request, 'admin/escaneo.html', {
+        'fecha_devolucion': timezone.localdate().isoformat(),
+    })
+
+
+@login_required
+@admin_de_dependencia
+@require_POST
+def escanear_usuario(request):
+    """
+    Primer paso: el admin escanea el carné del usuario.
+    Una sola búsqueda sobre el índice único de `codigo`.
+    """
+    codigo = request.POST.get('codigo', '').strip()
+    usuario = (
+        Usuario.objects
+        .filter(codigo=codigo, rol__in=[Usuario.ESTUDIANTE, Usuario.PROFESOR], is_active=True)
+        .only('id', 'codigo', 'first_name', 'last_name', 'rol')
+        .first()
+    )
+    if usuario is None:
+        return JsonResponse({'ok': False, 'error': f'No existe un estudiante o profesor con código {codigo}.'}, status=404)
+
+    return JsonResponse({
+        'ok': True,
+        'usuario': {
+            'id': usuario.id,
+            'codigo': usuario.codigo,
+            'nombre': usuario.get_full_name(),
+            'rol': usuario.get_rol_display(),
+        },
+    })
+
+
+@login_required
+@admin_de_dependencia
+@require_POST
+def escanear_recurso(request):
+    """
+    Segundo paso: cada QR escaneado presta el recurso al usuario activo si está
+    disponible, o registra su devolución si estaba prestado.
+    Una búsqueda indexada (dependencia, codigo) con bloqueo de fila y una
+    escritura atómica.
+    """
+    codigo = request.POST.get('codigo', '').strip()
+    usuario_id = request.POST.get('usuario_id', '').strip()
+    if not codigo.isdigit():
+        return JsonResponse({'ok': False, 'error': 'Código de recurso inválido.'}, status=400)
+
+    with transaction.atomic():
+        recurso = (
+            Recurso.objects
+            .select_for_update(of=('self',))
+            .filter(codigo=codigo, dependencia=request.dependencia_admin)
+            .select_related('dependencia')
+            .only('id', 'codigo', 'nombre', 'disponible', 'dependencia__administrador_id')
+            .first()
+        )
+        if recurso is None:
+            return JsonResponse({'ok': False, 'error': f'El recurso {codigo} no pertenece a tu dependencia.'}, status=404)
+
+        # 🔁 Devolución
+        if not recurso.disponible:
+            ahora = timezone.now()
+            abiertos = Prestamo.objects.filter(recurso=recurso, devuelto=False)
+            usuarios_ids = list(abiertos.values_list('usuario_id', flat=True))
+            abiertos.update(devuelto=True, fecha_devolucion=ahora)
+            Recurso.objects.filter(pk=recurso.pk).update(disponible=True)
+            for usuario_id_prestamo in usuarios_ids:
+                liberar_reservas(recurso.pk, usuario_id_prestamo, ahora)
+            invalidar_usuarios(*usuarios_ids)
+            invalidar_estadisticas(recurso.dependencia_id)
+            promover_siguiente(recurso)
+            return JsonResponse({'ok': True, 'accion': 'devolucion', 'recurso': recurso.nombre, 'codigo': recurso.codigo})
+
+        # 📤 Préstamo
+        if not usuario_id.isdigit():
+            return JsonResponse({'ok': False, 'error': 'Escanea primero el código del usuario.'}, status=400)
+
+        # El id llega del navegador: se vuelve a comprobar que sea un estudiante o profesor activo
+        usuario = (
+            Usuario.objects
+            .filter(pk=usuario_id, rol__in=[Usuario.ESTUDIANTE, Usuario.PROFESOR], is_active=True)
+            .only('id')
+            .first()
+        )
+        if usuario is None:
+            return JsonResponse({'ok': False, 'error': 'El usuario escaneado no puede recibir préstamos.'}, status=404)
+
+        if retenido_para_otro(recurso.pk, usuario.pk):
+            return JsonResponse({'ok': False, 'error': 'El recurso está retenido para una solicitud de la lista de espera.'}, status=409)
+
+        try:
+            fecha = datetime.strptime(request.POST.get('fecha_devolucion', ''), '%Y-%m-%d').date()
+        except ValueError:
+            fecha = timezone.localdate()
+        hora_cierre = time(*getattr(settings, 'ESCANEO_HORA_DEVOLUCION', (23, 59)))
+
+        Prestamo.objects.create(
+            usuario=usuario,
+            recurso=recurso,
+            fecha_devolucion=timezone.make_aware(datetime.combine(fecha, hora_cierre)),
+        )
+        Recurso.objects.filter(pk=recurso.pk).update(disponible=False)
+        invalidar_usuarios(usuario.pk)
+        invalidar_estadisticas(recurso.dependencia_id)
+
+    return JsonResponse({'ok': True, 'accion': 'prestamo', 'recurso': recurso.nombre, 'codigo': recurso.codigo})
+
+
+@login_required
+@admin_de_dependencia
+def etiquetas_qr(request):
+    """PDF con las etiquetas QR de todos los recursos de la dependencia."""
+    recursos = (
+        Recurso.objects
+        .filter(dependencia=request.dependencia_admin)
+        .only('codigo', 'nombre')
+        .order_by('codigo')
+    )
+    pdf = generar_hojas_etiquetas(recursos.iterator())
+
+    respuesta = HttpResponse(pdf, content_type='application/pdf')
+    respuesta['Content-Disposition'] = f'inline; filename="etiquetas_qr_{request.dependencia_admin.pk}.pdf"'
+    return respuesta
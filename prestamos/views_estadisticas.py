@@ -0,0 +1,159 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count
+from django.db.models.functions import ExtractWeekDay, ExtractHour, ExtractMonth
+from django.shortcuts import render, redirect
+from django.utils.timezone import now
+
+from .models import Recurso, Prestamo
+from .decorators import admin_de_dependencia
+from .caches import estadisticas_cacheadas
+
+
+def _calcular_estadisticas(dependencia, hoy):
+    # 🔍 Filtrar todos los datos por dependencia
+    # Historial vigente: lo archivado (prestamos.historial) no entra en las estadísticas
+    prestamos = Prestamo.objects.vigentes().filter(recurso__dependencia=dependencia)
+    recursos = Recurso.objects.filter(dependencia=dependencia)
+
+    mes_actual = hoy.month
+    anio_actual = hoy.year
+
+    # 📊 Totales de préstamos
+    prestamos_total = prestamos.count()
+    prestamos_mes = prestamos.filter(
+        fecha_prestamo__year=anio_actual,
+        fecha_prestamo__month=mes_actual
+    ).count()
+
+    # 📦 Recursos disponibles y prestados
+    recursos_disponibles = recursos.filter(disponible=True).count()
+    recursos_prestados = recursos.filter(disponible=False).count()
+    total_recursos = recursos_disponibles + recursos_prestados
+    tasa_uso_inventario = round((recursos_prestados / total_recursos) * 100, 1) if total_recursos > 0 else 0
+
+    # 🏆 Recursos más prestados
+    recursos_populares = (
+        prestamos.values("recurso__nombre")
+        .annotate(total=Count("id"))
+        .order_by("-total")[:5]
+    )
+
+    # 👥 Usuarios más activos
+    usuarios_activos = (
+        prestamos.values("usuario__first_name", "usuario__last_name")
+        .annotate(total=Count("id"))
+        .order_by("-total")[:5]
+    )
+
+    # 📈 Promedio de duración del préstamo
+    if prestamos_total > 0:
+        duraciones = [
+            (p.fecha_devolucion.date() - p.fecha_prestamo.date()).days
+            for p in prestamos
+        ]
+        promedio_duracion = round(sum(duraciones) / len(duraciones), 1) if duraciones else 0
+    else:
+        promedio_duracion = 0
+
+    # ✅ Devoluciones y retrasos reales
+    devueltos = prestamos.filter(devuelto=True).count()
+    no_devueltos = prestamos.filter(devuelto=False).count()
+
+    # Retrasos: no devueltos con fecha_devolucion vencida
+    prestamos_vencidos = prestamos.vencidos().count()
+
+    tasa_devoluciones = round((devueltos / prestamos_total) * 100, 1) if prestamos_total > 0 else 0
+    tasa_retrasos = round((prestamos_vencidos / prestamos_total) * 100, 1) if prestamos_total > 0 else 0
+
+    # 📅 Préstamos por día de la semana
+    prestamos_por_dia = (
+        prestamos.annotate(dia=ExtractWeekDay('fecha_prestamo'))
+        .values('dia')
+        .annotate(total=Count('id'))
+        .order_by('dia')
+    )
+    dias_semana = ['Dom', 'Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb']
+    prestamos_por_dia = [
+        {'dia': dias_semana[p['dia'] - 1], 'total': p['total']}
+        for p in prestamos_por_dia
+    ]
+
+    # 🕒 Horas pico
+    prestamos_por_hora = (
+        prestamos.annotate(hora=ExtractHour('fecha_prestamo'))
+        .values('hora')
+        .annotate(total=Count('id'))
+        .order_by('hora')
+    )
+
+    # 📆 Evolución mensual del año actual
+    prestamos_mensuales = (
+        prestamos.filter(fecha_prestamo__year=anio_actual)
+        .annotate(mes=ExtractMonth('fecha_prestamo'))
+        .values('mes')
+        .annotate(total=Count('id'))
+        .order_by('mes')
+    )
+    meses = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+    prestamos_mensuales = [
+        {'mes': meses[p['mes'] - 1], 'total': p['total']}
+        for p in prestamos_mensuales
+    ]
+
+    # 🔁 Rotación de recursos
+    rotacion_recursos = round(prestamos_total / total_recursos, 2) if total_recursos > 0 else 0
+
+    # 👤 Usuarios recurrentes del mes
+    usuarios_recurrentes = (
+        prestamos.filter(fecha_prestamo__month=mes_actual)
+        .values('usuario')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .count()
+    )
+    total_usuarios_mes = prestamos.filter(
+        fecha_prestamo__month=mes_actual
+    ).values('usuario').distinct().count()
+    tasa_reincidencia = round(
+        (usuarios_recurrentes / total_usuarios_mes) * 100, 1
+    ) if total_usuarios_mes > 0 else 0
+
+    return {
+        "prestamos_total": prestamos_total,
+        "prestamos_mes": prestamos_mes,
+        "recursos_disponibles": recursos_disponibles,
+        "recursos_prestados": recursos_prestados,
+        "tasa_uso_inventario": tasa_uso_inventario,
+        "rotacion_recursos": rotacion_recursos,
+        "recursos_populares": list(recursos_populares),
+        "usuarios_activos": list(usuarios_activos),
+        "promedio_duracion": promedio_duracion,
+        "tasa_devoluciones": tasa_devoluciones,
+        "tasa_retrasos": tasa_retrasos,
+        "tasa_reincidencia": tasa_reincidencia,
+        "prestamos_por_dia": prestamos_por_dia,
+        "prestamos_por_hora": list(prestamos_por_hora),
+        "prestamos_mensuales": prestamos_mensuales,
+    }
+
+
+@login_required
+@admin_de_dependencia
+def estadisticas(request):
+    # Rol y dependencia ya validados por el decorador
+    dependencia = request.dependencia_admin
+    if not dependencia:
+        messages.warning(request, "No tienes una dependencia asignada. Contacta al administrador general.")
+        return redirect("inicio")
+
+    # 📦 Se calcula una vez por dependencia y día; los cambios en préstamos y
+    # recursos de la dependencia invalidan la entrada (prestamos.caches).
+    hoy = now().date()
+    contexto = estadisticas_cacheadas(
+        dependencia.pk, (hoy.isoformat(),),
+        lambda: _calcular_estadisticas(dependencia, hoy),
+    )
+    contexto["dependencia"] = dependencia
+
+    return render(request, "prestamo/estadisticas.html", contexto)
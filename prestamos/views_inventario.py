@@ -0,0 +1,276 @@
+from collections import defaultdict, OrderedDict
+from datetime import timedelta
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import render, get_object_or_404, redirect
+from django.utils import timezone
+from django.views.decorators.clickjacking import xframe_options_exempt
+
+from .models import Dependencia, Recurso, SolicitudPrestamo, TipoRecurso
+from .decorators import admin_de_dependencia
+from .imagenes import programar_eliminacion
+
+
+@xframe_options_exempt
+@login_required
+@admin_de_dependencia
+def inventario(request):
+    recursos_queryset = Recurso.objects.filter(
+        dependencia=request.dependencia_admin
+    )
+
+    total_recursos = recursos_queryset.count()
+
+    recursos_agrupados = defaultdict(list)
+    for recurso in recursos_queryset:
+        recursos_agrupados[recurso.tipo].append(recurso)
+
+    for tipo in recursos_agrupados:
+        recursos_agrupados[tipo] = sorted(recursos_agrupados[tipo], key=lambda r: r.nombre.lower())
+
+    recursos_ordenados = OrderedDict(
+        sorted(recursos_agrupados.items(), key=lambda item: item[0].nombre.lower())
+    )
+
+    return render(request, 'admin/inventario/lista.html', {
+        'recursos': recursos_ordenados,
+        'total_recursos': total_recursos
+    })
+
+
+@login_required
+@admin_de_dependencia
+def agregar_recurso(request):
+    dependencia = request.dependencia_admin
+
+    if request.method == 'POST':
+        id_recurso = request.POST.get('id', '').strip()
+        tipo_id = request.POST.get('tipo', '').strip()  # este será el ID del tipo o "nuevo"
+
+        if tipo_id == "nuevo":
+            nuevo_tipo_nombre = request.POST.get('nuevo_tipo', '').strip()
+            tipo_obj, created = TipoRecurso.objects.get_or_create(
+                nombre=nuevo_tipo_nombre,
+                dependencia=dependencia
+            )
+        else:
+            tipo_obj = TipoRecurso.objects.get(id=tipo_id)
+
+        nombre = request.POST.get('nombre', '').strip()
+        foto = request.FILES.get('foto', None)
+        descripcion = request.POST.get('descripcion', '').strip()
+
+        if not (id_recurso and tipo_obj and nombre and descripcion):
+            messages.error(request, 'Todos los campos son obligatorios excepto la foto')
+            return redirect('agregar_recurso')
+
+        if not id_recurso.isdigit():
+            messages.error(request, 'El ID del recurso debe ser numérico.')
+            return redirect('agregar_recurso')
+
+        if Recurso.objects.filter(codigo=id_recurso).exists():
+            messages.error(request, 'El ID ya está en uso por otro recurso.')
+            return redirect('agregar_recurso')
+
+        try:
+            Recurso.objects.create(
+                codigo=id_recurso,
+                tipo=tipo_obj,
+                nombre=nombre,
+                foto=foto,
+                descripcion=descripcion,
+                dependencia=dependencia
+            )
+            messages.success(request, 'Recurso agregado exitosamente')
+            return redirect('inventario')
+        except Exception as e:
+            messages.error(request, f'Error al crear el recurso: {str(e)}')
+
+    # Obtener tipos de la dependencia
+    tipos_existentes = TipoRecurso.objects.filter(dependencia=dependencia).order_by('nombre')
+
+    return render(request, 'admin/inventario/agregar.html', {
+        'tipos_existentes': tipos_existentes
+    })
+
+
+@login_required
+def validar_id_recurso(request):
+    """
+    Endpoint AJAX para validar si un ID/QR ya existe.
+    Parámetros GET:
+      - id: código QR a validar (obligatorio)
+      - actual: código del recurso actualmente en edición (opcional) -> se excluye de la búsqueda
+    Devuelve JSON: {'existe': True|False}
+    """
+    id_recurso = request.GET.get('id', '').strip()
+    recurso_actual = request.GET.get('actual', '').strip() or None
+
+    existe = False
+    if id_recurso.isdigit():
+        # Búsqueda sobre el índice único de `codigo`
+        qs = Recurso.objects.filter(codigo=id_recurso)
+        if recurso_actual and recurso_actual.isdigit():
+            qs = qs.exclude(codigo=recurso_actual)
+        existe = qs.exists()
+
+    return JsonResponse({'existe': existe})
+
+
+@login_required
+@admin_de_dependencia
+def editar_recurso(request, recurso_id):
+    recurso = get_object_or_404(
+        Recurso,
+        id=recurso_id,
+        dependencia=request.dependencia_admin
+    )
+
+    if request.method == 'POST':
+        try:
+            nuevo_id = request.POST.get('id', '').strip()
+            tipo_id = request.POST.get('tipo', '').strip()
+
+            # Si se seleccionó "nuevo", usar el campo nuevo_tipo
+            if tipo_id == "nuevo":
+                tipo_nombre = request.POST.get('nuevo_tipo', '').strip()
+                if not tipo_nombre:
+                    messages.error(request, 'Debe ingresar un nombre para el nuevo tipo de recurso.')
+                    return redirect('editar_recurso', recurso_id=recurso.id)
+                tipo, _ = TipoRecurso.objects.get_or_create(
+                    nombre=tipo_nombre,
+                    dependencia=request.dependencia_admin
+                )
+            else:
+                tipo = TipoRecurso.objects.get(id=tipo_id)
+
+            nombre = request.POST.get('nombre', '').strip()
+            descripcion = request.POST.get('descripcion', '').strip()
+            nueva_foto = request.FILES.get('foto', None)
+
+            if not (nuevo_id and tipo and nombre and descripcion):
+                messages.error(request, 'Todos los campos obligatorios deben ser completados.')
+                return redirect('editar_recurso', recurso_id=recurso.id)
+
+            # 📸 Guardar referencia de la foto anterior solo si llega una nueva
+            foto_anterior = recurso.foto.name if (nueva_foto and recurso.foto) else None
+            campo_foto = Recurso._meta.get_field('foto')
+
+            # Si el usuario cambia el ID (código QR) basta con actualizar la fila:
+            # la PK no cambia y el historial de préstamos se conserva
+            if str(nuevo_id) != str(recurso.codigo):
+                if Recurso.objects.filter(codigo=nuevo_id).exclude(pk=recurso.pk).exists():
+                    messages.error(request, 'El ID ya está en uso por otro recurso.')
+                    return redirect('editar_recurso', recurso_id=recurso.id)
+                recurso.codigo = nuevo_id
+
+            recurso.tipo = tipo
+            recurso.nombre = nombre
+            recurso.descripcion = descripcion
+
+            # 📸 Si hay una nueva foto, eliminar la anterior
+            if nueva_foto:
+                recurso.foto = nueva_foto
+
+            recurso.save()
+            programar_eliminacion(campo_foto, foto_anterior)
+            messages.success(request, 'Recurso actualizado exitosamente.')
+            return redirect('inventario')
+
+        except Exception as e:
+            messages.error(request, f'Error al actualizar el recurso: {str(e)}')
+
+    # 🔹 Obtener los tipos existentes
+    tipos_existentes = TipoRecurso.objects.filter(
+        dependencia=request.dependencia_admin
+    ).order_by('nombre')
+
+    # 🔹 Verificar si el tipo del recurso está en la lista
+    tipo_actual = recurso.tipo
+    tipo_en_lista = tipos_existentes.filter(id=tipo_actual.id).exists()
+
+    # 🔹 Enviar flags al template
+    contexto = {
+        'recurso': recurso,
+        'tipos_existentes': tipos_existentes,
+        'tipo_en_lista': tipo_en_lista,
+        'tipo_nombre': tipo_actual.nombre if not tipo_en_lista else '',
+    }
+
+    return render(request, 'admin/inventario/editar.html', contexto)
+
+
+@login_required
+@admin_de_dependencia
+def eliminar_recurso(request, recurso_id):
+    recurso = get_object_or_404(Recurso, id=recurso_id, dependencia=request.dependencia_admin)
+    
+    if request.method == 'POST':
+        try:
+            # La imagen y sus miniaturas se eliminan tras el commit (señal post_delete)
+            recurso.delete()
+            messages.success(request, 'Recurso eliminado exitosamente')
+        except Exception as e:
+            messages.error(request, f'Error al eliminar el recurso: {str(e)}')
+    
+    return redirect('inventario')
+
+
+@login_required
+@admin_de_dependencia
+def recursos_no_disponibles(request):
+    recursos = Recurso.objects.filter(
+        dependencia=request.dependencia_admin,
+        disponible=False
+    )
+    return render(request, 'admin/inventario/no_disponibles.html', {'recursos': recursos})
+
+
+@login_required
+def lista_dependencias(request):
+    # Esta lista se muestra en la página del profesor/estudiante al darle solicitar préstamo
+    if request.user.rol not in ['estudiante', 'profesor']:
+        messages.error(request, 'No tienes permiso para acceder a esta página')
+        return redirect('inicio')
+
+    dependencias = Dependencia.objects.all().order_by('nombre')  # ordenadas A-Z
+    return render(request, 'prestamo/lista_dependencias.html', {'dependencias': dependencias})
+
+
+@login_required
+def recursos_por_dependencia(request, dependencia_id): 
+    dependencia = get_object_or_404(Dependencia, id=dependencia_id)
+    recursos_queryset = Recurso.objects.filter(dependencia=dependencia)
+
+    # Agrupar los recursos por tipo
+    recursos_agrupados = defaultdict(list)
+    for recurso in recursos_queryset:
+        recursos_agrupados[recurso.tipo].append(recurso)
+    
+    # Ordenar los recursos dentro de cada tipo por nombre
+    for tipo in recursos_agrupados:
+        recursos_agrupados[tipo] = sorted(recursos_agrupados[tipo], key=lambda r: r.nombre.lower())
+
+    # ✅ Ordenar los tipos de recurso alfabéticamente por su nombre
+    recursos_ordenados = OrderedDict(
+        sorted(recursos_agrupados.items(), key=lambda item: item[0].nombre.lower())
+    )
+
+    # 📅 Calcular mínimo de fecha de préstamo (5 días)
+    min_fecha_prestamo = timezone.localdate() + timedelta(days=5)
+
+    # ✅ NUEVO: obtener los recursos con solicitud pendiente del usuario actual
+    solicitudes_pendientes = SolicitudPrestamo.objects.filter(
+        usuario=request.user,
+        estado__in=[SolicitudPrestamo.PENDIENTE, SolicitudPrestamo.EN_ESPERA]
+    ).values_list('recurso_id', flat=True)
+
+    return render(request, 'prestamo/recursos_dependencia.html', {
+        'dependencia': dependencia,
+        'recursos': recursos_ordenados,
+        'hoy': timezone.localdate().isoformat(),
+        'min_fecha_prestamo': min_fecha_prestamo.isoformat(),
+        'solicitudes_pendientes': list(solicitudes_pendientes),  # 👈 se pasa al template
+    })
@@ -0,0 +1,73 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.views.decorators.http import require_GET
+
+from .cache_miniaturas import obtener_miniatura, ruta_permitida
+
+
+def respuesta_archivo(ruta_absoluta, ruta_relativa, max_age=60 * 60 * 24):
+    """
+    Devuelve un archivo de MEDIA_ROOT sin leerlo en Python: con nginx delante se
+    delega con X-Accel-Redirect, si no se usa FileResponse (sendfile en gunicorn).
+    """
+    prefijo = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '')
+    if prefijo:
+        respuesta = HttpResponse()
+        respuesta['Content-Type'] = mimetypes.guess_type(ruta_absoluta)[0] or 'application/octet-stream'
+        respuesta['X-Accel-Redirect'] = f"{prefijo.rstrip('/')}/{ruta_relativa}"
+    else:
+        respuesta = FileResponse(open(ruta_absoluta, 'rb'))
+
+    respuesta['Cache-Control'] = f'public, max-age={max_age}'
+    return respuesta
+
+
+@require_GET
+def servir_media(request, path):
+    try:
+        ruta_absoluta = safe_join(settings.MEDIA_ROOT, path)
+    except Exception:
+        raise Http404("Archivo no encontrado")
+
+    if not os.path.isfile(ruta_absoluta):
+        raise Http404("Archivo no encontrado")
+
+    return respuesta_archivo(ruta_absoluta, path)
+
+
+@require_GET
+def miniatura(request, tamano, ruta):
+    """
+    /media/thumb/<tamano>/<ruta>: miniatura generada bajo demanda y guardada
+    en una caché en disco con desalojo LRU (ver cache_miniaturas.py).
+    """
+    if tamano not in settings.MINIATURAS_TAMANOS or '..' in ruta.split('/'):
+        raise Http404("Miniatura no disponible")
+
+    try:
+        original = safe_join(settings.MEDIA_ROOT, ruta)
+    except Exception:
+        raise Http404("Archivo no encontrado")
+
+    # La lista de exclusión se comprueba sobre la ruta ya normalizada
+    relativa = os.path.relpath(original, os.path.abspath(settings.MEDIA_ROOT)).replace(os.sep, '/')
+    if not ruta_permitida(relativa):
+        raise Http404("Miniatura no disponible")
+
+    if not os.path.isfile(original):
+        raise Http404("Archivo no encontrado")
+
+    formato = 'WEBP' if 'image/webp' in request.headers.get('Accept', '') else 'JPEG'
+    destino = obtener_miniatura(original, tamano, formato)
+
+    respuesta = respuesta_archivo(
+        destino,
+        os.path.relpath(destino, settings.MEDIA_ROOT).replace(os.sep, '/'),
+        max_age=60 * 60 * 24 * 30,
+    )
+    respuesta['Vary'] = 'Accept'
+    return respuesta
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from .metricas import exportar_prometheus
+from .throttling import obtener_ip
+
+
+def _autorizado(request):
+    token = getattr(settings, 'METRICAS_TOKEN', '')
+    if token:
+        cabecera = request.META.get('HTTP_AUTHORIZATION', '')
+        return constant_time_compare(cabecera, f'Bearer {token}')
+    return obtener_ip(request) in getattr(settings, 'METRICAS_IPS', ('127.0.0.1',))
+
+
+# Endpoint para Prometheus (sin sesión): token Bearer o IP permitida
+@require_GET
+def metricas(request):
+    if not _autorizado(request):
+        return HttpResponseForbidden()
+    return HttpResponse(exportar_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,52 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+
+from .models import Notificacion
+from .caches import notificaciones_cacheadas
+
+
+@login_required
+def obtener_notificaciones(request):
+    # 📦 El resumen se consulta en cada carga de página (base.js); se cachea por
+    # usuario hasta que cambian sus notificaciones (prestamos.caches).
+    data = notificaciones_cacheadas(request.user.pk, lambda: _resumen_notificaciones(request.user))
+    return JsonResponse(data)
+
+
+def _resumen_notificaciones(usuario):
+    # Traemos todas las notificaciones filtradas primero
+    notificaciones_qs = Notificacion.objects.filter(usuario=usuario).order_by('-fecha')
+
+    # Calculamos no leídas ANTES del slice
+    no_leidas = notificaciones_qs.filter(leida=False)
+
+    # Ahora sí limitamos a las 10 más recientes
+    notificaciones = notificaciones_qs[:10]
+
+    return {
+        "total": no_leidas.count(),
+        "notificaciones": [
+            {
+                "id": n.id,
+                "mensaje": n.mensaje,
+                "tipo": n.tipo,
+                "fecha": n.fecha.strftime("%d/%m/%Y %H:%M"),
+                "leida": n.leida
+            }
+            for n in notificaciones
+        ]
+    }
+
+
+@login_required
+def marcar_notificacion_leida(request):
+    if request.method == "POST":
+        noti_id = request.POST.get("id")
+        try:
+            noti = Notificacion.objects.get(id=noti_id, usuario=request.user)
+            noti.leida = True
+            noti.save()
+            return JsonResponse({"ok": True})
+        except Notificacion.DoesNotExist:
+            return JsonResponse({"ok": False}, status=404)
+    return JsonResponse({"ok": False}, status=400)
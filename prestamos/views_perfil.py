@@ -0,0 +1,146 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.shortcuts import render, get_object_or_404, redirect
+
+from .models import Usuario
+from .imagenes import programar_eliminacion
+
+
+@login_required
+def perfil_usuario(request):
+    usuario = request.user
+
+    if usuario.rol == "admin":
+        template_name = "admin/perfil.html"
+    elif usuario.rol == "estudiante":
+        template_name = "estudiante/perfil.html"
+    elif usuario.rol == "profesor":
+        template_name = "profesor/perfil.html"
+    else:
+        template_name = "perfil.html"
+
+    # 🔹 Solo el propio usuario puede editar su información aquí
+    puede_editar = True
+
+    return render(request, template_name, {'usuario': usuario, 'puede_editar': puede_editar})
+
+
+@login_required
+def perfil_usuario_detalle(request, usuario_id):
+    usuario = get_object_or_404(Usuario, id=usuario_id)
+
+    # ⚠️ Solo el propio usuario puede editar sus datos
+    puede_editar = (request.user.id == usuario.id)
+
+    if usuario.rol == "admin":
+        template_name = "admin/perfil.html"
+    elif usuario.rol == "estudiante":
+        template_name = "estudiante/perfil.html"
+    elif usuario.rol == "profesor":
+        template_name = "profesor/perfil.html"
+    else:
+        template_name = "perfil.html"
+
+    # 🔒 Si no es el dueño del perfil y no es superusuario, no puede editar
+    if not puede_editar and not request.user.is_superuser:
+        # Si el admin quiere solo visualizar, ok; pero no editar
+        puede_editar = False
+
+    return render(request, template_name, {'usuario': usuario, 'puede_editar': puede_editar})
+
+
+@login_required
+def subir_firma(request):
+    if request.method == 'POST':
+        firma = request.FILES.get('firma')
+        if firma:
+            if not firma.name.endswith('.png'):
+                messages.error(request, 'La firma debe estar en formato PNG.')
+                return redirect('perfil_usuario')  # ajusta con tu nombre de URL
+            usuario = request.user
+            if not usuario.firma:
+                usuario.firma = firma
+                try:
+                    usuario.save()
+                except ValidationError as e:
+                    messages.error(request, e.messages[0])
+                    return redirect('perfil_usuario')
+                messages.success(request, 'Firma subida correctamente.')
+            else:
+                messages.warning(request, 'Ya has subido una firma.')
+    return redirect('perfil_usuario')
+
+
+@login_required
+def subir_foto(request):
+    usuario = request.user
+
+    if request.method == 'POST' and request.FILES.get('foto'):
+        nueva_foto = request.FILES['foto']
+
+        # 📌 Guardar la ruta antigua antes de reemplazar
+        foto_antigua = usuario.foto.name if usuario.foto else None
+
+        # 📷 Asignar la nueva foto (se optimiza al guardar, ver ImagenOptimizadaField)
+        usuario.foto = nueva_foto
+        try:
+            usuario.save()
+        except ValidationError as e:
+            messages.error(request, e.messages[0])
+            return redirect('perfil_usuario')
+
+        # 🧹 Eliminar la foto anterior (y sus miniaturas) después del commit
+        if foto_antigua != usuario.foto.name:
+            programar_eliminacion(usuario.foto.field, foto_antigua)
+
+        return redirect('perfil_usuario')
+
+    return redirect('perfil_usuario')
+
+
+@login_required
+def guardar_cedula_telefono(request):
+    usuario = request.user
+
+    if request.method == 'POST':
+        cedula = request.POST.get('cedula')
+        telefono = request.POST.get('telefono')
+
+        # VALIDAR CÉDULA DUPLICADA
+        if cedula:
+            existe = Usuario.objects.filter(cedula=cedula).exclude(id=usuario.id).exists()
+            if existe:
+                messages.error(
+                    request,
+                    "Esta cédula ya está registrada por otro usuario.",
+                    extra_tags='error'
+                )
+                return redirect('perfil_usuario')
+
+        try:
+            if cedula:
+                usuario.cedula = cedula
+            if telefono:
+                usuario.telefono = telefono
+
+            usuario.save()
+
+            messages.success(
+                request,
+                "Información actualizada correctamente.",
+                extra_tags='update_success'
+            )
+            return redirect('perfil_usuario')
+
+        except IntegrityError:
+            # 🔒 Seguridad extra por unique=True
+            messages.error(
+                request,
+                "No se pudo guardar: la cédula ya existe en el sistema.",
+                extra_tags='error'
+            )
+            return redirect('perfil_usuario')
+
+    return redirect('perfil_usuario')
@@ -0,0 +1,346 @@
+from datetime import datetime
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.shortcuts import render, get_object_or_404, redirect
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from .models import Recurso, Prestamo, PrestamoExtension, Usuario, Notificacion
+from .decorators import admin_de_dependencia
+from .lista_espera import promover_siguiente
+from .adendas import programar_adenda
+from .versiones import invalidar_usuarios
+from .caches import invalidar_estadisticas
+from .vencidos import extender_vencidos, recordar_vencidos
+from .reservas import extender_reservas, liberar_reservas, retenido_para_otro
+from .historial import con_archivados
+
+
+# Vista para crear un préstamo
+@login_required
+def crear_prestamo(request, recurso_id):
+    recurso = get_object_or_404(Recurso, id=recurso_id, disponible=True)
+    if request.method == 'POST':
+        if retenido_para_otro(recurso.id, request.user.id):
+            messages.error(request, 'El recurso está retenido para una solicitud de la lista de espera.')
+            return redirect('inicio')
+        fecha_devolucion = request.POST.get('fecha_devolucion')
+        firma = request.FILES.get('firma')
+        Prestamo.objects.create(
+            usuario=request.user,
+            recurso=recurso,
+            fecha_devolucion=fecha_devolucion,
+            firmado=firma
+        )
+        recurso.disponible = False
+        recurso.save()
+        return redirect('inicio')
+    return render(request, 'crear_prestamo.html', {'recurso': recurso})
+
+
+# Vista para ver préstamos pendientes
+@login_required
+def prestamos_pendientes(request):
+    prestamos = Prestamo.objects.filter(usuario=request.user, devuelto=False)
+    return render(request, 'prestamos_pendientes.html', {'prestamos': prestamos})
+
+
+# Vistas de Préstamos
+@login_required
+@admin_de_dependencia
+def prestamos_lista(request):
+    prestamos = con_archivados(request, Prestamo.objects).filter(
+        recurso__dependencia=request.dependencia_admin
+    ).order_by('-fecha_prestamo')
+    return render(request, 'admin/prestamos/lista.html', {'prestamos': prestamos})
+
+
+@login_required
+@admin_de_dependencia
+def nuevo_prestamo(request):
+    if request.method == 'POST':
+        try:
+            usuario = Usuario.objects.get(
+                id=request.POST['usuario'],
+                rol__in=[Usuario.ESTUDIANTE, Usuario.PROFESOR]
+            )
+            recurso = Recurso.objects.get(
+                id=request.POST['recurso'],
+                dependencia=request.dependencia_admin,
+                disponible=True
+            )
+            if retenido_para_otro(recurso.id, usuario.id):
+                messages.error(request, 'El recurso está retenido para una solicitud de la lista de espera.')
+                return render(request, 'admin/prestamos/nuevo.html')
+            
+            prestamo = Prestamo.objects.create(
+                usuario=usuario,
+                recurso=recurso,
+                fecha_devolucion=request.POST['fecha_devolucion']
+            )
+            
+            recurso.disponible = False
+            recurso.save()
+            
+            messages.success(request, 'Préstamo registrado exitosamente')
+            return redirect('prestamos_lista')
+        except Exception as e:
+            messages.error(request, f'Error al crear el préstamo: {str(e)}')
+    
+    # Usuarios y recursos se eligen con autocompletado (ver views_busqueda.autocompletar);
+    # la página ya no incluye la lista completa de estudiantes y profesores.
+    return render(request, 'admin/prestamos/nuevo.html')
+
+
+@login_required
+@admin_de_dependencia
+def prestamos_activos(request):
+    ahora = timezone.now()
+    prestamos = Prestamo.objects.abiertos().filter(
+        recurso__dependencia=request.dependencia_admin
+    ).select_related('recurso', 'usuario').annotate(
+        vencido=ExpressionWrapper(Q(fecha_devolucion__lt=ahora), output_field=BooleanField())
+    ).order_by('fecha_devolucion')
+    
+    context = {
+        'prestamos': prestamos,
+        'now': ahora
+    }
+    return render(request, 'admin/prestamos/activos.html', context)
+
+
+def _nueva_fecha_devolucion(request):
+    """
+    Lee `nueva_fecha` (AAAA-MM-DD) del POST para una extensión. Devuelve None,
+    dejando el mensaje de error, si falta, no es válida o no es posterior a hoy.
+    """
+    try:
+        nueva_fecha = timezone.make_aware(datetime.strptime(request.POST.get('nueva_fecha', ''), "%Y-%m-%d"))
+    except ValueError:
+        messages.error(request, "Debe seleccionar una nueva fecha de devolución válida.")
+        return None
+    if nueva_fecha <= timezone.now():
+        messages.error(request, "La nueva fecha de devolución debe ser posterior a hoy.")
+        return None
+    return nueva_fecha
+
+
+# ⚠️ Acciones masivas sobre los préstamos vencidos de la dependencia
+@login_required
+@admin_de_dependencia
+@require_POST
+def acciones_vencidos(request):
+    vencidos = Prestamo.objects.vencidos().filter(recurso__dependencia=request.dependencia_admin)
+    accion = request.POST.get('accion')
+
+    if accion == 'recordar':
+        total = recordar_vencidos(vencidos)
+        messages.success(request, f"Se envió un recordatorio a {total} préstamo(s) vencido(s).")
+
+    elif accion == 'extender':
+        nueva_fecha = _nueva_fecha_devolucion(request)
+        if nueva_fecha is None:
+            return redirect('inicio')
+        try:
+            total, omitidos = extender_vencidos(vencidos, nueva_fecha, autorizado_por=request.user)
+        except ValidationError as e:
+            messages.error(request, e.messages[0])
+            return redirect('inicio')
+        messages.success(request, f"Se extendieron {total} préstamo(s) hasta {nueva_fecha:%d/%m/%Y}.")
+        if omitidos:
+            messages.warning(
+                request,
+                f"{omitidos} préstamo(s) no se extendieron: su recurso está reservado por otro usuario en esas fechas."
+            )
+
+    return redirect('inicio')
+
+
+@login_required
+@admin_de_dependencia
+def historial_prestamos(request):
+    prestamos = con_archivados(request, Prestamo.objects).filter(
+        recurso__dependencia=request.dependencia_admin,
+        devuelto=True
+    ).order_by('-fecha_prestamo')
+    return render(request, 'admin/prestamos/historial.html', {'prestamos': prestamos})
+
+
+@login_required
+@admin_de_dependencia
+def editar_prestamo(request, prestamo_id):
+    prestamo = get_object_or_404(
+        Prestamo,
+        id=prestamo_id,
+        recurso__dependencia=request.dependencia_admin
+    )
+    
+    if request.method == 'POST':
+        try:
+            prestamo.fecha_devolucion = request.POST['fecha_devolucion']
+            prestamo.save()
+            messages.success(request, 'Préstamo actualizado exitosamente')
+            return redirect('prestamos_lista')
+        except Exception as e:
+            messages.error(request, f'Error al actualizar el préstamo: {str(e)}')
+    
+    return render(request, 'admin/prestamos/editar.html', {'prestamo': prestamo})
+
+
+@login_required
+@admin_de_dependencia
+def marcar_devuelto(request, prestamo_id):
+    prestamo = get_object_or_404(Prestamo.objects.select_related('recurso__dependencia'), id=prestamo_id)
+
+    if request.method == "POST":
+        if prestamo.devuelto:
+            messages.warning(request, 'Este préstamo ya estaba marcado como devuelto.')
+        else:
+            try:
+                with transaction.atomic():
+                    prestamo.devuelto = True
+                    prestamo.fecha_devolucion = timezone.now()
+                    prestamo.save()
+
+                    prestamo.recurso.disponible = True
+                    prestamo.recurso.save()
+
+                    liberar_reservas(prestamo.recurso_id, prestamo.usuario_id, prestamo.fecha_devolucion)
+                    promovida = promover_siguiente(prestamo.recurso)
+
+                messages.success(request, 'Préstamo marcado como devuelto exitosamente.')
+                if promovida:
+                    messages.info(request, f'La solicitud en espera de {promovida.usuario.get_full_name()} pasó a pendientes.')
+            except Exception as e:
+                messages.error(request, f'Error al marcar el préstamo como devuelto: {str(e)}')
+
+    return redirect('inicio')
+
+
+@login_required
+@admin_de_dependencia
+def extender_prestamo(request, prestamo_id):
+    prestamo = get_object_or_404(
+        Prestamo.objects.select_related('recurso'),
+        id=prestamo_id,
+        devuelto=False,
+        recurso__dependencia=request.dependencia_admin
+    )
+
+    if request.method == "POST":
+        nueva_fecha = _nueva_fecha_devolucion(request)
+        if nueva_fecha is None:
+            return redirect("prestamos_lista")
+
+        # 📌 Se actualiza el mismo préstamo y se guarda el cambio en el historial
+        with transaction.atomic():
+            prestamo = Prestamo.objects.select_for_update().select_related('recurso').get(pk=prestamo.pk)
+            if nueva_fecha <= prestamo.fecha_devolucion:
+                messages.error(request, "La nueva fecha debe ser posterior a la fecha de devolución actual.")
+                return redirect("prestamos_lista")
+
+            # 📅 La reserva del préstamo se alarga con él
+            try:
+                if extender_reservas([(prestamo.pk, prestamo.recurso_id, prestamo.usuario_id)], nueva_fecha):
+                    raise ValidationError("El recurso ya está reservado por otro usuario en esas fechas.")
+            except ValidationError as e:
+                messages.error(request, e.messages[0])
+                return redirect("prestamos_lista")
+
+            extension = PrestamoExtension.objects.create(
+                prestamo=prestamo,
+                fecha_anterior=prestamo.fecha_devolucion,
+                fecha_nueva=nueva_fecha,
+                autorizado_por=request.user,
+            )
+            Prestamo.objects.filter(pk=prestamo.pk).update(fecha_devolucion=nueva_fecha)
+            invalidar_usuarios(prestamo.usuario_id)
+            invalidar_estadisticas(prestamo.recurso.dependencia_id)
+
+            Notificacion.objects.create(
+                usuario_id=prestamo.usuario_id,
+                tipo="EXTENSION",
+                mensaje=f"Su préstamo del recurso '{prestamo.recurso.nombre}' ha sido extendido hasta {nueva_fecha.date()}."
+            )
+
+            # 📄 La adenda (una página) se genera después del commit, fuera de la petición
+            programar_adenda(extension.pk)
+
+        messages.success(request, f"El préstamo ha sido extendido hasta {nueva_fecha.date()}.")
+        return redirect("inicio")
+
+    return redirect("inicio")
+
+
+@login_required
+def mis_prestamos(request):
+    """
+    Vista para mostrar los préstamos del usuario logueado (estudiante o profesor)
+    """
+    usuario = request.user
+
+    # Solo los roles estudiante o profesor pueden acceder
+    if usuario.rol not in ['estudiante', 'profesor']:
+        messages.error(request, "Solo los estudiantes o profesores pueden acceder a esta vista.")
+        return redirect('inicio')
+
+    prestamos = (
+        con_archivados(request, Prestamo.objects)
+        .filter(usuario=usuario)
+        .select_related('recurso')
+        .order_by('-fecha_prestamo')  # 🔽 Más recientes primero
+    )
+
+    contexto = {
+        'prestamos': prestamos,
+        'titulo': 'Mis Préstamos',
+        'archivados': bool(request.GET.get('archivados')),
+    }
+    return render(request, 'prestamo/mis_prestamos.html', contexto)
+
+
+@login_required
+@admin_de_dependencia
+def lista_prestamos(request):
+    """
+    Vista para mostrar los préstamos de la dependencia del administrador.
+    """
+    usuario = request.user
+
+    # 1️⃣ y 2️⃣ Rol y dependencia resueltos por @admin_de_dependencia
+    dependencia_admin = request.dependencia_admin
+
+    # 3️⃣ Si no tiene dependencia asignada y no es superusuario, mostrar aviso
+    if not dependencia_admin and not usuario.is_superuser:
+        messages.warning(request, "No tienes una dependencia asignada. Contacta al administrador general.")
+        prestamos = Prestamo.objects.none()
+        titulo = "Préstamos (Sin dependencia asignada)"
+    else:
+        # 4️⃣ Si es superuser -> ve todo, si no -> solo su dependencia
+        if usuario.is_superuser:
+            prestamos = (
+                con_archivados(request, Prestamo.objects)
+                .select_related('usuario', 'recurso', 'recurso__dependencia')
+                .order_by('-fecha_prestamo')
+            )
+            titulo = "Todos los préstamos (Administrador global)"
+        else:
+            prestamos = (
+                con_archivados(request, Prestamo.objects)
+                .select_related('usuario', 'recurso', 'recurso__dependencia')
+                .filter(recurso__dependencia=dependencia_admin)
+                .order_by('-fecha_prestamo')
+            )
+            titulo = f"Préstamos de la Dependencia: {dependencia_admin.nombre}"
+
+    contexto = {
+        'prestamos': prestamos,
+        'titulo': titulo,
+        'archivados': bool(request.GET.get('archivados')),
+    }
+
+    return render(request, 'prestamo/lista_prestamos.html', contexto)
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from .models import Dependencia, Recurso, Usuario
+from .reservas import eventos_calendario, periodo_de_fechas
+
+
+def _rango(request):
+    """
+    Rango pedido con ?desde=AAAA-MM-DD&hasta=AAAA-MM-DD (ambos incluidos).
+    Por defecto, los próximos 31 días.
+    """
+    hoy = timezone.localdate()
+    try:
+        desde = datetime.strptime(request.GET['desde'], '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        desde = hoy
+    try:
+        hasta = datetime.strptime(request.GET['hasta'], '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        hasta = desde + timedelta(days=30)
+    if hasta < desde or (hasta - desde).days > 366:
+        hasta = desde + timedelta(days=30)
+    return periodo_de_fechas(desde, hasta)
+
+
+def _ve_usuarios(request, dependencia_id):
+    # Solo el administrador de la dependencia ve quién tiene cada reserva
+    dependencia = getattr(request, 'dependencia_admin', None)
+    return request.user.rol == Usuario.ADMIN and (
+        request.user.is_superuser or (dependencia is not None and dependencia.pk == dependencia_id)
+    )
+
+
+# 📅 Calendario de reservas (JSON)
+@login_required
+def calendario_recurso(request, recurso_id):
+    recurso = get_object_or_404(Recurso.objects.only('id', 'dependencia_id'), id=recurso_id)
+    inicio, fin = _rango(request)
+    eventos = eventos_calendario(
+        [recurso.id], inicio, fin, con_usuarios=_ve_usuarios(request, recurso.dependencia_id)
+    )
+    return JsonResponse({'desde': inicio.isoformat(), 'hasta': fin.isoformat(), 'eventos': eventos})
+
+
+@login_required
+def calendario_dependencia(request, dependencia_id):
+    dependencia = get_object_or_404(Dependencia.objects.only('id'), id=dependencia_id)
+    inicio, fin = _rango(request)
+    recursos_ids = Recurso.objects.filter(dependencia=dependencia).values('id')
+    eventos = eventos_calendario(
+        recursos_ids, inicio, fin, con_usuarios=_ve_usuarios(request, dependencia.pk)
+    )
+    return JsonResponse({'desde': inicio.isoformat(), 'hasta': fin.isoformat(), 'eventos': eventos})
@@ -0,0 +1,324 @@
+import os
+import shutil
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.mail import send_mail
+from django.db import transaction
+from django.shortcuts import render, get_object_or_404, redirect
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from .models import Recurso, Prestamo, Reserva, SolicitudPrestamo, Notificacion
+from .decorators import admin_de_dependencia
+from .lista_espera import poner_en_espera
+from .reservas import crear_reserva, hay_conflicto, periodo_de_fechas
+from .historial import con_archivados
+from .resumenes import avisar_administrador
+from .contratos import renderizar_contrato
+
+
+# Crear solicitud de préstamo (estudiante/profesor)
+@login_required
+def solicitar_prestamo(request, recurso_id):
+    recurso = get_object_or_404(Recurso, id=recurso_id)
+
+    if request.method == 'POST':
+        fecha_devolucion_str = request.POST.get('fecha_devolucion')
+
+        # Validar formato fecha
+        try:
+            fecha_devolucion = datetime.strptime(fecha_devolucion_str, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            messages.error(request, "La fecha seleccionada no es válida.")
+            return redirect('recursos_por_dependencia', dependencia_id=recurso.dependencia.id)
+
+        # 📌 Requerir que la fecha sea >= 5 dias
+        hoy = timezone.localdate()
+        minima_fecha = hoy + timedelta(days=5)
+        if fecha_devolucion < minima_fecha:
+            messages.error(request, f"La fecha de devolución debe ser al menos {minima_fecha.strftime('%d/%m/%Y')}.")
+            return redirect('recursos_por_dependencia', dependencia_id=recurso.dependencia.id)
+
+        # 📅 Fecha de inicio opcional (por defecto, hoy)
+        try:
+            fecha_inicio = datetime.strptime(request.POST.get('fecha_inicio') or '', "%Y-%m-%d").date()
+        except ValueError:
+            fecha_inicio = hoy
+        if fecha_inicio < hoy or fecha_inicio > fecha_devolucion:
+            messages.error(request, "La fecha de inicio debe estar entre hoy y la fecha de devolución.")
+            return redirect('recursos_por_dependencia', dependencia_id=recurso.dependencia.id)
+
+        if hay_conflicto(recurso.id, *periodo_de_fechas(fecha_inicio, fecha_devolucion)):
+            messages.error(request, f"El recurso '{recurso.nombre}' ya está reservado en esas fechas.")
+            return redirect('recursos_por_dependencia', dependencia_id=recurso.dependencia.id)
+
+
+        # Crear la solicitud de préstamo
+        solicitud = SolicitudPrestamo.objects.create(
+            recurso=recurso,
+            usuario=request.user,
+            fecha_inicio=fecha_inicio,
+            fecha_devolucion=fecha_devolucion,
+            estado=SolicitudPrestamo.PENDIENTE
+        )
+
+        # Aviso al administrador de la dependencia: se agrupa en el siguiente resumen
+        avisar_administrador(
+            recurso.dependencia_id,
+            "SOLICITUD",
+            f"El usuario {request.user.get_full_name()} ha solicitado el préstamo del recurso '{recurso.nombre}'.",
+        )
+
+    return redirect('recursos_por_dependencia', dependencia_id=recurso.dependencia.id)
+
+
+def _descartar_contratos(solicitud, destino_prestamo):
+    """Borra los PDF de una aprobación que no llegó a confirmarse."""
+    if solicitud.contrato_solicitud:
+        solicitud.contrato_solicitud.delete(save=False)
+    if os.path.exists(destino_prestamo):
+        os.remove(destino_prestamo)
+
+
+# Aprobar solicitud (administrador)
+@login_required
+@admin_de_dependencia
+@require_POST
+def aprobar_solicitud(request, solicitud_id):
+    solicitud = get_object_or_404(
+        SolicitudPrestamo.objects.select_related('recurso__dependencia__administrador', 'usuario'),
+        id=solicitud_id,
+        recurso__dependencia=request.dependencia_admin,
+    )
+
+    # Solo se aprueba lo que está pendiente o en lista de espera
+    if solicitud.estado not in (SolicitudPrestamo.PENDIENTE, SolicitudPrestamo.EN_ESPERA):
+        messages.error(
+            request,
+            f"La solicitud ya está {solicitud.get_estado_display().lower()}.",
+            extra_tags="recurso_no_disponible"
+        )
+        return redirect('lista_solicitudes')
+
+    # 📅 El préstamo empieza al aprobar: una solicitud futura se aprueba a partir de su fecha de inicio
+    if solicitud.fecha_inicio and solicitud.fecha_inicio > timezone.localdate():
+        messages.error(
+            request,
+            f"La solicitud empieza el {solicitud.fecha_inicio.strftime('%d/%m/%Y')}; podrá aprobarse a partir de ese día.",
+        )
+        return redirect('lista_solicitudes')
+
+    # ⏳ Recurso prestado: la solicitud pasa a la lista de espera en vez de fallar
+    if not solicitud.recurso.disponible:
+        posicion = poner_en_espera(solicitud)
+        messages.info(
+            request,
+            f"El recurso no está disponible. La solicitud quedó en lista de espera (posición {posicion}).",
+            extra_tags="recurso_no_disponible"
+        )
+        return redirect('lista_solicitudes')
+
+    recurso = solicitud.recurso
+    nombre_archivo = f'contrato_prestamo_{solicitud.id}.pdf'
+    temp_dir = os.path.join(settings.MEDIA_ROOT, 'temp_contratos')
+    os.makedirs(temp_dir, exist_ok=True)
+    temp_path = os.path.join(temp_dir, nombre_archivo)
+
+    destino_prestamo = os.path.join(settings.MEDIA_ROOT, 'contratos_prestamo', nombre_archivo)
+
+    # El PDF y las copias se hacen antes de la transacción: WeasyPrint tarda y
+    # no debe retener los bloqueos de la reserva. La transacción solo guarda
+    # reserva, solicitud, préstamo y disponibilidad; si falla, los contratos
+    # ya escritos se borran y no queda nada a medias.
+    try:
+        # Contrato en PDF con las firmas (ver prestamos.contratos)
+        renderizar_contrato(solicitud, temp_path)
+
+        with open(temp_path, 'rb') as pdf_file:
+            solicitud.contrato_solicitud.save(nombre_archivo, File(pdf_file), save=False)
+
+        os.makedirs(os.path.dirname(destino_prestamo), exist_ok=True)
+        shutil.copyfile(temp_path, destino_prestamo)
+
+        with transaction.atomic():
+            # Otra aprobación pudo confirmarse mientras se generaba el PDF
+            estado = SolicitudPrestamo.objects.select_for_update().values_list('estado', flat=True).get(pk=solicitud.pk)
+            if estado not in (SolicitudPrestamo.PENDIENTE, SolicitudPrestamo.EN_ESPERA):
+                raise ValidationError("La solicitud ya fue procesada.")
+
+            crear_reserva(solicitud)
+
+            solicitud.estado = SolicitudPrestamo.APROBADO
+            solicitud.save()
+
+            Prestamo.objects.create(
+                usuario=solicitud.usuario,
+                recurso=recurso,
+                fecha_devolucion=solicitud.fecha_devolucion,
+                contrato_prestamo=f'contratos_prestamo/{nombre_archivo}'
+            )
+
+            recurso.disponible = False
+            recurso.save()
+    except ValidationError as e:
+        _descartar_contratos(solicitud, destino_prestamo)
+        messages.error(request, e.messages[0], extra_tags="recurso_no_disponible")
+        return redirect('lista_solicitudes')
+    except Exception:
+        _descartar_contratos(solicitud, destino_prestamo)
+        raise
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        if os.path.isdir(temp_dir) and not os.listdir(temp_dir):
+            os.rmdir(temp_dir)
+
+    # 📌 Notificación al solicitante
+    Notificacion.objects.create(
+        usuario=solicitud.usuario,
+        tipo="APROBADA",
+        mensaje=f"Su solicitud de préstamo del recurso '{solicitud.recurso.nombre}' ha sido aprobada por {request.user.get_full_name()}."
+    )
+
+    if solicitud.usuario.email:
+        send_mail(
+            subject="Solicitud de préstamo aprobada",
+            message=(
+                f"Estimado {solicitud.usuario.get_full_name()},\n\n"
+                f"Nos complace informarle que su solicitud de préstamo del recurso '{solicitud.recurso.nombre}' "
+                f"ha sido aprobada por el administrador {request.user.get_full_name()}.\n\n"
+                "Atentamente,\nSistema de Préstamos UDENAR"
+            ),
+            from_email="noreply@unad.edu.co",
+            recipient_list=[solicitud.usuario.email],
+            fail_silently=True
+        )
+
+    return redirect('lista_solicitudes')
+
+
+# Rechazar solicitud (administrador)
+@login_required
+@admin_de_dependencia
+def rechazar_solicitud(request, solicitud_id):
+
+    solicitud = get_object_or_404(SolicitudPrestamo, id=solicitud_id)
+    solicitud.estado = SolicitudPrestamo.RECHAZADO
+    solicitud.save()
+    # Libera la retención si venía de la lista de espera
+    Reserva.objects.filter(solicitud=solicitud).update(activa=False)
+
+    # 📌 Notificación al solicitante
+    Notificacion.objects.create(
+        usuario=solicitud.usuario,
+        tipo="RECHAZADA",
+        mensaje=f"Su solicitud de préstamo del recurso '{solicitud.recurso.nombre}' fue rechazada por {request.user.get_full_name()}."
+    )
+
+    if solicitud.usuario.email:
+        send_mail(
+            subject="Solicitud de préstamo rechazada",
+            message=(
+                f"Estimado {solicitud.usuario.get_full_name()},\n\n"
+                f"Lamentamos informarle que su solicitud de préstamo para el recurso '{solicitud.recurso.nombre}' "
+                f"ha sido rechazada por el administrador {request.user.get_full_name()}.\n\n"
+                "Atentamente,\nSistema de Préstamos UDENAR"
+            ),
+            from_email="noreply@unad.edu.co",
+            recipient_list=[solicitud.usuario.email],
+            fail_silently=True
+        )
+
+    return redirect('lista_solicitudes')
+
+
+#Lista para que el administrador pueda ver las solicitudes
+@login_required
+@admin_de_dependencia
+def lista_solicitudes(request):
+    solicitudes = con_archivados(request, SolicitudPrestamo.objects).select_related('recurso', 'usuario').filter(
+        recurso__dependencia=request.dependencia_admin
+    ).order_by('-fecha_solicitud')
+
+    # Filtrar los mensajes: solo mostrar los del tipo 'recurso_no_disponible'
+    mensajes_filtrados = []
+    for message in messages.get_messages(request):
+        if 'recurso_no_disponible' in message.tags:
+            mensajes_filtrados.append(message)
+
+    context = {
+        'solicitudes': solicitudes,
+        'mensajes_filtrados': mensajes_filtrados,
+        'archivados': bool(request.GET.get('archivados')),
+    }
+
+    return render(request, 'admin/solicitudes_prestamo.html', context)
+
+
+#Lista para que el estudiante pueda ver sus solicitudes
+@login_required
+def mis_solicitudes(request):
+    if request.user.rol != "estudiante":  # Solo permitir a estudiantes
+        return redirect('inicio')
+
+    solicitudes = con_archivados(request, SolicitudPrestamo.objects).filter(usuario=request.user).select_related('recurso').order_by('-fecha_solicitud')
+
+    return render(request, 'estudiante/mis_solicitudes.html', {
+        'solicitudes': solicitudes,
+        'archivados': bool(request.GET.get('archivados')),
+    })
+
+
+@login_required
+def solicitudes_por_estado(request, estado):
+    # Asegurar que el estado sea correcto según el modelo
+    estado_map = {
+        'pendiente': SolicitudPrestamo.PENDIENTE,
+        'aprobado': SolicitudPrestamo.APROBADO,
+        'rechazado': SolicitudPrestamo.RECHAZADO
+    }
+
+    if estado not in estado_map:
+        messages.error(request, "Estado inválido.")
+        return redirect('inicio')
+
+    # Filtrar según el rol del usuario
+    if request.user.rol == "admin":
+        return solicitudes_admin_por_estado(request, estado_map[estado], estado)
+
+    elif request.user.rol in ["estudiante", "profesor"]:
+        solicitudes = (
+            con_archivados(request, SolicitudPrestamo.objects)
+            .filter(
+                usuario=request.user,
+                estado=estado_map[estado]
+            )
+            .select_related('recurso')              # 🔹 Optimiza para cargar el nombre del recurso
+            .order_by('-fecha_solicitud')           # 🔹 Más recientes primero
+        )
+        template = f'{request.user.rol}/solicitudes_{estado}.html'
+
+    else:
+        return redirect('inicio')
+
+    return render(request, template, {'solicitudes': solicitudes})
+
+
+@admin_de_dependencia
+def solicitudes_admin_por_estado(request, estado_solicitud, estado):
+    solicitudes = (
+        con_archivados(request, SolicitudPrestamo.objects)
+        .filter(
+            recurso__dependencia=request.dependencia_admin,
+            estado=estado_solicitud
+        )
+        .select_related('recurso', 'usuario')   # 🔹 Optimiza las consultas
+        .order_by('-fecha_solicitud')           # 🔹 Orden descendente
+    )
+    return render(request, f'admin/solicitudes_{estado}.html', {'solicitudes': solicitudes})
@@ -0,0 +1,86 @@
+"""
+Prueba de carga reproducible para comparar perfiles de servidor.
+
+Ejemplos:
+    # 1. Servidor de desarrollo
+    python manage.py runserver 0.0.0.0:8000
+    python scripts/prueba_carga.py --url http://localhost:8000/cuenta/
+
+    # 2. Perfil de producción
+    DJANGO_SETTINGS_MODULE=core.settings_prod gunicorn -c gunicorn.conf.py core.wsgi
+    python scripts/prueba_carga.py --url http://localhost:8000/cuenta/
+
+Con --cookie se puede medir una página autenticada (sessionid=...).
+Solo usa la biblioteca estándar para que se pueda ejecutar en cualquier máquina.
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def peticion(url, cookie, timeout):
+    request = urllib.request.Request(url)
+    if cookie:
+        request.add_header('Cookie', cookie)
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as respuesta:
+            respuesta.read()
+            estado = respuesta.status
+    except urllib.error.HTTPError as e:
+        estado = e.code
+    except (urllib.error.URLError, TimeoutError):
+        estado = 0
+    return estado, time.perf_counter() - inicio
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0
+    indice = min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--peticiones', type=int, default=2000)
+    parser.add_argument('--concurrencia', type=int, default=20)
+    parser.add_argument('--calentamiento', type=int, default=50, help='Peticiones iniciales que no se miden')
+    parser.add_argument('--cookie', default='')
+    parser.add_argument('--timeout', type=float, default=30)
+    args = parser.parse_args()
+
+    for _ in range(args.calentamiento):
+        peticion(args.url, args.cookie, args.timeout)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrencia) as executor:
+        resultados = list(executor.map(
+            lambda _: peticion(args.url, args.cookie, args.timeout),
+            range(args.peticiones)
+        ))
+    duracion = time.perf_counter() - inicio
+
+    latencias = sorted(t for estado, t in resultados if 200 <= estado < 400)
+    errores = sum(1 for estado, _ in resultados if not 200 <= estado < 400)
+
+    print(json.dumps({
+        'url': args.url,
+        'peticiones': args.peticiones,
+        'concurrencia': args.concurrencia,
+        'errores': errores,
+        'rps': round(args.peticiones / duracion, 1),
+        'p50_ms': round(percentil(latencias, 50) * 1000, 1),
+        'p95_ms': round(percentil(latencias, 95) * 1000, 1),
+        'p99_ms': round(percentil(latencias, 99) * 1000, 1),
+        'media_ms': round(statistics.mean(latencias) * 1000, 1) if latencias else 0,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()